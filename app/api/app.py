@@ -8,9 +8,11 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.core.security import hash_password
-from app.db.session import get_db, SessionLocal
+from app.db.session import DB_WARMUP_CONNECTIONS, get_db, get_engine, SessionLocal
+from app.db.warmup import db_readiness, start_warmup
 from app.api.v1.api import api_router
 from app.models.models import Customer, Invoice, Property, User
+from app.repositories import search as search_repo
 from app.schemas.schemas import (
     CustomerOut,
     CustomerCreate,
@@ -19,18 +21,27 @@ from app.schemas.schemas import (
     CustomerStatementOut,
     StatementItem,
 )
-from app.core.handlers import register_exception_handlers, register_request_id_middleware
+from app.core.compression import register_compression_middleware
+from app.core.handlers import (
+    register_exception_handlers,
+    register_read_your_writes_middleware,
+    register_request_id_middleware,
+)
 from app.core.logging import configure_logging
 
 
 configure_logging()
 app = FastAPI(title="Ektor Pool Services API")
 
+register_compression_middleware(app)
+register_read_your_writes_middleware(app)
 register_request_id_middleware(app)
 register_exception_handlers(app)
 
 app.include_router(api_router, prefix="/api/v1")
 
+SEARCH_INDEX_ON_STARTUP = os.getenv("SEARCH_INDEX_ON_STARTUP", "true").lower() in ("1", "true", "yes")
+
 def _bootstrap_admin_if_needed() -> None:
     username = os.getenv("BOOTSTRAP_ADMIN_USERNAME")
     email = os.getenv("BOOTSTRAP_ADMIN_EMAIL")
@@ -66,13 +77,37 @@ def _bootstrap_admin_if_needed() -> None:
         db.close()
 
 
+def _index_search_if_empty() -> None:
+    # rows loaded by sql/init (or any bulk load) never went through the write
+    # endpoints; index an entity whose search_grams are still empty
+    if not SEARCH_INDEX_ON_STARTUP:
+        return
+
+    db = SessionLocal()
+    try:
+        for entity in search_repo.unindexed_entities(db):
+            search_repo.rebuild(db, entity)
+    finally:
+        db.close()
+
+
+def _on_db_ready() -> None:
+    _bootstrap_admin_if_needed()
+    _index_search_if_empty()
+
+
 @app.on_event("startup")
 def _startup() -> None:
-    _bootstrap_admin_if_needed()
+    start_warmup(
+        get_engine,
+        connections=DB_WARMUP_CONNECTIONS,
+        on_ready=_on_db_ready,
+    )
 
 @app.get("/health")
 def health():
     return {
         "status": "ok",
         "version": os.getenv("APP_VERSION", "unknown"),
+        "database": db_readiness.snapshot(),
     }
@@ -0,0 +1,72 @@
+from anyio import to_thread
+from fastapi import APIRouter, Depends
+
+from app.api.v1.routers.auth import require_roles
+from app.core.password_pool import password_pool
+from app.core.principals import principal_cache
+from app.core.response_cache import response_cache
+from app.core.throttle import login_throttle
+from app.core.token_epochs import token_epochs
+from app.db.counts import count_cache
+from app.db.pool_metrics import async_pool_metrics, pool_metrics
+from app.db.recent_writes import recent_writes
+from app.db.report_totals import report_totals
+from app.db.session import get_async_engine, get_engine, get_replicas
+from app.schemas.metrics import AuthMetricsOut, CacheMetricsOut, DbPoolsMetricsOut
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_roles("admin"))],
+)
+
+
+@router.get(
+    "/metrics/db-pool",
+    response_model=DbPoolsMetricsOut,
+    operation_id="v1_admin_metrics_db_pool",
+)
+async def db_pool_metrics():
+    limiter = to_thread.current_default_thread_limiter()
+    return {
+        "pools": {
+            "primary": pool_metrics.snapshot(get_engine()),
+            "primary_async": async_pool_metrics.snapshot(get_async_engine().sync_engine),
+            **{
+                f"replica_{i}": metrics.snapshot(replica_engine.sync_engine)
+                for i, (replica_engine, metrics, _) in enumerate(get_replicas())
+            },
+        },
+        "read_routing": recent_writes.stats(),
+        "threadpool": {
+            "total_tokens": int(limiter.total_tokens),
+            "borrowed_tokens": limiter.borrowed_tokens,
+        },
+    }
+
+
+@router.get(
+    "/metrics/auth",
+    response_model=AuthMetricsOut,
+    operation_id="v1_admin_metrics_auth",
+)
+def auth_metrics():
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_epochs": token_epochs.stats(),
+        "password_pool": password_pool.stats(),
+        "login_throttle": login_throttle.stats(),
+    }
+
+
+@router.get(
+    "/metrics/cache",
+    response_model=CacheMetricsOut,
+    operation_id="v1_admin_metrics_cache",
+)
+def cache_metrics():
+    return {
+        "count_cache": count_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "report_totals": report_totals.stats(),
+    }
@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.core.security import create_access_token, decode_token, hash_password, verify_password
+from app.core.principals import Principal, principal_cache
+from app.core.security import (
+    create_access_token,
+    decode_token,
+    hash_password,
+    verify_and_update_password,
+)
+from app.core.throttle import login_throttle
+from app.core.token_epochs import claims_mode_enabled, token_epochs
 from app.db.session import get_db
 from app.models.models import User
+from app.repositories import users as users_repo
 from app.schemas.auth import TokenOut, UserCreate, UserOut
 
 router = APIRouter()
@@ -26,7 +35,6 @@ def register(payload: UserCreate, db: Session = Depends(get_db)):
     try:
         db.add(new_user)
         db.commit()
-        db.refresh(new_user)
         return new_user
     except IntegrityError:
         db.rollback()
@@ -38,12 +46,21 @@ def register(payload: UserCreate, db: Session = Depends(get_db)):
 
 @router.post("/token", response_model=TokenOut)
 def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
-    user = db.query(User).filter(User.username == form_data.username).first()
+    client_ip = request.client.host if request.client else None
+    login_throttle.check(client_ip, form_data.username)
 
-    if user is None or not verify_password(form_data.password, user.hashed_password):
+    user = users_repo.get_user_by_username(db, form_data.username)
+
+    verified, new_hash = (False, None)
+    if user is not None:
+        verified, new_hash = verify_and_update_password(form_data.password, user.hashed_password)
+
+    if not verified:
+        login_throttle.record_failure(client_ip, form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials",
@@ -55,47 +72,98 @@ def login(
             detail="User is inactive",
         )
 
+    if new_hash is not None:
+        user.hashed_password = new_hash
+        db.commit()
+
+    extra = None
+    if claims_mode_enabled():
+        extra = {
+            "username": user.username,
+            "role": user.role,
+            "epoch": int(user.token_epoch or 0),
+        }
+
     token = create_access_token(
         subject=str(user.user_id),
         expires_minutes=60,
+        extra=extra,
     )
 
     return TokenOut(access_token=token)
 
 
 def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-) -> User:
+) -> Principal:
+    principal = _resolve_principal(token, db)
+    request.state.user_id = principal.user_id
+    return principal
+
+
+def _resolve_principal(token: str, db: Session) -> Principal:
     try:
         payload = decode_token(token)
         sub = payload.get("sub")
         if not sub:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
         user_id = int(sub)
+        role = payload.get("role")
+        epoch = payload.get("epoch")
+        if role is not None and epoch is not None:
+            epoch = int(epoch)
     except HTTPException:
         raise
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = db.query(User).filter(User.user_id == user_id).first()
+    if role is not None and epoch is not None:
+        if not token_epochs.is_current(db, user_id, epoch):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
 
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+        return Principal(
+            user_id=user_id,
+            username=payload.get("username"),
+            email=None,
+            role=role,
+            is_active=True,
+        )
 
-    if not user.is_active:
+    return _load_principal(db, user_id)
+
+
+def _load_principal(db: Session, user_id: int) -> Principal:
+    principal = principal_cache.get(user_id)
+
+    if principal is None:
+        user = users_repo.get_user(db, user_id)
+
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+        principal = Principal.from_user(user)
+        principal_cache.put(principal)
+
+    if not principal.is_active:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is inactive")
 
-    return user
+    return principal
 
 
 @router.get("/me", response_model=UserOut)
-def me(current_user: User = Depends(get_current_user)):
+def me(
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if current_user.email is None:
+        return _load_principal(db, current_user.user_id)
     return current_user
 
 
 def require_roles(*allowed_roles: str):
-    def _dep(current_user: User = Depends(get_current_user)) -> User:
+    def _dep(current_user: Principal = Depends(get_current_user)) -> Principal:
         role = getattr(current_user, "role", None)
         if role not in allowed_roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
@@ -1,22 +1,79 @@
-﻿from fastapi import APIRouter, Depends, HTTPException, Path
+﻿from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.v1.routers.auth import require_roles
-from app.db.session import get_db
+from app.core import etags
+from app.core.fields import columns_for, render_rows, sparse_fields, sparse_response
+from app.core.pagination import PageParams, keyset, page_params, paginate
+from app.core.response_cache import cache_key, resource_versions, serve_cached, store_response
+from app.db.counts import set_total_count
+from app.db.session import get_async_read_db, get_db
 from app.models.models import Customer
+from app.repositories import customers as customers_repo
+from app.repositories import search as search_repo
 from app.schemas.schemas import CustomerCreate, CustomerOut, CustomerUpdate
 
 router = APIRouter()
 
+customer_fields = sparse_fields(CustomerOut, key="customer_id")
+
 
 @router.get(
     "",
     response_model=list[CustomerOut],
     operation_id="v1_customers_list",
 )
-def list_customers(db: Session = Depends(get_db)):
-    return db.query(Customer).order_by(Customer.customer_id.desc()).limit(50).all()
+async def list_customers(
+    request: Request,
+    response: Response,
+    q: Optional[str] = Query(
+        default=None,
+        min_length=2,
+        max_length=100,
+        description="Search first name, last name and email; results are ranked by match",
+    ),
+    page: PageParams = Depends(page_params),
+    fields: Optional[tuple[str, ...]] = Depends(customer_fields),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    key = cache_key(request, ("customers",))
+    cached = serve_cached(request, key)
+    if cached is not None:
+        return cached
+
+    columns = fields or tuple(CustomerOut.model_fields)
+    stmt = select(*columns_for(Customer, columns, extra=("updated_at",)))
+    sort = [Customer.customer_id]
+    if q is not None:
+        stmt, score = search_repo.search(stmt, "customers", Customer.customer_id, q)
+        sort = [score, Customer.customer_id]
+
+    page_stmt = keyset(stmt, sort, page)
+    not_modified = await etags.check_page(
+        db, request, page_stmt, Customer.customer_id, Customer.updated_at
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if page.include_total:
+        await set_total_count(db, response, "customers", {"q": q}, stmt)
+
+    result = await db.execute(page_stmt)
+    rows = result.all()
+    etags.set_etag(response, etags.page_etag(request, rows, "customer_id", "updated_at"))
+    rows = paginate(
+        rows,
+        page,
+        request,
+        response,
+        key=lambda c: (c.score, c.customer_id) if q is not None else (c.customer_id,),
+    )
+    return store_response(request, key, render_rows(CustomerOut, columns, rows), response)
 
 
 @router.post(
@@ -33,8 +90,16 @@ def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)):
             last_name=payload.last_name,
         )
         db.add(new_customer)
+        db.flush()
+        search_repo.index_entity(
+            db,
+            "customers",
+            new_customer.customer_id,
+            {f: getattr(new_customer, f) for f in search_repo.CUSTOMER_SEARCH_FIELDS},
+            replace=False,
+        )
         db.commit()
-        db.refresh(new_customer)
+        resource_versions.bump("customers")
         return new_customer
 
     except IntegrityError:
@@ -47,16 +112,29 @@ def create_customer(payload: CustomerCreate, db: Session = Depends(get_db)):
     response_model=CustomerOut,
     operation_id="v1_customers_get",
 )
-def get_customer(
+async def get_customer(
+    request: Request,
+    response: Response,
     customer_id: int = Path(..., ge=1, le=9999, description="Customer ID (1-9999)"),
-    db: Session = Depends(get_db),
+    fields: Optional[tuple[str, ...]] = Depends(customer_fields),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    customer = db.query(Customer).filter(Customer.customer_id == customer_id).first()
+    not_modified = await etags.check_row(
+        db, request, Customer.customer_id, Customer.updated_at, customer_id
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if fields:
+        customer = await customers_repo.get_customer_fields_async(db, customer_id, fields)
+    else:
+        customer = await customers_repo.get_customer_async(db, customer_id)
 
     if customer is None:
         raise HTTPException(status_code=404, detail="Customer not found")
 
-    return customer
+    etags.set_etag(response, etags.row_etag(request, customer_id, customer.updated_at))
+    return sparse_response(CustomerOut, fields, customer, response) if fields else customer
 
 
 @router.delete(
@@ -69,14 +147,16 @@ def delete_customer(
     customer_id: int = Path(..., ge=1, description="Customer ID (1-100)"),
     db: Session = Depends(get_db),
 ):
-    customer = db.query(Customer).filter(Customer.customer_id == customer_id).first()
+    customer = customers_repo.get_customer(db, customer_id)
 
     if customer is None:
         raise HTTPException(status_code=404, detail="Customer not found")
 
     try:
+        search_repo.drop_entity(db, "customers", customer_id)
         db.delete(customer)
         db.commit()
+        resource_versions.bump("customers")
         return None
 
     except IntegrityError:
@@ -98,27 +178,28 @@ def update_customer(
     customer_id: int = Path(..., ge=1, description="Customer ID (1-100)"),
     db: Session = Depends(get_db),
 ):
-    customer = db.query(Customer).filter(Customer.customer_id == customer_id).first()
+    customer = customers_repo.get_customer(db, customer_id)
 
     if customer is None:
         raise HTTPException(status_code=404, detail="Customer not found")
 
-    updated = False
+    changed = {}
 
     if payload.first_name is not None:
         customer.first_name = payload.first_name
-        updated = True
+        changed["first_name"] = payload.first_name
 
     if payload.last_name is not None:
         customer.last_name = payload.last_name
-        updated = True
+        changed["last_name"] = payload.last_name
 
-    if not updated:
+    if not changed:
         raise HTTPException(status_code=400, detail="No fields provided for update")
 
     try:
+        search_repo.index_entity(db, "customers", customer_id, changed)
         db.commit()
-        db.refresh(customer)
+        resource_versions.bump("customers")
         return customer
 
     except IntegrityError:
@@ -137,18 +218,28 @@ def replace_customer(
     customer_id: int = Path(..., ge=1, le=9999, description="Customer ID (1-9999)"),
     db: Session = Depends(get_db),
 ):
-    customer = db.query(Customer).filter(Customer.customer_id == customer_id).first()
-
-    if customer is None:
-        raise HTTPException(status_code=404, detail="Customer not found")
-
-    customer.first_name = payload.first_name
-    customer.last_name = payload.last_name
-
     try:
+        result = db.execute(
+            update(Customer)
+            .where(Customer.customer_id == customer_id)
+            .values(first_name=payload.first_name, last_name=payload.last_name)
+        )
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Customer not found")
+
+        search_repo.index_entity(
+            db,
+            "customers",
+            customer_id,
+            {"first_name": payload.first_name, "last_name": payload.last_name},
+        )
         db.commit()
-        db.refresh(customer)
-        return customer
+        resource_versions.bump("customers")
+        return CustomerOut(
+            customer_id=customer_id,
+            first_name=payload.first_name,
+            last_name=payload.last_name,
+        )
 
     except IntegrityError:
         db.rollback()
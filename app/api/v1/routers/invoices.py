@@ -1,24 +1,37 @@
 from datetime import date
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.v1.routers.auth import require_roles
-from app.db.session import get_db
-from app.models.models import Customer, Invoice, Property
+from app.core import etags
+from app.core.fields import render_rows, sparse_fields, sparse_response
+from app.core.pagination import PageParams, keyset, page_params, paginate
+from app.core.response_cache import cache_key, resource_versions, serve_cached, store_response
+from app.db.counts import set_total_count
+from app.db.session import get_async_read_db, get_db
+from app.models.models import Invoice
+from app.repositories import invoices as invoices_repo
+from app.repositories import revenue as revenue_repo
+from app.repositories.reports import RECEIVABLE_STATUSES
 from app.schemas.schemas import InvoiceCreate, InvoiceOut
 
 router = APIRouter()
 
+invoice_fields = sparse_fields(InvoiceOut, key="invoice_id")
+
 
 @router.get(
     "",
     response_model=list[InvoiceOut],
     operation_id="v1_invoices_list",
 )
-def list_invoices(
+async def list_invoices(
+    request: Request,
+    response: Response,
     status: Optional[str] = Query(
         default=None,
         pattern="^(draft|sent|paid|void)$",
@@ -28,26 +41,45 @@ def list_invoices(
     property_id: Optional[int] = Query(default=None, ge=1),
     from_date: Optional[date] = Query(default=None),
     to_date: Optional[date] = Query(default=None),
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    fields: Optional[tuple[str, ...]] = Depends(invoice_fields),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    q = db.query(Invoice)
-
-    if status is not None:
-        q = q.filter(Invoice.status == status)
-
-    if customer_id is not None:
-        q = q.filter(Invoice.customer_id == customer_id)
-
-    if property_id is not None:
-        q = q.filter(Invoice.property_id == property_id)
-
-    if from_date is not None:
-        q = q.filter(Invoice.issued_date >= from_date)
-
-    if to_date is not None:
-        q = q.filter(Invoice.issued_date <= to_date)
-
-    return q.order_by(Invoice.invoice_id.desc()).limit(50).all()
+    key = cache_key(request, ("invoices",))
+    cached = serve_cached(request, key)
+    if cached is not None:
+        return cached
+
+    filters = {
+        "status": status,
+        "customer_id": customer_id,
+        "property_id": property_id,
+        "from_date": from_date,
+        "to_date": to_date,
+    }
+    columns = fields or tuple(InvoiceOut.model_fields)
+    stmt = invoices_repo.invoice_list_stmt(**filters, fields=columns)
+    page_stmt = keyset(stmt, [Invoice.invoice_id], page)
+    not_modified = await etags.check_page(
+        db, request, page_stmt, Invoice.invoice_id, Invoice.updated_at
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if page.include_total:
+        await set_total_count(db, response, "invoices", filters, stmt)
+
+    result = await db.execute(page_stmt)
+    rows = result.all()
+    etags.set_etag(response, etags.page_etag(request, rows, "invoice_id", "updated_at"))
+    rows = paginate(
+        rows,
+        page,
+        request,
+        response,
+        key=lambda i: (i.invoice_id,),
+    )
+    return store_response(request, key, render_rows(InvoiceOut, columns, rows), response)
 
 
 @router.get(
@@ -55,14 +87,28 @@ def list_invoices(
     response_model=InvoiceOut,
     operation_id="v1_invoices_get",
 )
-def get_invoice(
+async def get_invoice(
+    request: Request,
+    response: Response,
     invoice_id: int = Path(..., ge=1, description="Invoice ID (>= 1)"),
-    db: Session = Depends(get_db),
+    fields: Optional[tuple[str, ...]] = Depends(invoice_fields),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    row = db.query(Invoice).filter(Invoice.invoice_id == invoice_id).first()
+    not_modified = await etags.check_row(
+        db, request, Invoice.invoice_id, Invoice.updated_at, invoice_id
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if fields:
+        row = await invoices_repo.get_invoice_fields_async(db, invoice_id, fields)
+    else:
+        row = await invoices_repo.get_invoice_async(db, invoice_id)
     if row is None:
         raise HTTPException(status_code=404, detail="Invoice not found")
-    return row
+
+    etags.set_etag(response, etags.row_etag(request, invoice_id, row.updated_at))
+    return sparse_response(InvoiceOut, fields, row, response) if fields else row
 
 
 @router.post(
@@ -73,23 +119,14 @@ def get_invoice(
     dependencies=[Depends(require_roles("admin"))],
 )
 def create_invoice(payload: InvoiceCreate, db: Session = Depends(get_db)):
-    customer_exists = (
-        db.query(Customer.customer_id)
-        .filter(Customer.customer_id == payload.customer_id)
-        .first()
-    )
-    if customer_exists is None:
+    parents = invoices_repo.get_invoice_parents(db, payload.customer_id, payload.property_id)
+    if parents.customer_id is None:
         raise HTTPException(status_code=404, detail="Customer not found")
 
-    property_row = (
-        db.query(Property.property_id, Property.customer_id)
-        .filter(Property.property_id == payload.property_id)
-        .first()
-    )
-    if property_row is None:
+    if parents.property_customer_id is None:
         raise HTTPException(status_code=404, detail="Property not found")
 
-    if property_row.customer_id != payload.customer_id:
+    if parents.property_customer_id != payload.customer_id:
         raise HTTPException(
             status_code=400,
             detail="Property does not belong to the given customer_id",
@@ -111,8 +148,18 @@ def create_invoice(payload: InvoiceCreate, db: Session = Depends(get_db)):
 
     try:
         db.add(new_invoice)
+        if payload.status in RECEIVABLE_STATUSES:
+            revenue_repo.record(
+                db,
+                [revenue_repo.invoiced(payload.issued_date, payload.customer_id, payload.property_id, payload.total)],
+            )
+            due_date = payload.due_date or payload.issued_date
+            revenue_repo.record_receivables(
+                db,
+                [revenue_repo.receivable(payload.issued_date, due_date, payload.customer_id, payload.total)],
+            )
         db.commit()
-        db.refresh(new_invoice)
+        resource_versions.bump("invoices")
         return new_invoice
 
     except IntegrityError:
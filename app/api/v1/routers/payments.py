@@ -1,17 +1,30 @@
 from decimal import Decimal
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.v1.routers.auth import require_roles
-from app.db.session import get_db
+from app.core import etags
+from app.core.fields import render_rows, sparse_fields
+from app.core.pagination import PageParams, keyset, page_params, paginate
+from app.core.response_cache import cache_key, resource_versions, serve_cached, store_response
+from app.db.counts import set_total_count
+from app.db.errors import duplicate_key
+from app.db.session import get_async_read_db, get_db
 from app.models.models import Invoice, Payment
+from app.repositories import invoices as invoices_repo
+from app.repositories import payments as payments_repo
+from app.repositories import revenue as revenue_repo
 from app.schemas.schemas import PaymentCreate, PaymentOut
 
 router = APIRouter()
 
+payment_fields = sparse_fields(PaymentOut, key="payment_id")
+
 
 @router.post(
     "",
@@ -21,7 +34,7 @@ router = APIRouter()
     dependencies=[Depends(require_roles("admin"))],
 )
 def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
-    invoice = db.query(Invoice).filter(Invoice.invoice_id == payload.invoice_id).first()
+    invoice = invoices_repo.get_invoice_for_payment(db, payload.invoice_id)
     if invoice is None:
         raise HTTPException(status_code=404, detail="Invoice not found")
 
@@ -31,26 +44,10 @@ def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
     if invoice.status == "void":
         raise HTTPException(status_code=400, detail="Cannot pay a void invoice")
 
-    if payload.reference:
-        dup = (
-            db.query(Payment.payment_id)
-            .filter(Payment.invoice_id == payload.invoice_id)
-            .filter(Payment.reference == payload.reference)
-            .first()
-        )
-        if dup is not None:
-            raise HTTPException(
-                status_code=409,
-                detail="Duplicate payment reference for this invoice",
-            )
+    inv_total = Decimal(str(invoice.total))
+    new_total_paid = Decimal(str(invoice.paid_so_far)) + payload.amount
 
-    paid_so_far = (
-        db.query(func.coalesce(func.sum(Payment.amount), 0))
-        .filter(Payment.invoice_id == invoice.invoice_id)
-        .scalar()
-    )
-
-    if (Decimal(str(paid_so_far)) + payload.amount) > Decimal(str(invoice.total)):
+    if new_total_paid > inv_total:
         raise HTTPException(status_code=409, detail="Payment exceeds invoice total")
 
     new_payment = Payment(
@@ -62,23 +59,55 @@ def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
         notes=payload.notes,
     )
 
+    new_status = invoice.status
+    if new_total_paid >= inv_total:
+        new_status = "paid"
+    elif invoice.status == "draft":
+        new_status = "sent"
+
+    rollup = [
+        revenue_repo.collected(payload.paid_date, invoice.customer_id, invoice.property_id, payload.amount)
+    ]
+    due_date = invoice.due_date or invoice.issued_date
+    receivables = [
+        revenue_repo.receivable(
+            revenue_repo.payment_day(invoice.issued_date, payload.paid_date),
+            due_date,
+            invoice.customer_id,
+            -payload.amount,
+        )
+    ]
+    if invoice.status == "draft":
+        rollup.append(
+            revenue_repo.invoiced(invoice.issued_date, invoice.customer_id, invoice.property_id, inv_total)
+        )
+        receivables.append(revenue_repo.receivable(invoice.issued_date, due_date, invoice.customer_id, inv_total))
+
     try:
         db.add(new_payment)
-
-        inv_total = Decimal(str(invoice.total))
-        new_total_paid = Decimal(str(paid_so_far)) + Decimal(str(payload.amount))
-
-        if new_total_paid >= inv_total:
-            invoice.status = "paid"
-        elif invoice.status == "draft":
-            invoice.status = "sent"
+        revenue_repo.record(db, rollup)
+        revenue_repo.record_receivables(db, receivables)
+
+        if new_status != invoice.status:
+            db.execute(
+                update(Invoice)
+                .where(Invoice.invoice_id == payload.invoice_id)
+                .values(status=new_status)
+            )
 
         db.commit()
-        db.refresh(new_payment)
+        resource_versions.bump("payments")
+        if new_status != invoice.status:
+            resource_versions.bump("invoices")
         return new_payment
 
     except IntegrityError as e:
         db.rollback()
+        if duplicate_key(e) == "uq_payments_invoice_reference":
+            raise HTTPException(
+                status_code=409,
+                detail="Duplicate payment reference for this invoice",
+            )
         raise HTTPException(
             status_code=409,
             detail=f"Database constraint violation: {str(getattr(e, 'orig', e))}",
@@ -90,17 +119,44 @@ def create_payment(payload: PaymentCreate, db: Session = Depends(get_db)):
     response_model=list[PaymentOut],
     operation_id="v1_payments_list",
 )
-def list_payments(
+async def list_payments(
+    request: Request,
+    response: Response,
     invoice_id: int | None = Query(
         default=None,
         ge=1,
         description="Filter by invoice_id (>= 1)",
     ),
-    db: Session = Depends(get_db),
+    page: PageParams = Depends(page_params),
+    fields: Optional[tuple[str, ...]] = Depends(payment_fields),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    q = db.query(Payment)
-
-    if invoice_id is not None:
-        q = q.filter(Payment.invoice_id == invoice_id)
+    key = cache_key(request, ("payments",))
+    cached = serve_cached(request, key)
+    if cached is not None:
+        return cached
+
+    columns = fields or tuple(PaymentOut.model_fields)
+    stmt = payments_repo.payment_list_stmt(invoice_id, fields=columns)
+    page_stmt = keyset(stmt, [Payment.payment_id], page)
+    not_modified = await etags.check_page(
+        db, request, page_stmt, Payment.payment_id, Payment.created_at
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if page.include_total:
+        await set_total_count(db, response, "payments", {"invoice_id": invoice_id}, stmt)
+
+    result = await db.execute(page_stmt)
+    rows = result.all()
+    etags.set_etag(response, etags.page_etag(request, rows, "payment_id", "created_at"))
+    rows = paginate(
+        rows,
+        page,
+        request,
+        response,
+        key=lambda p: (p.payment_id,),
+    )
+    return store_response(request, key, render_rows(PaymentOut, columns, rows), response)
 
-    return q.order_by(Payment.payment_id.desc()).limit(50).all()
@@ -1,32 +1,92 @@
 ﻿from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.v1.routers.auth import require_roles
-from app.db.session import get_db
-from app.models.models import Customer, Property
+from app.core import etags
+from app.core.fields import columns_for, render_rows, sparse_fields, sparse_response
+from app.core.pagination import PageParams, keyset, page_params, paginate
+from app.core.response_cache import cache_key, resource_versions, serve_cached, store_response
+from app.db.counts import set_total_count
+from app.db.errors import foreign_key_violation
+from app.db.session import get_async_read_db, get_db
+from app.models.models import Property
+from app.repositories import properties as properties_repo
+from app.repositories import search as search_repo
 from app.schemas.schemas import PropertyCreate, PropertyOut, PropertyUpdate
 
 router = APIRouter()
 
+property_fields = sparse_fields(PropertyOut, key="property_id")
+
+
+def _raise_for_integrity_error(exc: IntegrityError) -> None:
+    if foreign_key_violation(exc) == "fk_properties_customer":
+        raise HTTPException(status_code=404, detail="Customer not found")
+    raise HTTPException(status_code=409, detail="Database constraint violation")
+
 
 @router.get(
     "",
     response_model=list[PropertyOut],
     operation_id="v1_properties_list",
 )
-def list_properties(
+async def list_properties(
+    request: Request,
+    response: Response,
     customer_id: Optional[int] = Query(default=None, ge=1),
-    db: Session = Depends(get_db),
+    q: Optional[str] = Query(
+        default=None,
+        min_length=2,
+        max_length=100,
+        description="Search label, address, city and postal code; results are ranked by match",
+    ),
+    page: PageParams = Depends(page_params),
+    fields: Optional[tuple[str, ...]] = Depends(property_fields),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    q = db.query(Property)
+    key = cache_key(request, ("properties",))
+    cached = serve_cached(request, key)
+    if cached is not None:
+        return cached
+
+    columns = fields or tuple(PropertyOut.model_fields)
+    stmt = select(*columns_for(Property, columns, extra=("updated_at",)))
+    sort = [Property.property_id]
+    if q is not None:
+        stmt, score = search_repo.search(stmt, "properties", Property.property_id, q)
+        sort = [score, Property.property_id]
 
     if customer_id is not None:
-        q = q.filter(Property.customer_id == customer_id)
+        stmt = stmt.where(Property.customer_id == customer_id)
 
-    return q.order_by(Property.property_id.desc()).limit(50).all()
+    page_stmt = keyset(stmt, sort, page)
+    not_modified = await etags.check_page(
+        db, request, page_stmt, Property.property_id, Property.updated_at
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if page.include_total:
+        await set_total_count(
+            db, response, "properties", {"customer_id": customer_id, "q": q}, stmt
+        )
+
+    result = await db.execute(page_stmt)
+    rows = result.all()
+    etags.set_etag(response, etags.page_etag(request, rows, "property_id", "updated_at"))
+    rows = paginate(
+        rows,
+        page,
+        request,
+        response,
+        key=lambda p: (p.score, p.property_id) if q is not None else (p.property_id,),
+    )
+    return store_response(request, key, render_rows(PropertyOut, columns, rows), response)
 
 
 @router.post(
@@ -37,14 +97,6 @@ def list_properties(
     dependencies=[Depends(require_roles("admin"))],
 )
 def create_property(payload: PropertyCreate, db: Session = Depends(get_db)):
-    customer_exists = (
-        db.query(Customer.customer_id)
-        .filter(Customer.customer_id == payload.customer_id)
-        .first()
-    )
-    if customer_exists is None:
-        raise HTTPException(status_code=404, detail="Customer not found")
-
     new_property = Property(
         customer_id=payload.customer_id,
         label=payload.label,
@@ -59,12 +111,20 @@ def create_property(payload: PropertyCreate, db: Session = Depends(get_db)):
 
     try:
         db.add(new_property)
+        db.flush()
+        search_repo.index_entity(
+            db,
+            "properties",
+            new_property.property_id,
+            {f: getattr(new_property, f) for f in search_repo.PROPERTY_SEARCH_FIELDS},
+            replace=False,
+        )
         db.commit()
-        db.refresh(new_property)
+        resource_versions.bump("properties")
         return new_property
-    except IntegrityError:
+    except IntegrityError as e:
         db.rollback()
-        raise HTTPException(status_code=409, detail="Database constraint violation")
+        _raise_for_integrity_error(e)
 
 
 @router.get(
@@ -72,14 +132,28 @@ def create_property(payload: PropertyCreate, db: Session = Depends(get_db)):
     response_model=PropertyOut,
     operation_id="v1_properties_get",
 )
-def get_property(
+async def get_property(
+    request: Request,
+    response: Response,
     property_id: int = Path(..., ge=1, description="Property ID (1-100)"),
-    db: Session = Depends(get_db),
+    fields: Optional[tuple[str, ...]] = Depends(property_fields),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
-    row = db.query(Property).filter(Property.property_id == property_id).first()
+    not_modified = await etags.check_row(
+        db, request, Property.property_id, Property.updated_at, property_id
+    )
+    if not_modified is not None:
+        return not_modified
+
+    if fields:
+        row = await properties_repo.get_property_fields_async(db, property_id, fields)
+    else:
+        row = await properties_repo.get_property_async(db, property_id)
     if row is None:
         raise HTTPException(status_code=404, detail="Property not found")
-    return row
+
+    etags.set_etag(response, etags.row_etag(request, property_id, row.updated_at))
+    return sparse_response(PropertyOut, fields, row, response) if fields else row
 
 
 @router.patch(
@@ -93,11 +167,11 @@ def update_property(
     payload: PropertyUpdate = None,
     db: Session = Depends(get_db),
 ):
-    row = db.query(Property).filter(Property.property_id == property_id).first()
+    row = properties_repo.get_property(db, property_id)
     if row is None:
         raise HTTPException(status_code=404, detail="Property not found")
 
-    updated = False
+    changed = {}
 
     for field in (
         "label",
@@ -112,14 +186,20 @@ def update_property(
         value = getattr(payload, field, None)
         if value is not None:
             setattr(row, field, value)
-            updated = True
+            changed[field] = value
 
-    if not updated:
+    if not changed:
         raise HTTPException(status_code=400, detail="No fields provided for update")
 
     try:
+        search_repo.index_entity(
+            db,
+            "properties",
+            property_id,
+            {f: v for f, v in changed.items() if f in search_repo.PROPERTY_SEARCH_FIELDS},
+        )
         db.commit()
-        db.refresh(row)
+        resource_versions.bump("properties")
         return row
     except IntegrityError:
         db.rollback()
@@ -137,35 +217,27 @@ def replace_property(
     property_id: int = Path(..., ge=1, description="Property ID (1-100)"),
     db: Session = Depends(get_db),
 ):
-    row = db.query(Property).filter(Property.property_id == property_id).first()
-    if row is None:
-        raise HTTPException(status_code=404, detail="Property not found")
-
-    customer_exists = (
-        db.query(Customer.customer_id)
-        .filter(Customer.customer_id == payload.customer_id)
-        .first()
-    )
-    if customer_exists is None:
-        raise HTTPException(status_code=404, detail="Customer not found")
-
-    row.customer_id = payload.customer_id
-    row.label = payload.label
-    row.address1 = payload.address1
-    row.address2 = payload.address2
-    row.city = payload.city
-    row.state = payload.state
-    row.postal_code = payload.postal_code
-    row.notes = payload.notes
-    row.is_active = payload.is_active
+    values = payload.model_dump()
 
     try:
+        result = db.execute(
+            update(Property).where(Property.property_id == property_id).values(**values)
+        )
+        if result.rowcount == 0:
+            raise HTTPException(status_code=404, detail="Property not found")
+
+        search_repo.index_entity(
+            db,
+            "properties",
+            property_id,
+            {f: values[f] for f in search_repo.PROPERTY_SEARCH_FIELDS},
+        )
         db.commit()
-        db.refresh(row)
-        return row
-    except IntegrityError:
+        resource_versions.bump("properties")
+        return PropertyOut(property_id=property_id, **values)
+    except IntegrityError as e:
         db.rollback()
-        raise HTTPException(status_code=409, detail="Database constraint violation")
+        _raise_for_integrity_error(e)
 
 
 @router.delete(
@@ -178,13 +250,15 @@ def delete_property(
     property_id: int = Path(..., ge=1, description="Property ID (1-100)"),
     db: Session = Depends(get_db),
 ):
-    row = db.query(Property).filter(Property.property_id == property_id).first()
+    row = properties_repo.get_property(db, property_id)
     if row is None:
         raise HTTPException(status_code=404, detail="Property not found")
 
     try:
+        search_repo.drop_entity(db, "properties", property_id)
         db.delete(row)
         db.commit()
+        resource_versions.bump("properties")
         return None
     except IntegrityError:
         db.rollback()
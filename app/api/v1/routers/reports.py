@@ -1,54 +1,164 @@
 from decimal import Decimal
 from datetime import date
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
-from app.models.models import Customer, Invoice
-from app.schemas.schemas import CustomerStatementOut, StatementItem
+from app.core.exceptions import bad_request
+from app.core.pagination import PageParams, page_params, paginate, set_next_link
+from app.core.response_cache import cache_key, resource_versions, serve_cached, store_response
+from app.db.report_totals import cached_totals
+from app.db.session import get_async_read_db
+from app.repositories import customers as customers_repo
+from app.repositories import reports as reports_repo
+from app.repositories import revenue as revenue_repo
+from app.schemas.schemas import (
+    AgingBuckets,
+    AgingReportOut,
+    AgingRow,
+    CustomerStatementOut,
+    RevenuePoint,
+    RevenueReportOut,
+    RevenueTotals,
+    StatementItem,
+)
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
 @router.get("/customers/{customer_id}/statement", response_model=CustomerStatementOut)
-def customer_statement(
+async def customer_statement(
     customer_id: int = Path(..., ge=1, description="Customer ID (>= 1)"),
     from_: date = Query(..., alias="from", description="Start date (YYYY-MM-DD)"),
     to: date = Query(..., description="End date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     if from_ > to:
         raise HTTPException(status_code=400, detail="'from' must be <= 'to'")
 
-    exists = db.query(Customer.customer_id).filter(Customer.customer_id == customer_id).first()
-    if exists is None:
+    if not await customers_repo.customer_exists_async(db, customer_id):
         raise HTTPException(status_code=404, detail="Customer not found")
 
-    invoices = (
-        db.query(Invoice)
-        .filter(Invoice.customer_id == customer_id)
-        .filter(Invoice.issued_date >= from_)
-        .filter(Invoice.issued_date <= to)
-        .order_by(Invoice.issued_date.asc(), Invoice.invoice_id.asc())
-        .all()
-    )
-
-    total = sum((inv.total for inv in invoices), Decimal("0.00"))
+    rows = (await db.execute(reports_repo.customer_statement_stmt(customer_id, from_, to))).all()
 
+    opening, entries = rows[0], rows[1:]
     items = [
         StatementItem(
-            invoice_id=inv.invoice_id,
-            issued_date=inv.issued_date,
-            status=inv.status,
-            total=inv.total,
+            kind=row.kind,
+            entry_date=row.entry_date,
+            invoice_id=row.invoice_id,
+            payment_id=row.payment_id,
+            status=row.status,
+            amount=row.amount,
+            balance=row.balance,
         )
-        for inv in invoices
+        for row in entries
     ]
 
     return CustomerStatementOut(
         customer_id=customer_id,
         from_date=from_,
         to_date=to,
-        total=total,
+        opening_balance=opening.balance,
+        invoiced=sum((i.amount for i in items if i.kind == "invoice"), Decimal("0.00")),
+        paid=-sum((i.amount for i in items if i.kind == "payment"), Decimal("0.00")),
+        closing_balance=rows[-1].balance,
         items=items,
     )
+
+
+@router.get("/aging", response_model=AgingReportOut)
+async def receivables_aging(
+    request: Request,
+    response: Response,
+    as_of: Optional[date] = Query(None, description="Age balances as of this date (YYYY-MM-DD), default today"),
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    as_of = as_of or date.today()
+    resources = ("invoices", "payments")
+    key = cache_key(request, resources, as_of)
+    cached = serve_cached(request, key)
+    if cached is not None:
+        return cached
+
+    after = None
+    if page.after is not None:
+        if len(page.after) != 1:
+            raise bad_request("INVALID_CURSOR", "Invalid pagination cursor")
+        after = page.after[0]
+
+    totals = None
+    if after is None:
+        totals_key = ("aging", as_of, resource_versions.snapshot(resources))
+        totals = AgingBuckets(**await cached_totals(db, totals_key, reports_repo.aging_totals_stmt(as_of)))
+
+    # customers with nothing in any bucket are dropped, so keep paging customers
+    # (in growing windows) until the page is full or there are none left
+    rows = []
+    window = page.limit + 1
+    for _ in range(reports_repo.AGING_MAX_ROUNDS):
+        batch = (await db.execute(reports_repo.aging_stmt(as_of, window, after_customer_id=after))).all()
+        rows += [row for row in batch if any(getattr(row, b) != 0 for b in reports_repo.AGING_BUCKETS)]
+        if len(rows) > page.limit or len(batch) < window:
+            break
+        after = batch[-1].customer_id
+        window = min(window * 2, reports_repo.AGING_MAX_WINDOW)
+    else:
+        # a long run of settled customers: return the short page and let the
+        # next one resume after the last customer looked at
+        set_next_link(request, response, page, (after,))
+
+    rows = paginate(rows, page, request, response, key=lambda r: (r.customer_id,))
+    report = AgingReportOut(
+        as_of=as_of,
+        totals=totals,
+        items=[AgingRow.model_validate(row._mapping) for row in rows],
+    )
+    return store_response(request, key, report.model_dump_json().encode(), response)
+
+
+@router.get("/revenue", response_model=RevenueReportOut)
+async def revenue(
+    request: Request,
+    response: Response,
+    from_: date = Query(..., alias="from", description="Start date (YYYY-MM-DD)"),
+    to: date = Query(..., description="End date (YYYY-MM-DD)"),
+    granularity: str = Query("day", pattern="^(day|month)$", description="Bucket size: day or month"),
+    customer_id: Optional[int] = Query(None, ge=1, description="Only this customer's invoices and payments"),
+    property_id: Optional[int] = Query(None, ge=1, description="Only this property's invoices and payments"),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    if from_ > to:
+        raise HTTPException(status_code=400, detail="'from' must be <= 'to'")
+
+    key = cache_key(request, ("invoices", "payments"))
+    cached = serve_cached(request, key)
+    if cached is not None:
+        return cached
+
+    stmt = revenue_repo.revenue_series_stmt(from_, to, customer_id=customer_id, property_id=property_id)
+    rows = (await db.execute(stmt)).all()
+
+    periods: dict[date, dict] = {}
+    for row in rows:
+        period = row.day.replace(day=1) if granularity == "month" else row.day
+        point = periods.setdefault(period, dict.fromkeys(revenue_repo.MEASURES, 0))
+        for measure in revenue_repo.MEASURES:
+            point[measure] += getattr(row, measure)
+
+    totals = dict.fromkeys(revenue_repo.MEASURES, 0)
+    for point in periods.values():
+        for measure in revenue_repo.MEASURES:
+            totals[measure] += point[measure]
+
+    report = RevenueReportOut(
+        from_date=from_,
+        to_date=to,
+        granularity=granularity,
+        customer_id=customer_id,
+        property_id=property_id,
+        totals=RevenueTotals(**totals),
+        items=[RevenuePoint(period=period, **point) for period, point in periods.items()],
+    )
+    return store_response(request, key, report.model_dump_json().encode(), response)
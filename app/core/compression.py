@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import gzip
+import os
+import threading
+from typing import Iterable, Optional
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+COMPRESSION_CONTENT_TYPES = tuple(
+    t.strip()
+    for t in os.getenv("COMPRESSION_CONTENT_TYPES", "application/json,text/").split(",")
+    if t.strip()
+)
+
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    if not COMPRESSION_ENABLED or not accept_encoding:
+        return None
+
+    offered: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        offered[name.strip().lower()] = weight
+
+    ranked = [
+        (offered.get(e, offered.get("*", 0.0)), -i, e) for i, e in enumerate(SUPPORTED_ENCODINGS)
+    ]
+    weight, _, encoding = max(ranked)
+    return encoding if weight > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compressible_type(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    return content_type.split(";")[0].strip().lower().startswith(COMPRESSION_CONTENT_TYPES)
+
+
+class Precompressed:
+    """A payload served repeatedly; each encoding is compressed at most once."""
+
+    def __init__(self, body: bytes, media_type: str = "application/json") -> None:
+        self.body = body
+        self.media_type = media_type
+        self._variants: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def encode(self, encoding: Optional[str]) -> tuple[bytes, Optional[str]]:
+        if encoding is None or len(self.body) < COMPRESSION_MIN_BYTES or not compressible_type(self.media_type):
+            return self.body, None
+
+        variant = self._variants.get(encoding)
+        if variant is None:
+            variant = compress(self.body, encoding)
+            with self._lock:
+                variant = self._variants.setdefault(encoding, variant)
+        return variant, encoding
+
+
+def _mark_encoded(response: Response, encoding: Optional[str]) -> None:
+    vary = response.headers.get("vary")
+    if not vary:
+        response.headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        response.headers["Vary"] = f"{vary}, Accept-Encoding"
+
+    if encoding is None:
+        return
+
+    response.headers["Content-Encoding"] = encoding
+    # the compressed bytes differ from the identity ones, so a strong tag would lie
+    etag = response.headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        response.headers["ETag"] = "W/" + etag
+
+
+def encoded_response(
+    request: Request,
+    payload: Precompressed,
+    headers: Iterable[tuple[str, str]] = (),
+) -> Response:
+    body, encoding = payload.encode(negotiate(request.headers.get("accept-encoding")))
+    response = Response(content=body, media_type=payload.media_type)
+    for name, value in headers:
+        response.headers[name] = value
+    _mark_encoded(response, encoding)
+    return response
+
+
+def register_compression_middleware(app: FastAPI) -> None:
+    static: dict[str, Precompressed] = {}
+
+    @app.middleware("http")
+    async def compress_responses(request: Request, call_next):
+        if not COMPRESSION_ENABLED:
+            return await call_next(request)
+
+        path = request.url.path
+        if request.method == "GET" and path == app.openapi_url and not request.scope.get("root_path"):
+            payload = static.get(path)
+            if payload is None:
+                payload = static.setdefault(path, Precompressed(JSONResponse(app.openapi()).body))
+            return encoded_response(request, payload)
+
+        response = await call_next(request)
+
+        if (
+            response.status_code in (204, 304)
+            or "content-encoding" in response.headers
+            or not compressible_type(response.headers.get("content-type"))
+        ):
+            return response
+
+        encoding = negotiate(request.headers.get("accept-encoding"))
+        if encoding is None:
+            _mark_encoded(response, None)
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        if len(body) < COMPRESSION_MIN_BYTES:
+            encoding = None
+        else:
+            body = compress(body, encoding)
+
+        out = Response(content=body, status_code=response.status_code)
+        out.raw_headers = [(k, v) for k, v in response.raw_headers if k != b"content-length"]
+        out.headers["content-length"] = str(len(body))
+        _mark_encoded(out, encoding)
+        return out
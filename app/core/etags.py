@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+
+
+def _settled(version: Any) -> bool:
+    # updated_at has one-second resolution: a row written during the current
+    # second can change again without its timestamp moving, so it gets no tag.
+    if not isinstance(version, datetime):
+        return True
+    return version < datetime.utcnow().replace(microsecond=0)
+
+
+def normalized_query(request: Request) -> str:
+    return "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+
+
+def make_etag(request: Request, *parts: Any) -> str:
+    raw = "|".join([request.url.path, normalized_query(request), *(str(p) for p in parts)])
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def _page_parts(count: int, key_sum: Any, version: Any) -> tuple:
+    return count, int(key_sum) if key_sum is not None else None, version
+
+
+def page_etag(request: Request, rows: Sequence[Any], key: str, version: str) -> Optional[str]:
+    keys = [getattr(r, key) for r in rows]
+    versions = [getattr(r, version) for r in rows]
+    newest = max(versions) if versions else None
+    if not _settled(newest):
+        return None
+    return make_etag(request, *_page_parts(len(rows), sum(keys) if keys else None, newest))
+
+
+def row_etag(request: Request, key_value: Any, version: Any) -> Optional[str]:
+    if not _settled(version):
+        return None
+    return make_etag(request, key_value, version)
+
+
+def _requested(request: Request) -> list[str]:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return []
+    return [tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()]
+
+
+def not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    if etag is None:
+        return None
+    requested = _requested(request)
+    if "*" in requested or etag in requested:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+async def check_page(db, request: Request, page_stmt, key_column, version_column) -> Optional[Response]:
+    if not _requested(request):
+        return None
+
+    page = page_stmt.with_only_columns(key_column, version_column).subquery()
+    key, version = page.c[key_column.key], page.c[version_column.key]
+    result = await db.execute(select(func.count(), func.sum(key), func.max(version)).select_from(page))
+    count, key_sum, newest = result.one()
+
+    if not _settled(newest):
+        return None
+    return not_modified(request, make_etag(request, *_page_parts(count, key_sum, newest)))
+
+
+async def check_row(db, request: Request, key_column, version_column, key_value) -> Optional[Response]:
+    if not _requested(request):
+        return None
+
+    result = await db.execute(select(version_column).where(key_column == key_value))
+    version = result.scalar_one_or_none()
+    if version is None:
+        return None
+    return not_modified(request, row_etag(request, key_value, version))
+
+
+def set_etag(response: Response, etag: Optional[str]) -> None:
+    if etag is not None:
+        response.headers["ETag"] = etag
@@ -44,3 +44,21 @@ def bad_request(code: str, message: str, details: Optional[dict[str, Any]] = Non
         status_code=400,
         details=details,
     )
+
+
+def service_unavailable(code: str, message: str, details: Optional[dict[str, Any]] = None) -> AppError:
+    return AppError(
+        code=code,
+        message=message,
+        status_code=503,
+        details=details,
+    )
+
+
+def too_many_requests(code: str, message: str, details: Optional[dict[str, Any]] = None) -> AppError:
+    return AppError(
+        code=code,
+        message=message,
+        status_code=429,
+        details=details,
+    )
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+from fastapi import Query, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter, create_model
+from typing_extensions import TypedDict
+
+from app.core.exceptions import bad_request
+
+
+def sparse_fields(schema: type[BaseModel], key: str):
+    allowed = tuple(schema.model_fields)
+
+    async def dependency(
+        fields: Optional[str] = Query(
+            default=None,
+            description=f"Comma-separated subset of: {', '.join(allowed)} ({key} is always included)",
+        ),
+    ) -> Optional[tuple[str, ...]]:
+        if fields is None:
+            return None
+
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = sorted(requested - set(allowed))
+        if unknown or not requested:
+            raise bad_request(
+                "INVALID_FIELDS",
+                "Unknown or empty fields selection",
+                details={"unknown": unknown, "allowed": list(allowed)},
+            )
+
+        return tuple(name for name in allowed if name == key or name in requested)
+
+    return dependency
+
+
+def columns_for(model: Any, fields: Sequence[str], extra: Sequence[str] = ()) -> list[Any]:
+    names = [*fields, *(name for name in extra if name not in fields)]
+    return [getattr(model, name) for name in names]
+
+
+@lru_cache(maxsize=256)
+def partial_model(schema: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    omitted = {
+        name: (Optional[info.annotation], None)
+        for name, info in schema.model_fields.items()
+        if name not in fields
+    }
+    return create_model(f"{schema.__name__}Fields", __base__=schema, **omitted)
+
+
+@lru_cache(maxsize=256)
+def _rows_adapter(schema: type[BaseModel], fields: tuple[str, ...]) -> TypeAdapter:
+    row = TypedDict(
+        f"{schema.__name__}Row",
+        {name: schema.model_fields[name].annotation for name in fields},
+    )
+    return TypeAdapter(list[row])
+
+
+def render_rows(schema: type[BaseModel], fields: tuple[str, ...], rows: Sequence[Any]) -> bytes:
+    """Encode Core rows selected as `fields` straight to JSON, without building models.
+
+    Rows come from typed columns, so validation would only re-check what the
+    database already guarantees; extra selected columns are dropped.
+    """
+    return _rows_adapter(schema, fields).dump_json([row._asdict() for row in rows])
+
+
+def _dump(model: type[BaseModel], fields: tuple[str, ...], row: Any) -> dict[str, Any]:
+    return model.model_validate(row).model_dump(mode="json", include=set(fields))
+
+
+def sparse_response(
+    schema: type[BaseModel],
+    fields: tuple[str, ...],
+    data: Any,
+    response: Optional[Response] = None,
+) -> JSONResponse:
+    model = partial_model(schema, fields)
+    if isinstance(data, list):
+        content = [_dump(model, fields, row) for row in data]
+    else:
+        content = _dump(model, fields, data)
+
+    out = JSONResponse(content=content)
+    if response is not None:
+        for name, value in response.headers.items():
+            if name != "content-length":
+                out.headers[name] = value
+    return out
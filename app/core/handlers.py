@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 import time
 import uuid
 
@@ -10,8 +11,12 @@ from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.core.exceptions import AppError
+from app.db.query_stats import begin_request, end_request
+from app.db.recent_writes import recent_writes
 from app.schemas.errors import ErrorResponse, RequestValidationErrorResponse
 
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() in ("1", "true", "yes")
+
 
 def _new_request_id() -> str:
     return str(uuid.uuid4())
@@ -22,11 +27,13 @@ def register_request_id_middleware(app: FastAPI) -> None:
     async def add_request_id(request: Request, call_next):
         request.state.request_id = _new_request_id()
 
+        query_stats, stats_token = begin_request()
         start = time.perf_counter()
         try:
             response = await call_next(request)
         finally:
             duration_ms = (time.perf_counter() - start) * 1000
+            end_request(stats_token)
 
         status_code = getattr(locals().get("response", None), "status_code", None)
 
@@ -48,11 +55,26 @@ def register_request_id_middleware(app: FastAPI) -> None:
             "user_agent": request.headers.get("user-agent"),
             "status_code": status_code,
             "duration_ms": round(duration_ms, 2),
+            **query_stats.log_fields(),
         }
         print(json.dumps(log, ensure_ascii=False))
 
 
         response.headers["X-Request-Id"] = request.state.request_id
+        if SERVER_TIMING_ENABLED:
+            response.headers["Server-Timing"] = (
+                f"{query_stats.server_timing()}, total;dur={duration_ms:.2f}"
+            )
+        return response
+
+def register_read_your_writes_middleware(app: FastAPI) -> None:
+    @app.middleware("http")
+    async def pin_reads_after_write(request: Request, call_next):
+        response = await call_next(request)
+
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            recent_writes.mark(getattr(request.state, "user_id", None))
+
         return response
 
 def register_exception_handlers(app: FastAPI) -> None:
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import Query, Request, Response
+from sqlalchemy import and_, or_
+
+from app.core.exceptions import bad_request
+
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", "200"))
+
+
+@dataclass(frozen=True)
+class PageParams:
+    limit: int
+    after: Optional[tuple[Any, ...]] = None
+    include_total: bool = False
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _cursor_value(value: Any) -> bool:
+    return isinstance(value, (int, str)) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str) -> tuple[Any, ...]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise bad_request("INVALID_CURSOR", "Invalid pagination cursor")
+
+    if not isinstance(values, list) or not values or not all(_cursor_value(v) for v in values):
+        raise bad_request("INVALID_CURSOR", "Invalid pagination cursor")
+    return tuple(values)
+
+
+async def page_params(
+    limit: int = Query(
+        default=PAGE_SIZE_DEFAULT,
+        ge=1,
+        le=PAGE_SIZE_MAX,
+        description=f"Page size (1-{PAGE_SIZE_MAX})",
+    ),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Opaque cursor taken from the previous page's Link header",
+    ),
+    include_total: bool = Query(
+        default=False,
+        description="Add X-Total-Count (exact or estimated, see X-Total-Count-Type)",
+    ),
+) -> PageParams:
+    return PageParams(
+        limit=limit,
+        after=decode_cursor(cursor) if cursor else None,
+        include_total=include_total,
+    )
+
+
+def _seek_after(columns: Sequence[Any], values: Sequence[Any]):
+    head, value = columns[0], values[0]
+    if len(columns) == 1:
+        return head < value
+    return or_(head < value, and_(head == value, _seek_after(columns[1:], values[1:])))
+
+
+def keyset(stmt, columns: Sequence[Any], page: PageParams):
+    if page.after is not None:
+        if len(page.after) != len(columns):
+            raise bad_request("INVALID_CURSOR", "Invalid pagination cursor")
+        stmt = stmt.where(_seek_after(columns, page.after))
+
+    return stmt.order_by(*(c.desc() for c in columns)).limit(page.limit + 1)
+
+
+def paginate(
+    rows: Sequence[Any],
+    page: PageParams,
+    request: Request,
+    response: Response,
+    key: Callable[[Any], Sequence[Any]],
+) -> list[Any]:
+    rows = list(rows)
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        set_next_link(request, response, page, key(rows[-1]))
+    return rows
+
+
+def set_next_link(request: Request, response: Response, page: PageParams, values: Sequence[Any]) -> None:
+    next_url = request.url.include_query_params(cursor=encode_cursor(values), limit=page.limit)
+    response.headers["Link"] = f'<{next_url}>; rel="next"'
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+
+from app.core.exceptions import service_unavailable
+
+
+def _timed_call(fn: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class PasswordPool:
+    def __init__(self, workers: int, max_pending: int, timeout_seconds: float) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + max_pending)
+        self._stats_lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.total_run_ms = 0.0
+        self.max_run_ms = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._executor
+
+    def _release(self, _future: Optional[Future] = None) -> None:
+        with self._stats_lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _record(self, elapsed: float, run_seconds: float) -> None:
+        run_ms = run_seconds * 1000
+        with self._stats_lock:
+            self.completed += 1
+            self.total_run_ms += run_ms
+            self.total_wait_ms += max(elapsed * 1000 - run_ms, 0.0)
+            self.max_run_ms = max(self.max_run_ms, run_ms)
+
+    def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self.rejected += 1
+            raise service_unavailable(
+                "PASSWORD_POOL_SATURATED",
+                "Authentication is busy, retry shortly",
+            )
+
+        with self._stats_lock:
+            self.in_flight += 1
+
+        start = time.perf_counter()
+
+        if self.workers <= 0:
+            try:
+                result, run_seconds = _timed_call(fn, *args)
+            finally:
+                self._release()
+            self._record(time.perf_counter() - start, run_seconds)
+            return result
+
+        try:
+            future = self._get_executor().submit(_timed_call, fn, *args)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            result, run_seconds = future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise service_unavailable(
+                "PASSWORD_POOL_TIMEOUT",
+                "Authentication timed out, retry shortly",
+            )
+
+        self._record(time.perf_counter() - start, run_seconds)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            completed = self.completed
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                "completed": completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / completed, 2) if completed else 0.0,
+                "avg_run_ms": round(self.total_run_ms / completed, 2) if completed else 0.0,
+                "max_run_ms": round(self.max_run_ms, 2),
+            }
+
+
+password_pool = PasswordPool(
+    workers=int(os.getenv("PASSWORD_POOL_WORKERS", "2")),
+    max_pending=int(os.getenv("PASSWORD_POOL_MAX_PENDING", "8")),
+    timeout_seconds=float(os.getenv("PASSWORD_POOL_TIMEOUT_SECONDS", "5")),
+)
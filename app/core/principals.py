@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.models.models import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    user_id: int
+    username: Optional[str]
+    email: Optional[str]
+    role: str
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            user_id=int(user.user_id),
+            username=user.username,
+            email=user.email,
+            role=user.role,
+            is_active=bool(user.is_active),
+        )
+
+
+class PrincipalCache:
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[float, Principal]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[user_id]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal: Principal) -> None:
+        if not self.enabled:
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[principal.user_id] = (expires_at, principal)
+            self._entries.move_to_end(principal.user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=float(os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "30")),
+    max_entries=int(os.getenv("AUTH_PRINCIPAL_CACHE_MAX_ENTRIES", "1024")),
+)
+
+
+_PENDING_INVALIDATIONS = "pending_principal_invalidations"
+
+
+# Only ORM flushes of User fire these. Raw SQL (text(), Core update()/delete())
+# and changes made by other processes or directly in MySQL bypass them, and a
+# cached principal stays stale until AUTH_PRINCIPAL_CACHE_TTL_SECONDS expires.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _stage_invalidation(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if target.user_id is not None and session is not None:
+        session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(int(target.user_id))
+
+
+# evicting at flush would let a concurrent request re-cache the old row before
+# the commit lands, and keep it for the whole TTL
+@event.listens_for(Session, "after_commit")
+def _invalidate_principals(session: Session) -> None:
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_invalidations(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Sequence
+
+from fastapi import Request, Response
+
+from app.core.compression import Precompressed, encoded_response
+from app.core.etags import normalized_query, not_modified
+from app.db.recent_writes import recent_writes
+
+RESPONSE_CACHE_MAX_BODY_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BODY_BYTES", "262144"))
+RESPONSE_CACHE_SETTLE_SECONDS = float(os.getenv("RESPONSE_CACHE_SETTLE_SECONDS", "0"))
+
+_UNCACHED_HEADERS = {"content-length", "content-type"}
+
+
+class ResourceVersions:
+    def __init__(self) -> None:
+        self._versions: dict[str, int] = {}
+        self._bumped_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *resources: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for resource in resources:
+                self._versions[resource] = self._versions.get(resource, 0) + 1
+                self._bumped_at[resource] = now
+
+    def snapshot(self, resources: Sequence[str]) -> tuple[int, ...]:
+        return tuple(self._versions.get(r, 0) for r in resources)
+
+    def settled(self, resources: Sequence[str], seconds: float) -> bool:
+        if seconds <= 0:
+            return True
+        cutoff = time.monotonic() - seconds
+        return all(self._bumped_at.get(r, cutoff) <= cutoff for r in resources)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._versions.clear()
+            self._bumped_at.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._versions)
+
+
+resource_versions = ResourceVersions()
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    payload: Precompressed
+    headers: tuple[tuple[str, str], ...]
+    etag: Optional[str]
+
+
+class ResponseCache:
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, CachedResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(
+        self,
+        key: Hashable,
+        cached: CachedResponse,
+        resources: Sequence[str],
+        settle_seconds: float = RESPONSE_CACHE_SETTLE_SECONDS,
+    ) -> None:
+        if not self.enabled:
+            return
+
+        if len(cached.payload.body) > RESPONSE_CACHE_MAX_BODY_BYTES or not resource_versions.settled(
+            resources, settle_seconds
+        ):
+            with self._lock:
+                self.skipped += 1
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, cached)
+            self._bytes += len(cached.payload.body)
+            self.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: Hashable) -> None:
+        _, cached = self._entries.pop(key)
+        self._bytes -= len(cached.payload.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "skipped": self.skipped,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "versions": resource_versions.stats(),
+            }
+
+
+response_cache = ResponseCache(
+    ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "30")),
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1024")),
+)
+
+
+def cache_key(request: Request, resources: tuple[str, ...], *extra: Hashable) -> tuple:
+    # extra: resolved defaults that change the body but not the query string
+    return (
+        str(request.base_url),
+        request.url.path,
+        normalized_query(request),
+        resources,
+        resource_versions.snapshot(resources),
+        *extra,
+    )
+
+
+def serve_cached(request: Request, key: tuple) -> Optional[Response]:
+    cached = response_cache.get(key)
+    if cached is None:
+        return None
+
+    unchanged = not_modified(request, cached.etag)
+    if unchanged is not None:
+        return unchanged
+
+    response = encoded_response(request, cached.payload, cached.headers)
+    response.headers["X-Cache"] = "hit"
+    return response
+
+
+def store_response(request: Request, key: tuple, body: bytes, response: Response) -> Response:
+    headers = tuple(
+        (name, value) for name, value in response.headers.items() if name not in _UNCACHED_HEADERS
+    )
+    payload = Precompressed(body)
+    settle_seconds = RESPONSE_CACHE_SETTLE_SECONDS
+    if getattr(request.state, "read_replica", False):
+        # a replica may not have caught up with a write inside the read-your-writes
+        # window yet; caching its page would serve the stale rows to pinned users too
+        settle_seconds = max(settle_seconds, recent_writes.window_seconds)
+    cached = CachedResponse(payload, headers, response.headers.get("etag"))
+    response_cache.put(key, cached, key[3], settle_seconds)
+
+    out = encoded_response(request, payload, headers)
+    out.headers["X-Cache"] = "miss"
+    return out
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from app.core.exceptions import too_many_requests
+
+
+class _Bucket:
+    __slots__ = ("window_start", "previous", "current")
+
+    def __init__(self, window_start: float) -> None:
+        self.window_start = window_start
+        self.previous = 0
+        self.current = 0
+
+
+class SlidingWindowLimiter:
+    def __init__(self, limit: int, window_seconds: float, max_keys: int) -> None:
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._buckets: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.limit > 0 and self.window_seconds > 0
+
+    def _roll(self, bucket: _Bucket, now: float) -> None:
+        elapsed_windows = int((now - bucket.window_start) // self.window_seconds)
+        if elapsed_windows <= 0:
+            return
+        bucket.previous = bucket.current if elapsed_windows == 1 else 0
+        bucket.current = 0
+        bucket.window_start += elapsed_windows * self.window_seconds
+
+    def _estimate(self, bucket: _Bucket, now: float) -> float:
+        weight = 1 - (now - bucket.window_start) / self.window_seconds
+        return bucket.previous * weight + bucket.current
+
+    def retry_after(self, key: str, now: Optional[float] = None) -> Optional[int]:
+        if not self.enabled:
+            return None
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                return None
+
+            self._roll(bucket, now)
+            if self._estimate(bucket, now) < self.limit:
+                return None
+
+            if bucket.current >= self.limit:
+                return max(math.ceil(bucket.window_start + self.window_seconds - now), 1)
+
+            needed = 1 - (self.limit - bucket.current) / bucket.previous
+            wait = bucket.window_start + needed * self.window_seconds - now
+            return max(math.ceil(wait), 1)
+
+    def record(self, key: str, now: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._purge(now)
+                bucket = _Bucket(now - (now % self.window_seconds))
+                self._buckets[key] = bucket
+
+            self._roll(bucket, now)
+            bucket.current += 1
+
+    def _purge(self, now: float) -> None:
+        horizon = now - 2 * self.window_seconds
+        for key in [k for k, b in self._buckets.items() if b.window_start < horizon]:
+            del self._buckets[key]
+
+        overflow = len(self._buckets) - self.max_keys + 1
+        if overflow > 0:
+            for key in list(self._buckets)[:overflow]:
+                del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class LoginThrottle:
+    def __init__(self, ip_limit: int, username_limit: int, window_seconds: float, max_keys: int) -> None:
+        self.by_ip = SlidingWindowLimiter(ip_limit, window_seconds, max_keys)
+        self.by_username = SlidingWindowLimiter(username_limit, window_seconds, max_keys)
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @staticmethod
+    def _username_key(username: str) -> str:
+        return username.strip().lower()
+
+    def check(self, client_ip: Optional[str], username: str) -> None:
+        retry_ip = self.by_ip.retry_after(client_ip) if client_ip else None
+        retry_user = self.by_username.retry_after(self._username_key(username))
+
+        if retry_ip is None and retry_user is None:
+            return
+
+        with self._lock:
+            self.rejected += 1
+
+        raise too_many_requests(
+            "LOGIN_THROTTLED",
+            "Too many failed login attempts, retry later",
+            details={"retry_after_seconds": max(retry_ip or 0, retry_user or 0)},
+        )
+
+    def record_failure(self, client_ip: Optional[str], username: str) -> None:
+        if client_ip:
+            self.by_ip.record(client_ip)
+        self.by_username.record(self._username_key(username))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ip_keys": len(self.by_ip),
+            "username_keys": len(self.by_username),
+            "ip_limit": self.by_ip.limit,
+            "username_limit": self.by_username.limit,
+            "window_seconds": self.by_ip.window_seconds,
+            "rejected": self.rejected,
+        }
+
+
+login_throttle = LoginThrottle(
+    ip_limit=int(os.getenv("LOGIN_THROTTLE_IP_LIMIT", "30")),
+    username_limit=int(os.getenv("LOGIN_THROTTLE_USERNAME_LIMIT", "10")),
+    window_seconds=float(os.getenv("LOGIN_THROTTLE_WINDOW_SECONDS", "60")),
+    max_keys=int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000")),
+)
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from app.models.models import User
+
+
+def claims_mode_enabled() -> bool:
+    return os.getenv("JWT_EMBED_CLAIMS", "false").lower() in ("1", "true", "yes")
+
+
+class TokenEpochTable:
+    def __init__(self, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._epochs: dict[int, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.revoked = 0
+
+    def _refresh_if_stale(self, db: Session) -> None:
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._loaded_at < self.refresh_seconds:
+            return
+
+        rows = db.execute(
+            select(User.user_id, User.token_epoch).where(User.token_epoch > 0)
+        ).all()
+
+        with self._lock:
+            self._epochs = {int(r.user_id): int(r.token_epoch) for r in rows}
+            self._loaded_at = now
+            self.refreshes += 1
+
+    def current(self, db: Session, user_id: int) -> int:
+        self._refresh_if_stale(db)
+        return self._epochs.get(user_id, 0)
+
+    def is_current(self, db: Session, user_id: int, epoch: int) -> bool:
+        if epoch >= self.current(db, user_id):
+            return True
+        with self._lock:
+            self.revoked += 1
+        return False
+
+    def bump(self, user_id: int, epoch: int) -> None:
+        with self._lock:
+            if epoch > self._epochs.get(user_id, 0):
+                self._epochs[user_id] = epoch
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epochs.clear()
+            self._loaded_at = None
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": claims_mode_enabled(),
+                "size": len(self._epochs),
+                "refresh_seconds": self.refresh_seconds,
+                "refreshes": self.refreshes,
+                "revoked": self.revoked,
+            }
+
+
+_PENDING_EPOCHS = "pending_token_epochs"
+
+token_epochs = TokenEpochTable(
+    refresh_seconds=float(os.getenv("JWT_EPOCH_REFRESH_SECONDS", "5")),
+)
+
+
+@event.listens_for(User, "before_update")
+def _bump_epoch_on_privilege_change(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    if state.attrs.role.history.has_changes() or state.attrs.is_active.history.has_changes():
+        target.token_epoch = (target.token_epoch or 0) + 1
+
+
+@event.listens_for(User, "after_update")
+def _stage_epoch(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if target.token_epoch and session is not None:
+        session.info.setdefault(_PENDING_EPOCHS, {})[int(target.user_id)] = int(target.token_epoch)
+
+
+# flush-time epochs only reach the shared table once the transaction commits;
+# publishing a rolled-back bump would reject the user's still-valid tokens
+@event.listens_for(Session, "after_commit")
+def _publish_epochs(session: Session) -> None:
+    for user_id, epoch in session.info.pop(_PENDING_EPOCHS, {}).items():
+        token_epochs.bump(user_id, epoch)
+
+
+# any rollback, savepoints included, drops them; the periodic refresh picks up
+# whatever an outer transaction still commits
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_epochs(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_EPOCHS, None)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from fastapi import Response
+from sqlalchemy import func, select, text
+
+COUNT_EXACT_THRESHOLD = int(os.getenv("COUNT_EXACT_THRESHOLD", "10000"))
+
+
+class CountCache:
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, int, bool]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.exact_counts = 0
+        self.estimated_counts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: Hashable) -> Optional[tuple[int, bool]]:
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, key: Hashable, count: int, exact: bool) -> None:
+        with self._lock:
+            if exact:
+                self.exact_counts += 1
+            else:
+                self.estimated_counts += 1
+
+            if not self.enabled:
+                return
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, count, exact)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "exact_threshold": COUNT_EXACT_THRESHOLD,
+                "hits": self.hits,
+                "misses": self.misses,
+                "exact_counts": self.exact_counts,
+                "estimated_counts": self.estimated_counts,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+count_cache = CountCache(
+    ttl_seconds=float(os.getenv("COUNT_CACHE_TTL_SECONDS", "10")),
+    max_entries=int(os.getenv("COUNT_CACHE_MAX_ENTRIES", "2048")),
+)
+
+
+def count_key(resource: str, filters: dict[str, Any]) -> tuple:
+    return (resource, tuple(sorted((k, str(v)) for k, v in filters.items() if v is not None)))
+
+
+async def _estimate_rows(db, stmt) -> Optional[int]:
+    dialect = db.bind.dialect
+    if dialect.name != "mysql":
+        return None
+
+    sql = str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    result = await db.execute(text("EXPLAIN " + sql))
+    row = result.mappings().first()
+    if row is None or row["rows"] is None:
+        return None
+    return int(row["rows"] * float(row["filtered"] or 100) / 100)
+
+
+async def total_count(db, resource: str, filters: dict[str, Any], stmt) -> tuple[int, bool]:
+    key = count_key(resource, filters)
+    cached = count_cache.get(key)
+    if cached is not None:
+        return cached
+
+    base = stmt.order_by(None).limit(None)
+    estimate = await _estimate_rows(db, base)
+
+    if estimate is not None and estimate > COUNT_EXACT_THRESHOLD:
+        count, exact = estimate, False
+    else:
+        result = await db.execute(select(func.count()).select_from(base.subquery()))
+        count, exact = int(result.scalar_one()), True
+
+    count_cache.put(key, count, exact)
+    return count, exact
+
+
+async def set_total_count(db, response: Response, resource: str, filters: dict[str, Any], stmt) -> None:
+    count, exact = await total_count(db, resource, filters, stmt)
+    response.headers["X-Total-Count"] = str(count)
+    response.headers["X-Total-Count-Type"] = "exact" if exact else "estimated"
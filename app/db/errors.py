@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+MYSQL_DUPLICATE_KEY = 1062
+MYSQL_FOREIGN_KEY_VIOLATION = 1452
+
+_CONSTRAINT_RE = re.compile(r"CONSTRAINT `([^`]+)`")
+_DUPLICATE_KEY_RE = re.compile(r"for key '([^']+)'")
+
+
+def _error_code(exc: IntegrityError) -> Optional[int]:
+    args = getattr(exc.orig, "args", ())
+    return args[0] if args and isinstance(args[0], int) else None
+
+
+def foreign_key_violation(exc: IntegrityError) -> Optional[str]:
+    if _error_code(exc) != MYSQL_FOREIGN_KEY_VIOLATION:
+        return None
+    match = _CONSTRAINT_RE.search(str(exc.orig))
+    return match.group(1) if match else ""
+
+
+def duplicate_key(exc: IntegrityError) -> Optional[str]:
+    if _error_code(exc) != MYSQL_DUPLICATE_KEY:
+        return None
+    match = _DUPLICATE_KEY_RE.search(str(exc.orig))
+    return match.group(1).rsplit(".", 1)[-1] if match else ""
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.total_checkout_ms = 0.0
+        self.max_checkout_ms = 0.0
+        self.total_held_ms = 0.0
+        self.max_held_ms = 0.0
+
+    def wait_finished(self, started_at: float, timed_out: bool = False) -> None:
+        wait_ms = (time.perf_counter() - started_at) * 1000
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "soft_invalidate", self._on_soft_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        now = time.perf_counter()
+        connection_record.info["checked_out_at"] = now
+        started_at = connection_record.info.pop("checkout_started_at", None)
+        checkout_ms = (now - started_at) * 1000 if started_at is not None else 0.0
+        with self._lock:
+            self.checkouts += 1
+            self.total_checkout_ms += checkout_ms
+            self.max_checkout_ms = max(self.max_checkout_ms, checkout_ms)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        held_ms = (time.perf_counter() - checked_out_at) * 1000 if checked_out_at is not None else 0.0
+        with self._lock:
+            self.checkins += 1
+            self.total_held_ms += held_ms
+            self.max_held_ms = max(self.max_held_ms, held_ms)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_soft_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.soft_invalidations += 1
+
+    def snapshot(self, engine: Engine) -> dict[str, Any]:
+        pool = engine.pool
+        with self._lock:
+            checkouts = self.checkouts
+            checkins = self.checkins
+            return {
+                "pool_class": type(pool).__name__,
+                "size": pool.size() if hasattr(pool, "size") else None,
+                "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else None,
+                "max_overflow": getattr(pool, "_max_overflow", None),
+                "timeout_seconds": getattr(pool, "_timeout", None),
+                "recycle_seconds": getattr(pool, "_recycle", None),
+                "pre_ping": getattr(pool, "_pre_ping", None),
+                "connects": self.connects,
+                "checkouts": checkouts,
+                "checkins": checkins,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / checkouts, 3) if checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "avg_checkout_ms": round(self.total_checkout_ms / checkouts, 3) if checkouts else 0.0,
+                "max_checkout_ms": round(self.max_checkout_ms, 3),
+                "avg_held_ms": round(self.total_held_ms / checkins, 3) if checkins else 0.0,
+                "max_held_ms": round(self.max_held_ms, 3),
+            }
+
+
+def instrumented_pool_class(base: type[QueuePool], metrics: PoolMetrics) -> type[QueuePool]:
+    class InstrumentedPool(base):
+        def _do_get(self):
+            # kept per call, not per thread: async pool waiters all share the event-loop thread
+            started_at = time.perf_counter()
+            try:
+                record = super()._do_get()
+            except PoolTimeoutError:
+                metrics.wait_finished(started_at, timed_out=True)
+                raise
+            metrics.wait_finished(started_at)
+            record.info["checkout_started_at"] = started_at
+            return record
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+InstrumentedQueuePool = instrumented_pool_class(QueuePool, pool_metrics)
+InstrumentedAsyncQueuePool = instrumented_pool_class(AsyncAdaptedQueuePool, async_pool_metrics)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+SQL_SLOWEST_STATEMENT_CHARS = int(os.getenv("SQL_SLOWEST_STATEMENT_CHARS", "300"))
+
+_TRANSACTION_CONTROL = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+
+class QueryStats:
+    def __init__(self, keep_statements: bool = False) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Optional[list[str]] = [] if keep_statements else None
+        self._repeats: Counter[str] = Counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self._repeats[statement] += 1
+        if self.statements is not None:
+            self.statements.append(statement)
+        if duration_ms >= self.slowest_ms:
+            self.slowest_ms = duration_ms
+            self.slowest_statement = statement
+
+    @property
+    def max_repeats(self) -> int:
+        return max(self._repeats.values(), default=0)
+
+    @property
+    def n_plus_one_suspect(self) -> bool:
+        return SQL_REPEAT_THRESHOLD > 0 and self.max_repeats >= SQL_REPEAT_THRESHOLD
+
+    def log_fields(self) -> dict[str, Any]:
+        slowest = self.slowest_statement
+        if slowest is not None and len(slowest) > SQL_SLOWEST_STATEMENT_CHARS:
+            slowest = slowest[:SQL_SLOWEST_STATEMENT_CHARS] + "..."
+        return {
+            "db_queries": self.count,
+            "db_ms": round(self.total_ms, 2),
+            "db_slowest_ms": round(self.slowest_ms, 2),
+            "db_slowest_statement": slowest,
+            "db_max_repeats": self.max_repeats,
+            "db_n_plus_one_suspect": self.n_plus_one_suspect,
+        }
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} queries"'
+
+
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+_captures: list[QueryStats] = []
+_captures_lock = threading.Lock()
+
+
+def begin_request() -> tuple[QueryStats, Token]:
+    stats = QueryStats()
+    return stats, _request_stats.set(stats)
+
+
+def end_request(token: Token) -> None:
+    _request_stats.reset(token)
+
+
+def current_request_stats() -> Optional[QueryStats]:
+    return _request_stats.get()
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    stats = QueryStats(keep_statements=True)
+    with _captures_lock:
+        _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        with _captures_lock:
+            _captures.remove(stats)
+
+
+def _is_transaction_control(statement: str) -> bool:
+    return statement.lstrip()[:9].upper().startswith(_TRANSACTION_CONTROL)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    duration_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    if _is_transaction_control(statement):
+        return
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+
+    if _captures:
+        with _captures_lock:
+            for captured in _captures:
+                captured.record(statement, duration_ms)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Optional
+
+
+class RecentWrites:
+    def __init__(self, window_seconds: float, max_entries: int) -> None:
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._until: dict[int, float] = {}
+        self._lock = threading.Lock()
+        self.primary_reads = 0
+        self.replica_reads = 0
+
+    def mark(self, user_id: Optional[int]) -> None:
+        if user_id is None or self.window_seconds <= 0:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if len(self._until) >= self.max_entries:
+                self._until = {k: v for k, v in self._until.items() if v > now}
+                while len(self._until) >= self.max_entries:
+                    self._until.pop(next(iter(self._until)))
+            self._until.pop(user_id, None)
+            self._until[user_id] = now + self.window_seconds
+
+    def is_pinned(self, user_id: Optional[int]) -> bool:
+        if user_id is None:
+            return False
+        until = self._until.get(user_id)
+        return until is not None and until > time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._until.clear()
+
+    def record_route(self, replica: bool) -> None:
+        with self._lock:
+            if replica:
+                self.replica_reads += 1
+            else:
+                self.primary_reads += 1
+
+    def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "window_seconds": self.window_seconds,
+                "pinned_users": sum(1 for v in self._until.values() if v > now),
+                "primary_reads": self.primary_reads,
+                "replica_reads": self.replica_reads,
+            }
+
+
+recent_writes = RecentWrites(
+    window_seconds=float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", "5")),
+    max_entries=int(os.getenv("DB_READ_YOUR_WRITES_MAX_USERS", "10000")),
+)
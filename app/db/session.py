@@ -1,11 +1,25 @@
+import itertools
 import os
-import time
+import threading
 from pathlib import Path
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.db.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    PoolMetrics,
+    async_pool_metrics,
+    instrumented_pool_class,
+    pool_metrics,
+)
+from app.db.recent_writes import recent_writes
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 ENV_LOCAL_PATH = BASE_DIR / ".env.local"
@@ -28,24 +42,73 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_NAME = os.getenv("DB_NAME")
 
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+ASYNC_DATABASE_URL = f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+
+DB_REPLICA_URLS = [u.strip() for u in os.getenv("DB_REPLICA_URLS", "").split(",") if u.strip()]
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_WARMUP_CONNECTIONS = min(int(os.getenv("DB_WARMUP_CONNECTIONS", "2")), DB_POOL_SIZE)
+
+
+def _engine_options(poolclass=InstrumentedQueuePool) -> dict:
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+_engine_lock = threading.Lock()
+_engine = None
+_async_engine = None
+_replicas = None
+_replica_cycle = None
+
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                new_engine = create_engine(DATABASE_URL, **_engine_options())
+                pool_metrics.attach(new_engine)
+                _engine = new_engine
+    return _engine
 
-def _create_engine_with_retry(url: str, attempts: int = 10, delay_seconds: float = 1.0):
-    last_err: Exception | None = None
 
-    for i in range(1, attempts + 1):
-        try:
-            engine = create_engine(url, pool_pre_ping=True)
-            
-            with engine.connect() as conn:
-                conn.exec_driver_sql("SELECT 1")
-            return engine
-        except OperationalError as e:
-            last_err = e
-            time.sleep(delay_seconds)
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                new_engine = create_async_engine(
+                    ASYNC_DATABASE_URL,
+                    **_engine_options(poolclass=InstrumentedAsyncQueuePool),
+                )
+                async_pool_metrics.attach(new_engine.sync_engine)
+                _async_engine = new_engine
+    return _async_engine
 
-engine = _create_engine_with_retry(DATABASE_URL)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class _LazySessionmaker(sessionmaker):
+    def __call__(self, **local_kw):
+        local_kw.setdefault("bind", get_engine())
+        return super().__call__(**local_kw)
+
+
+class _LazyAsyncSessionmaker(async_sessionmaker):
+    def __call__(self, **local_kw):
+        local_kw.setdefault("bind", get_async_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
 
 def get_db():
     db = SessionLocal()
@@ -53,3 +116,69 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+AsyncSessionLocal = _LazyAsyncSessionmaker(
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def _set_read_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SET SESSION TRANSACTION READ ONLY")
+    finally:
+        cursor.close()
+
+
+def _create_replica(url: str):
+    metrics = PoolMetrics()
+    replica_engine = create_async_engine(
+        make_url(url).set(drivername="mysql+aiomysql"),
+        **_engine_options(poolclass=instrumented_pool_class(AsyncAdaptedQueuePool, metrics)),
+    )
+    metrics.attach(replica_engine.sync_engine)
+    event.listen(replica_engine.sync_engine, "connect", _set_read_only)
+
+    session_factory = async_sessionmaker(
+        bind=replica_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    return replica_engine, metrics, session_factory
+
+
+def get_replicas():
+    global _replicas, _replica_cycle
+    if _replicas is None:
+        with _engine_lock:
+            if _replicas is None:
+                created = [_create_replica(url) for url in DB_REPLICA_URLS]
+                _replica_cycle = itertools.cycle(range(len(created))) if created else None
+                _replicas = created
+    return _replicas
+
+
+def _read_session_factory(user_id):
+    replicas = get_replicas()
+    if not replicas or recent_writes.is_pinned(user_id):
+        recent_writes.record_route(replica=False)
+        return AsyncSessionLocal
+
+    recent_writes.record_route(replica=True)
+    return replicas[next(_replica_cycle)][2]
+
+
+async def get_async_read_db(request: Request):
+    factory = _read_session_factory(getattr(request.state, "user_id", None))
+    request.state.read_replica = factory is not AsyncSessionLocal
+    async with factory() as db:
+        yield db
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy.engine import Engine
+
+
+class DbReadiness:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.state = "cold"
+        self.attempts = 0
+        self.warm_connections = 0
+        self.error: Optional[str] = None
+        self.ready_at: Optional[datetime] = None
+
+    def _set(self, **fields: Any) -> None:
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def claim(self) -> bool:
+        with self._lock:
+            if self.state != "cold":
+                return False
+            self.state = "warming"
+            return True
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "attempts": self.attempts,
+                "warm_connections": self.warm_connections,
+                "error": self.error,
+                "ready_at": self.ready_at.isoformat() if self.ready_at else None,
+            }
+
+
+db_readiness = DbReadiness()
+
+
+def _log(level: str, event: str, **fields: Any) -> None:
+    print(json.dumps({"level": level, "event": event, **fields}, ensure_ascii=False))
+
+
+def _open_connections(engine: Engine, count: int) -> int:
+    conns = []
+    try:
+        for _ in range(count):
+            conns.append(engine.connect())
+        conns[0].exec_driver_sql("SELECT 1")
+        return len(conns)
+    finally:
+        for conn in conns:
+            conn.close()
+
+
+def _call_on_ready(on_ready: Optional[Callable[[], None]]) -> None:
+    if on_ready is None:
+        return
+    try:
+        on_ready()
+    except Exception as e:
+        _log("error", "db_warmup_on_ready_failed", error=f"{type(e).__name__}: {e}")
+
+
+def _run(
+    engine_factory: Callable[[], Engine],
+    connections: int,
+    unavailable_after: int,
+    delay_seconds: float,
+    max_delay_seconds: float,
+    on_ready: Optional[Callable[[], None]],
+) -> None:
+    if connections <= 0:
+        db_readiness._set(state="skipped")
+        _call_on_ready(on_ready)
+        return
+
+    attempt = 0
+    while True:
+        attempt += 1
+        db_readiness._set(attempts=attempt)
+        try:
+            warmed = _open_connections(engine_factory(), connections)
+        except Exception as e:
+            # keep retrying: "unavailable" is what /health reports meanwhile, not a verdict
+            db_readiness._set(
+                state="unavailable" if attempt >= unavailable_after else "warming",
+                error=type(e).__name__,
+            )
+            _log("warning", "db_warmup_failed", attempt=attempt, error=str(e).splitlines()[0])
+            time.sleep(min(delay_seconds * attempt, max_delay_seconds))
+            continue
+
+        db_readiness._set(
+            state="ready",
+            warm_connections=warmed,
+            error=None,
+            ready_at=datetime.now(timezone.utc),
+        )
+        _call_on_ready(on_ready)
+        return
+
+
+def start_warmup(
+    engine_factory: Callable[[], Engine],
+    connections: int,
+    unavailable_after: int = 10,
+    delay_seconds: float = 1.0,
+    max_delay_seconds: float = 10.0,
+    on_ready: Optional[Callable[[], None]] = None,
+) -> bool:
+    if not db_readiness.claim():
+        return False
+
+    thread = threading.Thread(
+        target=_run,
+        args=(engine_factory, connections, unavailable_after, delay_seconds, max_delay_seconds, on_ready),
+        name="db-warmup",
+        daemon=True,
+    )
+    thread.start()
+    return True
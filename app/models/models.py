@@ -16,11 +16,16 @@ from sqlalchemy import (
     BigInteger,
     String,
     Boolean,
+    UniqueConstraint,
     func,
 )
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
+def _utcnow() -> datetime:
+    return datetime.utcnow().replace(microsecond=0)
+
+
 class Base(DeclarativeBase):
     pass
 
@@ -33,6 +38,7 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     role = Column(String(20), nullable=False, server_default="staff")
     is_active = Column(Boolean, nullable=False, default=True)
+    token_epoch = Column(Integer, nullable=False, default=0, server_default="0")
 
     created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, nullable=False, server_default=func.now(), onupdate=func.now())
@@ -47,8 +53,8 @@ class Customer(Base):
     phone: Mapped[Optional[str]] = mapped_column(String(30), nullable=True)
     email: Mapped[Optional[str]] = mapped_column(String(120), nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=_utcnow, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=_utcnow, onupdate=_utcnow, nullable=False)
 
 class Property(Base):
     __tablename__ = "properties"
@@ -68,8 +74,8 @@ class Property(Base):
 
     is_active: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=_utcnow, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=_utcnow, onupdate=_utcnow, nullable=False)
 
 class Invoice(Base):
     __tablename__ = "invoices"
@@ -98,14 +104,17 @@ class Invoice(Base):
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False
+        DateTime, default=_utcnow, nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, default=_utcnow, onupdate=_utcnow, nullable=False
     )
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        UniqueConstraint("invoice_id", "reference", name="uq_payments_invoice_reference"),
+    )
 
     payment_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     invoice_id: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -117,4 +126,36 @@ class Payment(Base):
     reference: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=_utcnow, nullable=False)
+
+
+class SearchGram(Base):
+    __tablename__ = "search_grams"
+
+    entity: Mapped[str] = mapped_column(String(16), primary_key=True)
+    gram: Mapped[str] = mapped_column(String(3), primary_key=True)
+    entity_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    field: Mapped[str] = mapped_column(String(32), primary_key=True)
+
+
+class DailyRevenue(Base):
+    __tablename__ = "daily_revenue"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    customer_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    property_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    invoiced_total: Mapped[Decimal] = mapped_column(DECIMAL(12, 2), nullable=False, default=0)
+    invoice_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    collected_total: Mapped[Decimal] = mapped_column(DECIMAL(12, 2), nullable=False, default=0)
+    payment_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ReceivableDue(Base):
+    __tablename__ = "receivables_due"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    due_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    slot: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    amount: Mapped[Decimal] = mapped_column(DECIMAL(14, 2), nullable=False, default=0)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.fields import columns_for
+from app.models.models import Customer
+
+CUSTOMER_BY_ID = select(Customer).where(Customer.customer_id == bindparam("customer_id"))
+CUSTOMER_EXISTS = select(Customer.customer_id).where(Customer.customer_id == bindparam("customer_id"))
+
+
+def get_customer(db: Session, customer_id: int) -> Optional[Customer]:
+    return db.execute(CUSTOMER_BY_ID, {"customer_id": customer_id}).scalar_one_or_none()
+
+
+def customer_exists(db: Session, customer_id: int) -> bool:
+    return db.execute(CUSTOMER_EXISTS, {"customer_id": customer_id}).first() is not None
+
+
+async def get_customer_async(db: AsyncSession, customer_id: int) -> Optional[Customer]:
+    result = await db.execute(CUSTOMER_BY_ID, {"customer_id": customer_id})
+    return result.scalar_one_or_none()
+
+
+async def customer_exists_async(db: AsyncSession, customer_id: int) -> bool:
+    result = await db.execute(CUSTOMER_EXISTS, {"customer_id": customer_id})
+    return result.first() is not None
+
+
+async def get_customer_fields_async(db: AsyncSession, customer_id: int, fields: Sequence[str]) -> Optional[Any]:
+    result = await db.execute(
+        select(*columns_for(Customer, fields, extra=("updated_at",))).where(Customer.customer_id == customer_id)
+    )
+    return result.first()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.fields import columns_for
+from app.models.models import Customer, Invoice, Payment, Property
+
+INVOICE_BY_ID = select(Invoice).where(Invoice.invoice_id == bindparam("invoice_id"))
+
+INVOICE_PARENTS = select(
+    select(Customer.customer_id)
+    .where(Customer.customer_id == bindparam("customer_id"))
+    .scalar_subquery()
+    .label("customer_id"),
+    select(Property.customer_id)
+    .where(Property.property_id == bindparam("property_id"))
+    .scalar_subquery()
+    .label("property_customer_id"),
+)
+
+INVOICE_FOR_PAYMENT = (
+    select(
+        Invoice.customer_id,
+        Invoice.property_id,
+        Invoice.issued_date,
+        Invoice.due_date,
+        Invoice.status,
+        Invoice.total,
+        select(func.coalesce(func.sum(Payment.amount), 0))
+        .where(Payment.invoice_id == Invoice.invoice_id)
+        .scalar_subquery()
+        .label("paid_so_far"),
+    )
+    .where(Invoice.invoice_id == bindparam("invoice_id"))
+    .with_for_update()
+)
+
+
+def invoice_list_stmt(
+    status: Optional[str] = None,
+    customer_id: Optional[int] = None,
+    property_id: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    fields: Optional[Sequence[str]] = None,
+):
+    if fields:
+        stmt = select(*columns_for(Invoice, fields, extra=("updated_at",)))
+    else:
+        stmt = select(Invoice)
+
+    if status is not None:
+        stmt = stmt.where(Invoice.status == status)
+
+    if customer_id is not None:
+        stmt = stmt.where(Invoice.customer_id == customer_id)
+
+    if property_id is not None:
+        stmt = stmt.where(Invoice.property_id == property_id)
+
+    if from_date is not None:
+        stmt = stmt.where(Invoice.issued_date >= from_date)
+
+    if to_date is not None:
+        stmt = stmt.where(Invoice.issued_date <= to_date)
+
+    return stmt
+
+
+def get_invoice(db: Session, invoice_id: int) -> Optional[Invoice]:
+    return db.execute(INVOICE_BY_ID, {"invoice_id": invoice_id}).scalar_one_or_none()
+
+
+def get_invoice_parents(db: Session, customer_id: int, property_id: int) -> Any:
+    return db.execute(
+        INVOICE_PARENTS, {"customer_id": customer_id, "property_id": property_id}
+    ).one()
+
+
+def get_invoice_for_payment(db: Session, invoice_id: int) -> Optional[Any]:
+    return db.execute(INVOICE_FOR_PAYMENT, {"invoice_id": invoice_id}).first()
+
+
+async def get_invoice_async(db: AsyncSession, invoice_id: int) -> Optional[Invoice]:
+    result = await db.execute(INVOICE_BY_ID, {"invoice_id": invoice_id})
+    return result.scalar_one_or_none()
+
+
+async def get_invoice_fields_async(db: AsyncSession, invoice_id: int, fields: Sequence[str]) -> Optional[Any]:
+    result = await db.execute(
+        select(*columns_for(Invoice, fields, extra=("updated_at",))).where(Invoice.invoice_id == invoice_id)
+    )
+    return result.first()
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+from sqlalchemy import select
+
+from app.core.fields import columns_for
+from app.models.models import Payment
+
+
+def payment_list_stmt(invoice_id: Optional[int] = None, fields: Optional[Sequence[str]] = None):
+    if fields:
+        stmt = select(*columns_for(Payment, fields, extra=("created_at",)))
+    else:
+        stmt = select(Payment)
+
+    if invoice_id is not None:
+        stmt = stmt.where(Payment.invoice_id == invoice_id)
+
+    return stmt
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.fields import columns_for
+from app.models.models import Property
+
+PROPERTY_BY_ID = select(Property).where(Property.property_id == bindparam("property_id"))
+
+
+def get_property(db: Session, property_id: int) -> Optional[Property]:
+    return db.execute(PROPERTY_BY_ID, {"property_id": property_id}).scalar_one_or_none()
+
+
+async def get_property_async(db: AsyncSession, property_id: int) -> Optional[Property]:
+    result = await db.execute(PROPERTY_BY_ID, {"property_id": property_id})
+    return result.scalar_one_or_none()
+
+
+async def get_property_fields_async(db: AsyncSession, property_id: int, fields: Sequence[str]) -> Optional[Any]:
+    result = await db.execute(
+        select(*columns_for(Property, fields, extra=("updated_at",))).where(Property.property_id == property_id)
+    )
+    return result.first()
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import Date, Integer, String, and_, case, cast, func, literal, null, select, union_all
+
+from app.models.models import Invoice, Payment, ReceivableDue
+
+# draft invoices are not billed yet and void ones were cancelled, neither is owed
+RECEIVABLE_STATUSES = ("sent", "paid")
+
+
+def _customer_payments(customer_id: int):
+    return (
+        select(Payment.amount)
+        .join(Invoice, Invoice.invoice_id == Payment.invoice_id)
+        .where(Invoice.customer_id == customer_id)
+    )
+
+
+def statement_opening_stmt(customer_id: int, from_date: date):
+    invoiced = (
+        select(func.coalesce(func.sum(Invoice.total), 0))
+        .where(Invoice.customer_id == customer_id)
+        .where(Invoice.issued_date < from_date)
+        .where(Invoice.status.in_(RECEIVABLE_STATUSES))
+        .scalar_subquery()
+    )
+    paid = (
+        _customer_payments(customer_id)
+        .with_only_columns(func.coalesce(func.sum(Payment.amount), 0))
+        .where(Payment.paid_date < from_date)
+        .scalar_subquery()
+    )
+    return select(
+        literal("opening", String).label("kind"),
+        func.date(literal(from_date), type_=Date).label("entry_date"),
+        literal(0, Integer).label("seq"),
+        cast(null(), Integer).label("invoice_id"),
+        cast(null(), Integer).label("payment_id"),
+        cast(null(), String).label("status"),
+        (invoiced - paid).label("amount"),
+    )
+
+
+def statement_invoices_stmt(customer_id: int, from_date: date, to_date: date):
+    return (
+        select(
+            literal("invoice", String).label("kind"),
+            Invoice.issued_date.label("entry_date"),
+            literal(1, Integer).label("seq"),
+            Invoice.invoice_id,
+            cast(null(), Integer).label("payment_id"),
+            Invoice.status,
+            Invoice.total.label("amount"),
+        )
+        .where(Invoice.customer_id == customer_id)
+        .where(Invoice.issued_date >= from_date)
+        .where(Invoice.issued_date <= to_date)
+        .where(Invoice.status.in_(RECEIVABLE_STATUSES))
+    )
+
+
+def statement_payments_stmt(customer_id: int, from_date: date, to_date: date):
+    return (
+        _customer_payments(customer_id)
+        .with_only_columns(
+            literal("payment", String).label("kind"),
+            Payment.paid_date.label("entry_date"),
+            literal(2, Integer).label("seq"),
+            Payment.invoice_id,
+            Payment.payment_id,
+            cast(null(), String).label("status"),
+            (-Payment.amount).label("amount"),
+        )
+        .where(Payment.paid_date >= from_date)
+        .where(Payment.paid_date <= to_date)
+    )
+
+
+def customer_statement_stmt(customer_id: int, from_date: date, to_date: date):
+    entries = union_all(
+        statement_invoices_stmt(customer_id, from_date, to_date),
+        statement_payments_stmt(customer_id, from_date, to_date),
+        statement_opening_stmt(customer_id, from_date),
+    ).subquery("entries")
+
+    order = (entries.c.entry_date, entries.c.seq, entries.c.invoice_id, entries.c.payment_id)
+    return select(
+        *entries.c,
+        func.sum(entries.c.amount).over(order_by=order, rows=(None, 0)).label("balance"),
+    ).order_by(*order)
+
+
+AGING_BUCKETS = ("days_0_30", "days_31_60", "days_61_90", "days_over_90")
+# bounds on one aging page: customer window per statement, statements per page
+AGING_MAX_WINDOW = 1000
+AGING_MAX_ROUNDS = 5
+
+
+def aging_customers_stmt(as_of: date, limit: int, after_customer_id: Optional[int] = None):
+    stmt = (
+        select(Invoice.customer_id)
+        .where(Invoice.status.in_(RECEIVABLE_STATUSES))
+        .where(Invoice.issued_date <= as_of)
+        .group_by(Invoice.customer_id)
+        .order_by(Invoice.customer_id.desc())
+        .limit(limit)
+    )
+    if after_customer_id is not None:
+        stmt = stmt.where(Invoice.customer_id < after_customer_id)
+    return stmt
+
+
+def _aging_entries(as_of: date, customers):
+    due = func.coalesce(Invoice.due_date, Invoice.issued_date).label("due")
+    invoices = (
+        select(Invoice.customer_id, due, Invoice.total.label("amount"))
+        .join(customers, customers.c.customer_id == Invoice.customer_id)
+        .where(Invoice.status.in_(RECEIVABLE_STATUSES))
+        .where(Invoice.issued_date <= as_of)
+    )
+    payments = (
+        select(Invoice.customer_id, due, (-Payment.amount).label("amount"))
+        .join(Invoice, Invoice.invoice_id == Payment.invoice_id)
+        .join(customers, customers.c.customer_id == Invoice.customer_id)
+        .where(Invoice.status.in_(RECEIVABLE_STATUSES))
+        .where(Invoice.issued_date <= as_of)
+        .where(Payment.paid_date <= as_of)
+    )
+    return union_all(invoices, payments).subquery("entries")
+
+
+def _aging_sums(due, amount, as_of: date) -> list:
+    cutoffs = [as_of - timedelta(days=days) for days in (30, 60, 90)]
+    buckets = [
+        due >= cutoffs[0],
+        and_(due < cutoffs[0], due >= cutoffs[1]),
+        and_(due < cutoffs[1], due >= cutoffs[2]),
+        due < cutoffs[2],
+    ]
+    sums = [func.coalesce(func.sum(case((when, amount), else_=0)), 0) for when in buckets]
+    sums.append(func.coalesce(func.sum(amount), 0))
+    return [s.label(n) for s, n in zip(sums, (*AGING_BUCKETS, "total"))]
+
+
+def aging_stmt(as_of: date, customers: int, after_customer_id: Optional[int] = None):
+    # one row per customer in the page, zero balances included so the caller
+    # can tell a short page from the end of the customers
+    page = aging_customers_stmt(as_of, customers, after_customer_id).cte("aging_page")
+    entries = _aging_entries(as_of, page)
+    return (
+        select(entries.c.customer_id, *_aging_sums(entries.c.due, entries.c.amount, as_of))
+        .group_by(entries.c.customer_id)
+        .order_by(entries.c.customer_id.desc())
+    )
+
+
+def aging_totals_stmt(as_of: date):
+    # reads the receivables_due rollup: one row per day, due date and slot
+    return select(*_aging_sums(ReceivableDue.due_date, ReceivableDue.amount, as_of)).where(
+        ReceivableDue.day <= as_of
+    )
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import case, delete, func, insert, literal, select, union_all
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.models import DailyRevenue, Invoice, Payment, ReceivableDue
+from app.repositories.reports import RECEIVABLE_STATUSES
+
+KEY = ("day", "customer_id", "property_id")
+MEASURES = ("invoiced_total", "invoice_count", "collected_total", "payment_count")
+
+
+def invoiced(day: date, customer_id: int, property_id: int, total: Decimal) -> dict[str, Any]:
+    return {
+        "day": day,
+        "customer_id": customer_id,
+        "property_id": property_id,
+        "invoiced_total": total,
+        "invoice_count": 1,
+        "collected_total": 0,
+        "payment_count": 0,
+    }
+
+
+def collected(day: date, customer_id: int, property_id: int, amount: Decimal) -> dict[str, Any]:
+    return {
+        "day": day,
+        "customer_id": customer_id,
+        "property_id": property_id,
+        "invoiced_total": 0,
+        "invoice_count": 0,
+        "collected_total": amount,
+        "payment_count": 1,
+    }
+
+
+def _upsert_sums(db: Session, model, key: Sequence[str], measures: Sequence[str], rows) -> None:
+    if not rows:
+        return
+
+    if db.get_bind().dialect.name == "mysql":
+        stmt = mysql.insert(model).values(list(rows))
+        stmt = stmt.on_duplicate_key_update({m: getattr(model, m) + stmt.inserted[m] for m in measures})
+    else:
+        stmt = sqlite.insert(model).values(list(rows))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(key),
+            set_={m: getattr(model, m) + stmt.excluded[m] for m in measures},
+        )
+    db.execute(stmt)
+
+
+def record(db: Session, rows: Sequence[dict[str, Any]]) -> None:
+    _upsert_sums(db, DailyRevenue, KEY, MEASURES, rows)
+
+
+def source_stmt(from_date: date, to_date: date):
+    invoices = (
+        select(
+            Invoice.issued_date.label("day"),
+            Invoice.customer_id,
+            Invoice.property_id,
+            func.sum(Invoice.total).label("invoiced_total"),
+            func.count().label("invoice_count"),
+            literal(0, DailyRevenue.collected_total.type).label("collected_total"),
+            literal(0).label("payment_count"),
+        )
+        .where(Invoice.status.in_(RECEIVABLE_STATUSES))
+        .where(Invoice.issued_date.between(from_date, to_date))
+        .group_by(Invoice.issued_date, Invoice.customer_id, Invoice.property_id)
+    )
+    payments = (
+        select(
+            Payment.paid_date.label("day"),
+            Invoice.customer_id,
+            Invoice.property_id,
+            literal(0, DailyRevenue.invoiced_total.type).label("invoiced_total"),
+            literal(0).label("invoice_count"),
+            func.sum(Payment.amount).label("collected_total"),
+            func.count().label("payment_count"),
+        )
+        .join(Invoice, Invoice.invoice_id == Payment.invoice_id)
+        .where(Payment.paid_date.between(from_date, to_date))
+        .group_by(Payment.paid_date, Invoice.customer_id, Invoice.property_id)
+    )
+    entries = union_all(invoices, payments).subquery("entries")
+    return (
+        select(
+            *(entries.c[k] for k in KEY),
+            *(func.sum(entries.c[m]).label(m) for m in MEASURES),
+        )
+        .group_by(*(entries.c[k] for k in KEY))
+    )
+
+
+def rebuild(db: Session, from_date: date, to_date: date) -> int:
+    db.execute(delete(DailyRevenue).where(DailyRevenue.day.between(from_date, to_date)))
+    result = db.execute(
+        insert(DailyRevenue).from_select([*KEY, *MEASURES], source_stmt(from_date, to_date))
+    )
+    return result.rowcount
+
+
+def source_span(db: Session) -> tuple[Optional[date], Optional[date]]:
+    invoices = db.execute(select(func.min(Invoice.issued_date), func.max(Invoice.issued_date))).one()
+    payments = db.execute(select(func.min(Payment.paid_date), func.max(Payment.paid_date))).one()
+    lows = [d for d in (invoices[0], payments[0]) if d is not None]
+    highs = [d for d in (invoices[1], payments[1]) if d is not None]
+    return (min(lows) if lows else None, max(highs) if highs else None)
+
+
+def revenue_series_stmt(
+    from_date: date,
+    to_date: date,
+    customer_id: Optional[int] = None,
+    property_id: Optional[int] = None,
+):
+    stmt = (
+        select(DailyRevenue.day, *(func.sum(getattr(DailyRevenue, m)).label(m) for m in MEASURES))
+        .where(DailyRevenue.day.between(from_date, to_date))
+        .group_by(DailyRevenue.day)
+        .order_by(DailyRevenue.day)
+    )
+    if customer_id is not None:
+        stmt = stmt.where(DailyRevenue.customer_id == customer_id)
+    if property_id is not None:
+        stmt = stmt.where(DailyRevenue.property_id == property_id)
+    return stmt
+
+
+# receivables_due: what the aging totals row sums. An invoice counts from its
+# issued_date, a payment from the later of its paid_date and its invoice's
+# issued_date, both against the invoice's due date (issued_date when unset).
+RECEIVABLE_KEY = ("day", "due_date", "slot")
+RECEIVABLE_SLOTS = 16
+
+
+def receivable(day: date, due_date: date, customer_id: int, amount: Decimal) -> dict[str, Any]:
+    return {"day": day, "due_date": due_date, "slot": customer_id % RECEIVABLE_SLOTS, "amount": amount}
+
+
+def payment_day(issued_date: date, paid_date: date) -> date:
+    return max(issued_date, paid_date)
+
+
+def record_receivables(db: Session, rows: Sequence[dict[str, Any]]) -> None:
+    _upsert_sums(db, ReceivableDue, RECEIVABLE_KEY, ("amount",), rows)
+
+
+def receivables_source_stmt(from_date: date, to_date: date):
+    due = func.coalesce(Invoice.due_date, Invoice.issued_date)
+    slot = Invoice.customer_id % RECEIVABLE_SLOTS
+    invoices = (
+        select(
+            Invoice.issued_date.label("day"),
+            due.label("due_date"),
+            slot.label("slot"),
+            Invoice.total.label("amount"),
+        )
+        .where(Invoice.status.in_(RECEIVABLE_STATUSES))
+        .where(Invoice.issued_date.between(from_date, to_date))
+    )
+    day = case((Payment.paid_date > Invoice.issued_date, Payment.paid_date), else_=Invoice.issued_date)
+    payments = (
+        select(
+            day.label("day"),
+            due.label("due_date"),
+            slot.label("slot"),
+            (-Payment.amount).label("amount"),
+        )
+        .join(Invoice, Invoice.invoice_id == Payment.invoice_id)
+        .where(Invoice.status.in_(RECEIVABLE_STATUSES))
+        .where(day.between(from_date, to_date))
+    )
+    entries = union_all(invoices, payments).subquery("entries")
+    return (
+        select(*(entries.c[k] for k in RECEIVABLE_KEY), func.sum(entries.c.amount).label("amount"))
+        .group_by(*(entries.c[k] for k in RECEIVABLE_KEY))
+    )
+
+
+def rebuild_receivables(db: Session, from_date: date, to_date: date) -> int:
+    db.execute(delete(ReceivableDue).where(ReceivableDue.day.between(from_date, to_date)))
+    result = db.execute(
+        insert(ReceivableDue).from_select([*RECEIVABLE_KEY, "amount"], receivables_source_stmt(from_date, to_date))
+    )
+    return result.rowcount
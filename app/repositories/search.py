@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import math
+import os
+import re
+from typing import Any, Mapping, Optional
+
+from sqlalchemy import delete, distinct, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import bad_request
+from app.models.models import Customer, Property, SearchGram
+
+SEARCH_MIN_SIMILARITY = float(os.getenv("SEARCH_MIN_SIMILARITY", "0.6"))
+
+CUSTOMER_SEARCH_FIELDS = ("first_name", "last_name", "email")
+PROPERTY_SEARCH_FIELDS = ("label", "address1", "city", "postal_code")
+
+ENTITIES = {
+    "customers": (Customer, Customer.customer_id, CUSTOMER_SEARCH_FIELDS),
+    "properties": (Property, Property.property_id, PROPERTY_SEARCH_FIELDS),
+}
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: Optional[str]) -> set[str]:
+    grams: set[str] = set()
+    for word in _WORD.findall((text or "").lower()):
+        padded = f"_{word}_"
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def gram_rows(entity: str, entity_id: int, values: Mapping[str, Optional[str]]) -> list[dict[str, Any]]:
+    return [
+        {"entity": entity, "entity_id": entity_id, "field": field, "gram": gram}
+        for field, text in values.items()
+        for gram in sorted(trigrams(text))
+    ]
+
+
+def index_entity(
+    db: Session,
+    entity: str,
+    entity_id: int,
+    values: Mapping[str, Optional[str]],
+    replace: bool = True,
+) -> None:
+    if not values:
+        return
+
+    if replace:
+        db.execute(
+            delete(SearchGram).where(
+                SearchGram.entity == entity,
+                SearchGram.entity_id == entity_id,
+                SearchGram.field.in_(list(values)),
+            )
+        )
+
+    rows = gram_rows(entity, entity_id, values)
+    if rows:
+        db.execute(insert(SearchGram), rows)
+
+
+def drop_entity(db: Session, entity: str, entity_id: int) -> None:
+    db.execute(
+        delete(SearchGram).where(SearchGram.entity == entity, SearchGram.entity_id == entity_id)
+    )
+
+
+def rebuild(db: Session, entity: str, batch_size: int = 1000) -> tuple[int, int]:
+    model, key, fields = ENTITIES[entity]
+    columns = [key, *(getattr(model, f) for f in fields)]
+    last_id, entities, grams = 0, 0, 0
+
+    while True:
+        rows = db.execute(
+            select(*columns).where(key > last_id).order_by(key).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        batch_max = rows[-1][0]
+        db.execute(
+            delete(SearchGram).where(
+                SearchGram.entity == entity,
+                SearchGram.entity_id > last_id,
+                SearchGram.entity_id <= batch_max,
+            )
+        )
+        values = [
+            gram
+            for row in rows
+            for gram in gram_rows(entity, row[0], dict(zip(fields, row[1:])))
+        ]
+        if values:
+            db.execute(insert(SearchGram), values)
+        db.commit()
+
+        entities += len(rows)
+        grams += len(values)
+        last_id = batch_max
+
+    db.execute(delete(SearchGram).where(SearchGram.entity == entity, SearchGram.entity_id > last_id))
+    db.commit()
+    return entities, grams
+
+
+def unindexed_entities(db: Session) -> list[str]:
+    missing = []
+    for entity, (_, key, _) in ENTITIES.items():
+        indexed = db.execute(select(SearchGram.entity_id).where(SearchGram.entity == entity).limit(1)).first()
+        if indexed is None and db.execute(select(key).limit(1)).first() is not None:
+            missing.append(entity)
+    return missing
+
+
+def ranked_matches(entity: str, q: str):
+    grams = trigrams(q)
+    if not grams:
+        raise bad_request("INVALID_SEARCH", "Search query has no searchable characters")
+
+    score = func.count(distinct(SearchGram.gram))
+    required = max(1, math.ceil(len(grams) * SEARCH_MIN_SIMILARITY))
+    return (
+        select(SearchGram.entity_id, score.label("score"))
+        .where(SearchGram.entity == entity, SearchGram.gram.in_(sorted(grams)))
+        .group_by(SearchGram.entity_id)
+        .having(score >= required)
+        .subquery("matches")
+    )
+
+
+def search(stmt, entity: str, key_column, q: str):
+    matches = ranked_matches(entity, q)
+    stmt = stmt.add_columns(matches.c.score).join(matches, matches.c.entity_id == key_column)
+    return stmt, matches.c.score
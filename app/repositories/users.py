@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session
+
+from app.models.models import User
+
+USER_BY_ID = select(User).where(User.user_id == bindparam("user_id"))
+USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+
+
+def get_user(db: Session, user_id: int) -> Optional[User]:
+    return db.execute(USER_BY_ID, {"user_id": user_id}).scalar_one_or_none()
+
+
+def get_user_by_username(db: Session, username: str) -> Optional[User]:
+    return db.execute(USER_BY_USERNAME, {"username": username}).scalar_one_or_none()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+
+class ThreadpoolOut(BaseModel):
+    total_tokens: int
+    borrowed_tokens: int
+
+
+class DbPoolMetricsOut(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+    recycle_seconds: Optional[int] = None
+    pre_ping: Optional[bool] = None
+    connects: int
+    checkouts: int
+    checkins: int
+    invalidations: int
+    soft_invalidations: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+    avg_checkout_ms: float
+    max_checkout_ms: float
+    avg_held_ms: float
+    max_held_ms: float
+
+
+class ReadRoutingOut(BaseModel):
+    window_seconds: float
+    pinned_users: int
+    primary_reads: int
+    replica_reads: int
+
+
+class DbPoolsMetricsOut(BaseModel):
+    pools: dict[str, DbPoolMetricsOut]
+    read_routing: ReadRoutingOut
+    threadpool: ThreadpoolOut
+
+
+class AuthMetricsOut(BaseModel):
+    principal_cache: dict[str, Any]
+    token_epochs: dict[str, Any]
+    password_pool: dict[str, Any]
+    login_throttle: dict[str, Any]
+
+
+class CacheMetricsOut(BaseModel):
+    count_cache: dict[str, Any]
+    response_cache: dict[str, Any]
+    report_totals: dict[str, Any]
@@ -1,7 +1,13 @@
 from pydantic import BaseModel, ConfigDict, field_validator, Field
 from datetime import date, datetime
 from typing import Optional
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
+
+CENTS = Decimal("0.01")
+
+
+def _to_cents(v: Decimal) -> Decimal:
+    return v.quantize(CENTS, rounding=ROUND_HALF_UP)
 
 
 class CustomerOut(BaseModel):
@@ -40,6 +46,11 @@ class InvoiceOut(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    @field_validator("subtotal", "tax", "total")
+    @classmethod
+    def money_to_cents(cls, v: Decimal) -> Decimal:
+        return _to_cents(v)
+
 
 class InvoiceCreate(BaseModel):
     customer_id: int = Field(..., ge=1, description="Customer ID (1-100)")
@@ -114,20 +125,88 @@ class PaymentOut(BaseModel):
 
     model_config = {"from_attributes": True}
 
+    @field_validator("amount")
+    @classmethod
+    def amount_to_cents(cls, v: Decimal) -> Decimal:
+        return _to_cents(v)
+
 class StatementItem(BaseModel):
+    kind: str
+    entry_date: date
     invoice_id: int
-    issued_date: date
-    status: str
-    total: Decimal
+    payment_id: Optional[int] = None
+    status: Optional[str] = None
+    amount: Decimal
+    balance: Decimal
+
+    @field_validator("amount", "balance")
+    @classmethod
+    def money_to_cents(cls, v: Decimal) -> Decimal:
+        return _to_cents(v)
 
 
 class CustomerStatementOut(BaseModel):
     customer_id: int
     from_date: date
     to_date: date
-    total: Decimal
+    opening_balance: Decimal
+    invoiced: Decimal
+    paid: Decimal
+    closing_balance: Decimal
     items: list[StatementItem]
 
+    @field_validator("opening_balance", "invoiced", "paid", "closing_balance")
+    @classmethod
+    def money_to_cents(cls, v: Decimal) -> Decimal:
+        return _to_cents(v)
+
+class AgingBuckets(BaseModel):
+    days_0_30: Decimal
+    days_31_60: Decimal
+    days_61_90: Decimal
+    days_over_90: Decimal
+    total: Decimal
+
+    @field_validator("days_0_30", "days_31_60", "days_61_90", "days_over_90", "total")
+    @classmethod
+    def money_to_cents(cls, v: Decimal) -> Decimal:
+        return _to_cents(v)
+
+
+class AgingRow(AgingBuckets):
+    customer_id: int
+
+
+class AgingReportOut(BaseModel):
+    as_of: date
+    totals: Optional[AgingBuckets]
+    items: list[AgingRow]
+
+class RevenueTotals(BaseModel):
+    invoiced_total: Decimal
+    invoice_count: int
+    collected_total: Decimal
+    payment_count: int
+
+    @field_validator("invoiced_total", "collected_total")
+    @classmethod
+    def money_to_cents(cls, v: Decimal) -> Decimal:
+        return _to_cents(v)
+
+
+class RevenuePoint(RevenueTotals):
+    period: date
+
+
+class RevenueReportOut(BaseModel):
+    from_date: date
+    to_date: date
+    granularity: str
+    customer_id: Optional[int]
+    property_id: Optional[int]
+    totals: RevenueTotals
+    items: list[RevenuePoint]
+
 class CustomerUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
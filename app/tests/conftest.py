@@ -1,4 +1,6 @@
 import os
+from contextlib import contextmanager
+
 import pytest
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
@@ -6,10 +8,19 @@ from fastapi.testclient import TestClient
 from urllib.parse import urlencode
 
 from app.api.app import app
+from app.core.principals import principal_cache
+from app.core.response_cache import resource_versions, response_cache
+from app.core.token_epochs import token_epochs
+from app.db.counts import count_cache
+from app.db.query_stats import capture_queries
+from app.db.recent_writes import recent_writes
+from app.db.report_totals import report_totals
 
 try:
-    from app.db.session import get_db
+    from app.db.session import get_async_db, get_async_read_db, get_db
 except Exception:
+    get_async_db = None
+    get_async_read_db = None
     get_db = None
 
 
@@ -35,7 +46,7 @@ def db_session(engine):
     transaction = connection.begin()
 
     TestingSessionLocal = sessionmaker(
-        bind=connection, autoflush=False, autocommit=False
+        bind=connection, autoflush=False, autocommit=False, expire_on_commit=False
     )
     session = TestingSessionLocal()
 
@@ -60,6 +71,24 @@ def db_session(engine):
             connection.close()
 
 
+class _AsyncSessionOverSync:
+    def __init__(self, session):
+        self._session = session
+
+    async def execute(self, statement, *args, **kwargs):
+        return self._session.execute(statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return self._session.scalar(statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return self._session.get(entity, ident, **kwargs)
+
+    @property
+    def bind(self):
+        return self._session.bind
+
+
 @pytest.fixture(scope="function")
 def anon_client(db_session):
     if get_db is None:
@@ -71,12 +100,31 @@ def anon_client(db_session):
         finally:
             pass
 
+    async def _override_get_async_db():
+        yield _AsyncSessionOverSync(db_session)
+
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_async_db] = _override_get_async_db
+    app.dependency_overrides[get_async_read_db] = _override_get_async_db
+    principal_cache.clear()
+    recent_writes.clear()
+    count_cache.clear()
+    response_cache.clear()
+    resource_versions.clear()
+    token_epochs.clear()
+    report_totals.clear()
 
     with TestClient(app) as c:
         yield c
 
     app.dependency_overrides.clear()
+    principal_cache.clear()
+    recent_writes.clear()
+    count_cache.clear()
+    response_cache.clear()
+    resource_versions.clear()
+    token_epochs.clear()
+    report_totals.clear()
 
 
 @pytest.fixture(scope="function")
@@ -104,6 +152,7 @@ def auth_headers(anon_client, db_session):
             {"u": username},
         )
         db_session.flush()
+        db_session.expire_all()
     except Exception as e:
         raise AssertionError(f"Failed to force admin role in DB: {e}")
 
@@ -127,3 +176,19 @@ def auth_headers(anon_client, db_session):
 def client(anon_client, auth_headers):
     anon_client.headers.update(auth_headers)
     return anon_client
+
+
+@pytest.fixture(scope="function")
+def query_budget():
+    @contextmanager
+    def _budget(max_queries: int):
+        with capture_queries() as stats:
+            yield stats
+
+        if stats.count > max_queries:
+            statements = "\n".join(f"  {s}" for s in stats.statements)
+            raise AssertionError(
+                f"Query budget exceeded: {stats.count} queries, budget {max_queries}\n{statements}"
+            )
+
+    return _budget
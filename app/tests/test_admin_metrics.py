@@ -0,0 +1,27 @@
+def test_db_pool_metrics_for_admin(client):
+    r = client.get("/api/v1/admin/metrics/db-pool")
+    assert r.status_code == 200, r.text
+
+    body = r.json()
+    for name in ("primary", "primary_async"):
+        pool = body["pools"][name]
+        for key in ("size", "checked_out", "overflow", "checkouts", "avg_wait_ms", "invalidations"):
+            assert key in pool
+    assert body["threadpool"]["total_tokens"] >= 1
+
+
+def test_auth_metrics_for_admin(client):
+    client.get("/api/v1/auth/me")
+
+    r = client.get("/api/v1/admin/metrics/auth")
+    assert r.status_code == 200, r.text
+
+    body = r.json()
+    assert "hits" in body["principal_cache"]
+    assert "rejected" in body["password_pool"]
+    assert "rejected" in body["login_throttle"]
+
+
+def test_admin_metrics_require_authentication(anon_client):
+    r = anon_client.get("/api/v1/admin/metrics/db-pool")
+    assert r.status_code == 401
@@ -0,0 +1,21 @@
+import threading
+import uuid
+
+from app.core.password_pool import password_pool
+
+
+def test_register_returns_503_when_password_pool_is_saturated(anon_client, monkeypatch):
+    monkeypatch.setattr(password_pool, "_slots", threading.BoundedSemaphore(1))
+    password_pool._slots.acquire()
+
+    u = f"pool-{uuid.uuid4().hex[:10]}"
+    r = anon_client.post(
+        "/api/v1/auth/register",
+        json={"username": u, "email": f"{u}@example.com", "password": "Password123!"},
+    )
+    assert r.status_code == 503, r.text
+
+    body = r.json()
+    assert body["code"] == "PASSWORD_POOL_SATURATED"
+    assert "request_id" in body["details"]
+    assert "timestamp" in body
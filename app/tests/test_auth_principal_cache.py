@@ -0,0 +1,45 @@
+from app.core.principals import principal_cache
+from app.models.models import User
+
+
+def test_me_is_served_from_principal_cache_on_repeat(client):
+    r1 = client.get("/api/v1/auth/me")
+    assert r1.status_code == 200, r1.text
+
+    hits_before = principal_cache.stats()["hits"]
+
+    r2 = client.get("/api/v1/auth/me")
+    assert r2.status_code == 200, r2.text
+    assert r2.json() == r1.json()
+
+    assert principal_cache.stats()["hits"] > hits_before
+
+
+def test_role_change_through_orm_invalidates_cached_principal(client, db_session):
+    r = client.post("/api/v1/customers", json={"first_name": "Cache", "last_name": "Admin"})
+    assert r.status_code == 201, r.text
+
+    user = db_session.query(User).filter(User.username == "test_admin").first()
+    user.role = "staff"
+    db_session.flush()
+    assert principal_cache.get(user.user_id) is not None
+
+    db_session.commit()
+    assert principal_cache.get(user.user_id) is None
+
+    r2 = client.post("/api/v1/customers", json={"first_name": "Cache", "last_name": "Staff"})
+    assert r2.status_code == 403, r2.text
+
+
+def test_rolled_back_role_change_keeps_cached_principal(client, db_session):
+    client.get("/api/v1/auth/me")
+    user = db_session.query(User).filter(User.username == "test_admin").first()
+    savepoint = db_session.begin_nested()
+    user.role = "staff"
+    db_session.flush()
+    savepoint.rollback()
+    db_session.commit()
+
+    assert principal_cache.get(user.user_id) is not None
+    r = client.post("/api/v1/customers", json={"first_name": "Cache", "last_name": "Kept"})
+    assert r.status_code == 201, r.text
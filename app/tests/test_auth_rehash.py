@@ -0,0 +1,38 @@
+import uuid
+
+from passlib.hash import bcrypt
+from sqlalchemy import text
+
+from app.core.security import BCRYPT_ROUNDS
+
+
+def test_login_rehashes_password_with_different_cost(anon_client, db_session):
+    u = f"rehash-{uuid.uuid4().hex[:10]}"
+    r = anon_client.post(
+        "/api/v1/auth/register",
+        json={"username": u, "email": f"{u}@example.com", "password": "Password123!"},
+    )
+    assert r.status_code == 201, r.text
+
+    other_rounds = BCRYPT_ROUNDS - 1 if BCRYPT_ROUNDS > 4 else BCRYPT_ROUNDS + 1
+    stale = bcrypt.using(rounds=other_rounds).hash("Password123!")
+    db_session.execute(
+        text("UPDATE users SET hashed_password = :h WHERE username = :u"),
+        {"h": stale, "u": u},
+    )
+    db_session.flush()
+    db_session.expire_all()
+
+    r2 = anon_client.post(
+        "/api/v1/auth/token",
+        data={"username": u, "password": "Password123!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r2.status_code == 200, r2.text
+
+    stored = db_session.execute(
+        text("SELECT hashed_password FROM users WHERE username = :u"),
+        {"u": u},
+    ).scalar_one()
+    assert stored != stale
+    assert stored.split("$")[2] == f"{BCRYPT_ROUNDS:02d}"
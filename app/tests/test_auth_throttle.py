@@ -0,0 +1,47 @@
+import uuid
+
+from app.api.v1.routers import auth
+from app.core.throttle import LoginThrottle
+
+
+def _login(client, username: str, password: str):
+    return client.post(
+        "/api/v1/auth/token",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+
+
+def test_repeated_failed_logins_are_throttled_with_standard_shape(anon_client, monkeypatch):
+    throttle = LoginThrottle(ip_limit=100, username_limit=3, window_seconds=60, max_keys=1000)
+    monkeypatch.setattr(auth, "login_throttle", throttle)
+
+    u = f"nobody-{uuid.uuid4().hex[:10]}"
+    for _ in range(3):
+        r = _login(anon_client, u, "WrongPassword1!")
+        assert r.status_code == 401, r.text
+
+    r = _login(anon_client, u, "WrongPassword1!")
+    assert r.status_code == 429, r.text
+
+    body = r.json()
+    assert body["code"] == "LOGIN_THROTTLED"
+    assert body["details"]["retry_after_seconds"] >= 1
+    assert "request_id" in body["details"]
+    assert "timestamp" in body
+
+
+def test_successful_logins_do_not_consume_throttle_budget(anon_client, monkeypatch):
+    throttle = LoginThrottle(ip_limit=2, username_limit=2, window_seconds=60, max_keys=1000)
+    monkeypatch.setattr(auth, "login_throttle", throttle)
+
+    u = f"legit-{uuid.uuid4().hex[:10]}"
+    r = anon_client.post(
+        "/api/v1/auth/register",
+        json={"username": u, "email": f"{u}@example.com", "password": "Password123!"},
+    )
+    assert r.status_code == 201, r.text
+
+    for _ in range(4):
+        r = _login(anon_client, u, "Password123!")
+        assert r.status_code == 200, r.text
@@ -0,0 +1,80 @@
+import uuid
+
+from sqlalchemy import text
+
+from app.models.models import User
+
+
+def _login_admin_with_claims(anon_client, db_session, monkeypatch) -> tuple[str, dict]:
+    monkeypatch.setenv("JWT_EMBED_CLAIMS", "true")
+
+    u = f"claims-{uuid.uuid4().hex[:10]}"
+    r = anon_client.post(
+        "/api/v1/auth/register",
+        json={"username": u, "email": f"{u}@example.com", "password": "Password123!"},
+    )
+    assert r.status_code == 201, r.text
+
+    db_session.execute(
+        text("UPDATE users SET role = 'admin' WHERE username = :u"),
+        {"u": u},
+    )
+    db_session.flush()
+    db_session.expire_all()
+
+    r2 = anon_client.post(
+        "/api/v1/auth/token",
+        data={"username": u, "password": "Password123!"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert r2.status_code == 200, r2.text
+    return u, {"Authorization": f"Bearer {r2.json()['access_token']}"}
+
+
+def test_claims_token_allows_admin_write_and_me(anon_client, db_session, monkeypatch):
+    u, headers = _login_admin_with_claims(anon_client, db_session, monkeypatch)
+
+    r = anon_client.post(
+        "/api/v1/customers",
+        json={"first_name": "Claims", "last_name": "Admin"},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
+
+    me = anon_client.get("/api/v1/auth/me", headers=headers)
+    assert me.status_code == 200, me.text
+    assert me.json()["username"] == u
+    assert me.json()["email"] == f"{u}@example.com"
+
+
+def test_role_change_revokes_claims_token(anon_client, db_session, monkeypatch):
+    u, headers = _login_admin_with_claims(anon_client, db_session, monkeypatch)
+
+    user = db_session.query(User).filter(User.username == u).first()
+    user.role = "staff"
+    db_session.commit()
+    db_session.expire_all()
+
+    r = anon_client.post(
+        "/api/v1/customers",
+        json={"first_name": "Claims", "last_name": "Revoked"},
+        headers=headers,
+    )
+    assert r.status_code == 401, r.text
+
+
+def test_rolled_back_role_change_keeps_claims_token(anon_client, db_session, monkeypatch):
+    u, headers = _login_admin_with_claims(anon_client, db_session, monkeypatch)
+
+    user = db_session.query(User).filter(User.username == u).first()
+    user.role = "staff"
+    db_session.flush()
+    db_session.rollback()
+    db_session.expire_all()
+
+    r = anon_client.post(
+        "/api/v1/customers",
+        json={"first_name": "Claims", "last_name": "Kept"},
+        headers=headers,
+    )
+    assert r.status_code == 201, r.text
@@ -0,0 +1,102 @@
+import pytest
+from sqlalchemy import text
+
+from app.core import compression
+
+GZIP = {"Accept-Encoding": "gzip"}
+IDENTITY = {"Accept-Encoding": "identity"}
+
+
+@pytest.fixture
+def compress_calls(monkeypatch):
+    calls = []
+    original = compression.compress
+
+    def counting(body, encoding):
+        calls.append(encoding)
+        return original(body, encoding)
+
+    monkeypatch.setattr(compression, "compress", counting)
+    return calls
+
+
+def _seed_properties(client, count: int = 8) -> int:
+    r = client.post("/api/v1/customers", json={"first_name": "Gzip", "last_name": "Owner"})
+    customer_id = r.json()["customer_id"]
+    for i in range(count):
+        r = client.post(
+            "/api/v1/properties",
+            json={
+                "customer_id": customer_id,
+                "label": f"Compressed property {i}",
+                "address1": f"{i} Long Compression Avenue",
+                "city": "Rincon",
+                "state": "PR",
+                "postal_code": "00677",
+                "notes": "Gate code at the side door, dog in the back yard",
+            },
+        )
+        assert r.status_code == 201, r.text
+    return customer_id
+
+
+def test_large_list_is_gzipped_and_cached_variant_reused(client, compress_calls):
+    customer_id = _seed_properties(client)
+    url = f"/api/v1/properties?customer_id={customer_id}"
+
+    plain = client.get(url, headers=IDENTITY)
+    assert "content-encoding" not in plain.headers
+    assert len(plain.content) >= compression.COMPRESSION_MIN_BYTES
+
+    first = client.get(url, headers=GZIP)
+    assert first.headers["content-encoding"] == "gzip"
+    assert "accept-encoding" in first.headers["vary"].lower()
+    assert first.json() == plain.json()
+
+    second = client.get(url, headers=GZIP)
+    assert second.headers["x-cache"] == "hit"
+    assert second.headers["content-encoding"] == "gzip"
+    assert compress_calls == ["gzip"]
+
+
+def test_small_responses_stay_identity(client):
+    r = client.get("/api/v1/auth/me", headers=GZIP)
+    assert r.status_code == 200, r.text
+    assert "content-encoding" not in r.headers
+
+
+def test_compressed_etag_is_weak_and_still_matches(client, db_session):
+    customer_id = _seed_properties(client)
+    db_session.execute(
+        text("UPDATE properties SET updated_at = '2020-01-01 00:00:00' WHERE customer_id = :c"),
+        {"c": customer_id},
+    )
+    url = f"/api/v1/properties?customer_id={customer_id}&limit=20"
+
+    r = client.get(url, headers=GZIP)
+    assert r.headers["etag"].startswith('W/"')
+
+    r = client.get(url, headers={**GZIP, "If-None-Match": r.headers["etag"]})
+    assert r.status_code == 304
+
+
+def test_openapi_is_precompressed_once(anon_client, compress_calls):
+    r1 = anon_client.get("/openapi.json", headers=GZIP)
+    r2 = anon_client.get("/openapi.json", headers=GZIP)
+    assert r1.headers["content-encoding"] == "gzip"
+    assert r1.json() == r2.json() == anon_client.app.openapi()
+    assert compress_calls.count("gzip") <= 1
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0", None),
+        ("*", compression.SUPPORTED_ENCODINGS[0]),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate(header, expected):
+    assert compression.negotiate(header) == expected
@@ -0,0 +1,58 @@
+import pytest
+
+from app.db import warmup
+
+
+class _Conn:
+    def exec_driver_sql(self, sql):
+        pass
+
+    def close(self):
+        pass
+
+
+class _FlakyEngine:
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.connects = 0
+
+    def connect(self):
+        self.connects += 1
+        if self.failures:
+            self.failures -= 1
+            raise OSError("Can't connect to MySQL server")
+        return _Conn()
+
+
+@pytest.fixture
+def readiness(monkeypatch):
+    state = warmup.DbReadiness()
+    monkeypatch.setattr(warmup, "db_readiness", state)
+    return state
+
+
+def test_warmup_recovers_after_reporting_unavailable(readiness, monkeypatch):
+    engine = _FlakyEngine(failures=4)
+    seen = []
+    monkeypatch.setattr(warmup.time, "sleep", lambda s: seen.append(readiness.state))
+    ready = []
+
+    warmup._run(lambda: engine, 2, 3, 0.0, 0.0, lambda: ready.append(True))
+
+    assert seen == ["warming", "warming", "unavailable", "unavailable"]
+    assert readiness.state == "ready"
+    assert readiness.attempts == 5
+    assert readiness.warm_connections == 2
+    assert readiness.error is None
+    assert ready == [True]
+
+
+def test_zero_connections_skips_warmup(readiness):
+    engine = _FlakyEngine(failures=0)
+    ready = []
+
+    warmup._run(lambda: engine, 0, 3, 0.0, 0.0, lambda: ready.append(True))
+
+    assert engine.connects == 0
+    assert readiness.state == "skipped"
+    assert ready == [True]
@@ -0,0 +1,94 @@
+from sqlalchemy import text
+
+LONG_AGO = "2020-01-01 00:00:00"
+
+
+def _create_customer(client, last_name: str = "Etag") -> int:
+    r = client.post("/api/v1/customers", json={"first_name": "Cond", "last_name": last_name})
+    assert r.status_code == 201, r.text
+    return r.json()["customer_id"]
+
+
+def _create_property(client, customer_id: int, label: str = "Etag Home") -> int:
+    r = client.post(
+        "/api/v1/properties",
+        json={"customer_id": customer_id, "label": label, "address1": "1 Etag St"},
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["property_id"]
+
+
+def _backdate(db_session, table: str, where: str, params: dict) -> None:
+    db_session.execute(text(f"UPDATE {table} SET updated_at = :ts WHERE {where}"), {"ts": LONG_AGO, **params})
+    db_session.flush()
+
+
+def test_detail_304_on_matching_etag(client, db_session, query_budget):
+    customer_id = _create_customer(client)
+    _backdate(db_session, "customers", "customer_id = :id", {"id": customer_id})
+
+    r = client.get(f"/api/v1/customers/{customer_id}")
+    assert r.status_code == 200, r.text
+    etag = r.headers["etag"]
+
+    with query_budget(1):
+        r = client.get(f"/api/v1/customers/{customer_id}", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["etag"] == etag
+    assert r.content == b""
+
+    r = client.get(f"/api/v1/customers/{customer_id}?fields=last_name", headers={"If-None-Match": etag})
+    assert r.status_code == 200, r.text
+    assert r.headers["etag"] != etag
+
+
+def test_write_invalidates_detail_etag(client, db_session):
+    customer_id = _create_customer(client)
+    property_id = _create_property(client, customer_id)
+    _backdate(db_session, "properties", "property_id = :id", {"id": property_id})
+    etag = client.get(f"/api/v1/properties/{property_id}").headers["etag"]
+
+    r = client.patch(f"/api/v1/properties/{property_id}", json={"label": "Renamed"})
+    assert r.status_code == 200, r.text
+
+    r = client.get(f"/api/v1/properties/{property_id}", headers={"If-None-Match": etag})
+    assert r.status_code == 200, r.text
+    assert r.json()["label"] == "Renamed"
+    # updated in the current second, so the row is not given a validator yet
+    assert "etag" not in r.headers
+
+
+def test_list_304_and_fingerprint_changes(client, db_session, query_budget):
+    customer_id = _create_customer(client)
+    for i in range(3):
+        _create_property(client, customer_id, label=f"Etag P{i}")
+    _backdate(db_session, "properties", "customer_id = :c", {"c": customer_id})
+
+    url = f"/api/v1/properties?customer_id={customer_id}&limit=2"
+    r = client.get(url)
+    assert r.status_code == 200, r.text
+    etag = r.headers["etag"]
+
+    with query_budget(1):
+        r = client.get(url, headers={"If-None-Match": f'W/"other", {etag}'})
+    assert r.status_code == 304
+
+    oldest = min(p["property_id"] for p in client.get(f"/api/v1/properties?customer_id={customer_id}").json())
+    r = client.delete(f"/api/v1/properties/{oldest}")
+    assert r.status_code == 204, r.text
+
+    r = client.get(url, headers={"If-None-Match": etag})
+    assert r.status_code == 200, r.text
+    assert r.headers["etag"] != etag
+    assert "link" not in r.headers
+
+
+def test_search_list_304(client, db_session):
+    customer_id = _create_customer(client, last_name="Etagsearch")
+    _backdate(db_session, "customers", "customer_id = :id", {"id": customer_id})
+
+    r = client.get("/api/v1/customers?q=Etagsearch")
+    assert [c["customer_id"] for c in r.json()] == [customer_id]
+
+    r = client.get("/api/v1/customers?q=Etagsearch", headers={"If-None-Match": r.headers["etag"]})
+    assert r.status_code == 304
@@ -0,0 +1,163 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import mysql
+
+from app.core.pagination import PageParams, keyset
+from app.models.models import Invoice, Payment
+from app.repositories import invoices as invoices_repo
+from app.repositories import payments as payments_repo
+from app.repositories import reports as reports_repo
+
+SEED_CUSTOMERS = 300
+SEED_PROPERTIES_PER_CUSTOMER = 2
+SEED_INVOICES_PER_PROPERTY = 50
+
+FIRST_PAGE = PageParams(limit=50)
+
+# Shapes allowed to walk PRIMARY (EXPLAIN type=index). Each one has a LIMIT, so the
+# backward PK walk stops after one page instead of reading the table.
+PRIMARY_SCAN_SHAPES = {
+    "invoices: unfiltered",
+    "invoices: unfiltered, next page",
+    "payments: unfiltered",
+    # issued_date range ordered by invoice_id: an issued_date index would still
+    # filesort the whole range. invoice_id follows issued_date closely, so the PK
+    # walk skips the newer invoices and stops one page into the range.
+    "invoices: date range",
+}
+
+
+def _seed(db) -> None:
+    db.execute(text("SET SESSION cte_max_recursion_depth = 100000"))
+    db.execute(
+        text(
+            """
+            INSERT INTO customers (first_name, last_name)
+            WITH RECURSIVE seq (n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < :count - 1)
+            SELECT 'Explain', CONCAT('Seed', n) FROM seq
+            """
+        ),
+        {"count": SEED_CUSTOMERS},
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO properties (customer_id, label, address1)
+            WITH RECURSIVE seq (n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < :count - 1)
+            SELECT c.customer_id, 'explain-seed', CONCAT(seq.n, ' Seed St')
+            FROM customers c CROSS JOIN seq
+            WHERE c.first_name = 'Explain'
+            """
+        ),
+        {"count": SEED_PROPERTIES_PER_CUSTOMER},
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO invoices
+              (customer_id, property_id, period_start, period_end, status, issued_date, subtotal, tax, total)
+            WITH RECURSIVE seq (n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < :count - 1)
+            SELECT p.customer_id, p.property_id,
+                   DATE_ADD('2020-01-01', INTERVAL seq.n MONTH),
+                   LAST_DAY(DATE_ADD('2020-01-01', INTERVAL seq.n MONTH)),
+                   ELT(1 + (seq.n + p.property_id) % 4, 'draft', 'sent', 'paid', 'void'),
+                   LAST_DAY(DATE_ADD('2020-01-01', INTERVAL seq.n MONTH)),
+                   100.00, 10.00, 110.00
+            FROM properties p CROSS JOIN seq
+            WHERE p.label = 'explain-seed'
+            """
+        ),
+        {"count": SEED_INVOICES_PER_PROPERTY},
+    )
+    db.execute(
+        text(
+            """
+            INSERT INTO payments (invoice_id, paid_date, amount)
+            SELECT i.invoice_id, i.issued_date, 55.00
+            FROM invoices i JOIN properties p ON p.property_id = i.property_id
+            WHERE p.label = 'explain-seed'
+            """
+        )
+    )
+
+
+def _compile(stmt) -> str:
+    return str(stmt.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def _plan_problems(db, stmt, primary_scan_ok: bool = False) -> list[str]:
+    rows = db.execute(text("EXPLAIN " + _compile(stmt))).mappings().all()
+    problems = []
+    for row in rows:
+        extra = row["Extra"] or ""
+        if row["table"] is None:
+            continue
+        if row["type"] == "ALL":
+            problems.append(f"full table scan on {row['table']}")
+        if row["type"] == "index" and not (primary_scan_ok and row["key"] == "PRIMARY"):
+            problems.append(f"full index scan on {row['table']}.{row['key']}")
+        if "Using filesort" in extra:
+            problems.append(f"filesort on {row['table']}")
+        if "Using temporary" in extra:
+            problems.append(f"temporary table on {row['table']}")
+    return problems
+
+
+def _query_shapes(customer_id: int, property_id: int, invoice_id: int) -> dict:
+    after_invoice = PageParams(limit=50, after=(invoice_id,))
+    date_range = {"from_date": date(2021, 1, 1), "to_date": date(2021, 12, 31)}
+
+    def invoice_list(page=FIRST_PAGE, **filters):
+        return keyset(invoices_repo.invoice_list_stmt(**filters), [Invoice.invoice_id], page)
+
+    def payment_list(page=FIRST_PAGE, **filters):
+        return keyset(payments_repo.payment_list_stmt(**filters), [Payment.payment_id], page)
+
+    return {
+        "invoices: unfiltered": invoice_list(),
+        "invoices: unfiltered, next page": invoice_list(after_invoice),
+        "invoices: status": invoice_list(status="sent"),
+        "invoices: status, next page": invoice_list(after_invoice, status="sent"),
+        "invoices: customer": invoice_list(customer_id=customer_id),
+        "invoices: customer + status": invoice_list(customer_id=customer_id, status="sent"),
+        "invoices: property": invoice_list(property_id=property_id),
+        "invoices: property + status": invoice_list(property_id=property_id, status="sent"),
+        "invoices: customer + property": invoice_list(customer_id=customer_id, property_id=property_id),
+        "invoices: customer + date range": invoice_list(customer_id=customer_id, **date_range),
+        "invoices: date range": invoice_list(**date_range),
+        "statement: opening balance": reports_repo.statement_opening_stmt(customer_id, date_range["from_date"]),
+        "statement: invoices in range": reports_repo.statement_invoices_stmt(customer_id, **date_range),
+        "statement: payments in range": reports_repo.statement_payments_stmt(customer_id, **date_range),
+        "payments: unfiltered": payment_list(),
+        "payments: invoice": payment_list(invoice_id=invoice_id),
+        "payments: create_payment invoice lookup": invoices_repo.INVOICE_FOR_PAYMENT.params(invoice_id=invoice_id),
+    }
+
+
+def test_endpoint_query_shapes_avoid_full_scans_and_filesorts(db_session):
+    if db_session.bind.dialect.name != "mysql":
+        pytest.skip("EXPLAIN harness targets MySQL plans")
+
+    _seed(db_session)
+
+    customer_id, property_id = db_session.execute(
+        text("SELECT customer_id, property_id FROM properties WHERE label = 'explain-seed' LIMIT 1")
+    ).one()
+    invoice_id = db_session.execute(
+        text("SELECT MAX(invoice_id) FROM invoices WHERE property_id = :p"), {"p": property_id}
+    ).scalar_one()
+
+    failures = {}
+    shapes = _query_shapes(customer_id, property_id, invoice_id)
+    assert PRIMARY_SCAN_SHAPES <= shapes.keys()
+    for name, stmt in shapes.items():
+        primary_scan_ok = name in PRIMARY_SCAN_SHAPES
+        if primary_scan_ok:
+            assert " LIMIT " in _compile(stmt), f"{name}: PRIMARY scan exemption needs a LIMIT"
+        problems = _plan_problems(db_session, stmt, primary_scan_ok)
+        if problems:
+            failures[name] = problems
+
+    assert not failures, "\n".join(f"{name}: {', '.join(p)}" for name, p in failures.items())
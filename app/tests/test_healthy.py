@@ -5,5 +5,6 @@ def test_health_ok(client):
     data = r.json()
     assert data["status"] == "ok"
     assert "version" in data
+    assert data["database"]["state"] in ("cold", "warming", "ready", "unavailable", "skipped")
 
     assert "x-request-id" in {k.lower(): v for k, v in r.headers.items()}
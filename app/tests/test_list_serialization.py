@@ -0,0 +1,36 @@
+def test_list_rows_match_detail_serialization(client):
+    r = client.post("/api/v1/customers", json={"first_name": "Rows", "last_name": "Parity"})
+    customer_id = r.json()["customer_id"]
+    r = client.post(
+        "/api/v1/properties",
+        json={"customer_id": customer_id, "label": "Rows Home", "address1": "1 Rows St", "city": "Rincón"},
+    )
+    property_id = r.json()["property_id"]
+    r = client.post(
+        "/api/v1/invoices",
+        json={
+            "customer_id": customer_id,
+            "property_id": property_id,
+            "period_start": "2026-01-01",
+            "period_end": "2026-01-31",
+            "issued_date": "2026-01-31",
+            "subtotal": 10.5,
+            "tax": 1.05,
+            "total": 11.55,
+        },
+    )
+    assert r.status_code == 201, r.text
+    invoice = r.json()
+
+    r = client.post("/api/v1/payments", json={"invoice_id": invoice["invoice_id"], "amount": 5.1})
+    assert r.status_code == 201, r.text
+    payment = r.json()
+
+    listed = client.get(f"/api/v1/invoices?customer_id={customer_id}").json()
+    assert listed == [client.get(f"/api/v1/invoices/{invoice['invoice_id']}").json()]
+    assert listed[0]["total"] == "11.55"
+
+    assert client.get(f"/api/v1/payments?invoice_id={invoice['invoice_id']}").json() == [payment]
+    assert client.get(f"/api/v1/properties?customer_id={customer_id}").json() == [
+        client.get(f"/api/v1/properties/{property_id}").json()
+    ]
@@ -0,0 +1,103 @@
+import re
+
+import pytest
+
+from app.core.pagination import PAGE_SIZE_MAX, encode_cursor
+
+
+def _next_link(response):
+    link = response.headers.get("link")
+    if link is None:
+        return None
+    match = re.match(r'<([^>]+)>; rel="next"', link)
+    assert match, link
+    return match.group(1)
+
+
+def test_customers_cursor_walks_all_rows_without_overlap(client):
+    for i in range(5):
+        r = client.post("/api/v1/customers", json={"first_name": "Page", "last_name": f"C{i}"})
+        assert r.status_code == 201, r.text
+
+    seen = []
+    url = "/api/v1/customers?limit=2"
+    while url is not None:
+        r = client.get(url)
+        assert r.status_code == 200, r.text
+        assert len(r.json()) <= 2
+        seen.extend(c["customer_id"] for c in r.json())
+        url = _next_link(r)
+
+    assert len(seen) == len(set(seen))
+    assert seen == sorted(seen, reverse=True)
+    assert len(seen) >= 5
+
+
+def test_last_page_has_no_next_link(client):
+    r = client.post("/api/v1/customers", json={"first_name": "Page", "last_name": "Last"})
+    customer_id = r.json()["customer_id"]
+    created = []
+    for i in range(3):
+        r = client.post(
+            "/api/v1/properties",
+            json={"customer_id": customer_id, "label": f"Last P{i}", "address1": "1 Page St"},
+        )
+        assert r.status_code == 201, r.text
+        created.append(r.json()["property_id"])
+
+    seen = []
+    url = f"/api/v1/properties?customer_id={customer_id}&limit=2"
+    while True:
+        r = client.get(url)
+        assert r.status_code == 200, r.text
+        seen.extend(p["property_id"] for p in r.json())
+        url = _next_link(r)
+        if url is None:
+            break
+    assert "link" not in r.headers
+    assert sorted(seen) == sorted(created)
+
+    r = client.get(f"/api/v1/properties?customer_id={customer_id}&limit=3")
+    assert len(r.json()) == 3
+    assert "link" not in r.headers
+
+
+def test_cursor_page_keeps_filters_and_single_query(client, query_budget):
+    r = client.post("/api/v1/customers", json={"first_name": "Page", "last_name": "Owner"})
+    customer_id = r.json()["customer_id"]
+    for i in range(3):
+        r = client.post(
+            "/api/v1/properties",
+            json={"customer_id": customer_id, "label": f"Page P{i}", "address1": "1 Page St", "is_active": 1},
+        )
+        assert r.status_code == 201, r.text
+
+    r = client.get(f"/api/v1/properties?customer_id={customer_id}&limit=2")
+    assert r.status_code == 200, r.text
+    next_url = _next_link(r)
+    assert next_url is not None
+    assert f"customer_id={customer_id}" in next_url
+
+    with query_budget(1):
+        r2 = client.get(next_url)
+    assert r2.status_code == 200, r2.text
+    assert [p["customer_id"] for p in r2.json()] == [customer_id]
+    assert _next_link(r2) is None
+
+
+def test_page_size_above_cap_is_rejected(client):
+    r = client.get(f"/api/v1/invoices?limit={PAGE_SIZE_MAX + 1}")
+    assert r.status_code == 422
+
+
+def test_invalid_cursor_returns_400(client):
+    r = client.get("/api/v1/payments?cursor=not-a-cursor")
+    assert r.status_code == 400, r.text
+    assert r.json()["code"] == "INVALID_CURSOR"
+
+
+@pytest.mark.parametrize("values", [[[1, 2]], [{"a": 1}], [True], [1.5], [None], []])
+def test_cursor_with_non_scalar_values_returns_400(client, values):
+    r = client.get("/api/v1/customers", params={"cursor": encode_cursor(values)})
+    assert r.status_code == 400, r.text
+    assert r.json()["code"] == "INVALID_CURSOR"
@@ -166,4 +166,5 @@ def test_duplicate_reference_per_invoice_409(client):
     assert r2.status_code == 409
     body = r2.json()
     assert "code" in body and "message" in body and "timestamp" in body
+    assert body["message"] == "Duplicate payment reference for this invoice"
     assert _has_request_id_header(r2.headers)
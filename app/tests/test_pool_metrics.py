@@ -0,0 +1,40 @@
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import greenlet_spawn
+
+from app.db.pool_metrics import PoolMetrics, instrumented_pool_class
+
+
+class _Connection:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_concurrent_async_waiters_are_timed_separately():
+    metrics = PoolMetrics()
+    pool = instrumented_pool_class(AsyncAdaptedQueuePool, metrics)(
+        _Connection, pool_size=1, max_overflow=0, timeout=5
+    )
+    metrics.attach(pool)
+
+    async def hold(seconds):
+        conn = await greenlet_spawn(pool.connect)
+        await asyncio.sleep(seconds)
+        await greenlet_spawn(conn.close)
+
+    async def main():
+        await asyncio.gather(*(hold(0.05) for _ in range(3)))
+
+    asyncio.run(main())
+
+    stats = metrics.snapshot(SimpleNamespace(pool=pool))
+    assert stats["checkouts"] == stats["checkins"] == 3
+    # the waiters queue behind one connection: about 0, 50 and 100 ms
+    assert 80 <= stats["max_wait_ms"] < 1000
+    assert 30 <= stats["avg_wait_ms"] < stats["max_wait_ms"]
+    assert stats["max_checkout_ms"] >= stats["max_wait_ms"]
@@ -0,0 +1,50 @@
+import pytest
+
+
+def test_server_timing_header_reports_db_queries(client):
+    r = client.get("/api/v1/customers")
+    assert r.status_code == 200, r.text
+
+    server_timing = r.headers.get("server-timing")
+    assert server_timing is not None
+    assert server_timing.startswith("db;dur=")
+    assert "queries" in server_timing
+    assert "total;dur=" in server_timing
+
+
+def test_request_log_includes_db_breakdown(client, capsys):
+    client.get("/api/v1/auth/me")
+    capsys.readouterr()
+
+    r = client.get("/api/v1/customers")
+    assert r.status_code == 200, r.text
+
+    out = capsys.readouterr().out
+    assert '"db_queries": 1' in out
+    assert '"db_slowest_statement": "SELECT' in out
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/v1/customers",
+        "/api/v1/properties",
+        "/api/v1/invoices",
+        "/api/v1/payments",
+        "/api/v1/customers/1",
+    ],
+)
+def test_read_endpoints_stay_within_query_budget(client, query_budget, path):
+    client.get("/api/v1/auth/me")
+
+    with query_budget(1):
+        r = client.get(path)
+    assert r.status_code in (200, 404), r.text
+
+
+def test_query_budget_fails_when_exceeded(client, query_budget):
+    client.get("/api/v1/auth/me")
+
+    with pytest.raises(AssertionError, match="Query budget exceeded"):
+        with query_budget(0):
+            client.get("/api/v1/customers")
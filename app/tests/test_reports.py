@@ -0,0 +1,393 @@
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, text
+
+import app
+from app.api.v1.routers import reports as reports_router
+from app.models.models import DailyRevenue, ReceivableDue
+from app.repositories import reports as reports_repo
+from app.repositories import revenue as revenue_repo
+
+
+def _customer_with_property(client) -> tuple[int, int]:
+    r = client.post("/api/v1/customers", json={"first_name": "Report", "last_name": "Owner"})
+    customer_id = r.json()["customer_id"]
+    r = client.post(
+        "/api/v1/properties",
+        json={"customer_id": customer_id, "label": "Report Home", "address1": "1 Ledger St"},
+    )
+    return customer_id, r.json()["property_id"]
+
+
+def _invoice(client, customer_id: int, property_id: int, issued: str, total: str, **extra) -> int:
+    r = client.post(
+        "/api/v1/invoices",
+        json={
+            "customer_id": customer_id,
+            "property_id": property_id,
+            "period_start": issued,
+            "period_end": issued,
+            "issued_date": issued,
+            "subtotal": total,
+            "tax": "0.00",
+            "total": total,
+            **extra,
+        },
+    )
+    assert r.status_code == 201, r.text
+    return r.json()["invoice_id"]
+
+
+def _pay(client, invoice_id: int, amount: str, paid: str) -> int:
+    r = client.post("/api/v1/payments", json={"invoice_id": invoice_id, "amount": amount, "paid_date": paid})
+    assert r.status_code == 201, r.text
+    return r.json()["payment_id"]
+
+
+def test_statement_carries_opening_and_running_balance(client, query_budget):
+    customer_id, property_id = _customer_with_property(client)
+    old = _invoice(client, customer_id, property_id, "2025-12-15", "100.00")
+    _pay(client, old, "40.00", "2025-12-20")
+    jan = _invoice(client, customer_id, property_id, "2026-01-10", "80.00")
+    payment_id = _pay(client, old, "60.00", "2026-01-05")
+    _pay(client, jan, "30.00", "2026-01-10")
+    _invoice(client, customer_id, property_id, "2026-01-12", "500.00", status="void")
+    _invoice(client, customer_id, property_id, "2026-02-01", "999.00")
+
+    client.get("/api/v1/auth/me")
+    with query_budget(2):
+        r = client.get(
+            f"/api/v1/reports/customers/{customer_id}/statement",
+            params={"from": "2026-01-01", "to": "2026-01-31"},
+        )
+    assert r.status_code == 200, r.text
+    body = r.json()
+
+    assert body["opening_balance"] == "60.00"
+    assert body["invoiced"] == "80.00"
+    assert body["paid"] == "90.00"
+    assert body["closing_balance"] == "50.00"
+    assert [(i["kind"], i["entry_date"], i["amount"], i["balance"]) for i in body["items"]] == [
+        ("payment", "2026-01-05", "-60.00", "0.00"),
+        ("invoice", "2026-01-10", "80.00", "80.00"),
+        ("payment", "2026-01-10", "-30.00", "50.00"),
+    ]
+    assert body["items"][0]["payment_id"] == payment_id
+    assert body["items"][0]["invoice_id"] == old
+    assert body["items"][1]["status"] == "sent"
+
+
+def test_statement_without_activity_is_opening_balance_only(client):
+    customer_id, property_id = _customer_with_property(client)
+    _invoice(client, customer_id, property_id, "2025-06-01", "25.00")
+
+    r = client.get(
+        f"/api/v1/reports/customers/{customer_id}/statement",
+        params={"from": "2026-01-01", "to": "2026-01-31"},
+    )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert body["items"] == []
+    assert body["opening_balance"] == body["closing_balance"] == "25.00"
+
+
+def test_statement_validation(client):
+    r = client.get(
+        "/api/v1/reports/customers/999999/statement",
+        params={"from": "2026-01-01", "to": "2026-01-31"},
+    )
+    assert r.status_code == 404
+
+    r = client.get(
+        "/api/v1/reports/customers/1/statement",
+        params={"from": "2026-02-01", "to": "2026-01-01"},
+    )
+    assert r.status_code == 400
+
+
+def _aging_row(client, customer_id: int, **params) -> dict:
+    url = "/api/v1/reports/aging"
+    while url:
+        r = client.get(url, params=params)
+        assert r.status_code == 200, r.text
+        for row in r.json()["items"]:
+            if row["customer_id"] == customer_id:
+                return row
+        url, params = r.links.get("next", {}).get("url"), None
+    raise AssertionError(f"customer {customer_id} not in aging report")
+
+
+def test_aging_buckets_net_payments_as_of(client, query_budget):
+    customer_id, property_id = _customer_with_property(client)
+    _invoice(client, customer_id, property_id, "2026-04-01", "100.00", due_date="2026-04-20")
+    _invoice(client, customer_id, property_id, "2026-03-10", "50.00")
+    partly = _invoice(client, customer_id, property_id, "2026-01-01", "200.00", due_date="2026-01-15")
+    _pay(client, partly, "50.00", "2026-02-01")
+    paid = _invoice(client, customer_id, property_id, "2026-02-01", "70.00", due_date="2026-02-20")
+    _pay(client, paid, "70.00", "2026-03-01")
+    late = _invoice(client, customer_id, property_id, "2026-03-01", "40.00", due_date="2026-03-15")
+    _pay(client, late, "40.00", "2026-05-05")
+    _invoice(client, customer_id, property_id, "2026-05-01", "999.00")
+    _invoice(client, customer_id, property_id, "2026-04-01", "999.00", status="void")
+
+    client.get("/api/v1/auth/me")
+    with query_budget(2):
+        r = client.get("/api/v1/reports/aging", params={"as_of": "2026-04-30", "limit": 200})
+    assert r.status_code == 200, r.text
+
+    assert _aging_row(client, customer_id, as_of="2026-04-30", limit=200) == {
+        "customer_id": customer_id,
+        "days_0_30": "100.00",
+        "days_31_60": "90.00",
+        "days_61_90": "0.00",
+        "days_over_90": "150.00",
+        "total": "340.00",
+    }
+
+    row = _aging_row(client, customer_id, as_of="2026-05-31")
+    assert row["total"] == "1299.00"
+
+
+def test_aging_pages_and_totals_row(client):
+    customer_ids = []
+    for _ in range(3):
+        customer_id, property_id = _customer_with_property(client)
+        _invoice(client, customer_id, property_id, "2026-01-05", "10.00")
+        customer_ids.append(customer_id)
+
+    first = client.get("/api/v1/reports/aging", params={"as_of": "2026-03-01", "limit": 2})
+    assert first.status_code == 200, first.text
+    body = first.json()
+    assert len(body["items"]) == 2
+    assert body["items"][0]["customer_id"] > body["items"][1]["customer_id"]
+
+    items = list(body["items"])
+    url = first.links["next"]["url"]
+    while url:
+        page = client.get(url)
+        assert page.json()["totals"] is None
+        items += page.json()["items"]
+        url = page.links.get("next", {}).get("url")
+
+    assert set(customer_ids) <= {i["customer_id"] for i in items}
+    for bucket in ("days_0_30", "days_31_60", "days_61_90", "days_over_90", "total"):
+        assert float(body["totals"][bucket]) == pytest.approx(sum(float(i[bucket]) for i in items))
+
+
+def test_aging_skips_settled_customers_without_short_pages(client):
+    owing, property_id = _customer_with_property(client)
+    _invoice(client, owing, property_id, "2026-01-05", "25.00")
+    for _ in range(3):
+        customer_id, property_id = _customer_with_property(client)
+        invoice_id = _invoice(client, customer_id, property_id, "2026-01-05", "10.00")
+        _pay(client, invoice_id, "10.00", "2026-01-06")
+
+    r = client.get("/api/v1/reports/aging", params={"as_of": "2026-03-01", "limit": 1})
+    assert r.status_code == 200, r.text
+    assert [i["customer_id"] for i in r.json()["items"]] == [owing]
+
+
+def test_aging_totals_are_cached_across_page_sizes(client, query_budget):
+    customer_id, property_id = _customer_with_property(client)
+    _invoice(client, customer_id, property_id, "2026-01-05", "10.00")
+
+    first = client.get("/api/v1/reports/aging", params={"as_of": "2026-03-01", "limit": 2})
+    client.get("/api/v1/auth/me")
+    with query_budget(1):
+        r = client.get("/api/v1/reports/aging", params={"as_of": "2026-03-01", "limit": 3})
+    assert r.status_code == 200, r.text
+    assert r.json()["totals"] == first.json()["totals"]
+
+
+def test_aging_totals_follow_writes(client):
+    params = {"as_of": "2026-03-01", "limit": 1}
+    before = client.get("/api/v1/reports/aging", params=params).json()["totals"]
+
+    customer_id, property_id = _customer_with_property(client)
+    _invoice(client, customer_id, property_id, "2026-02-20", "12.50")
+    after = client.get("/api/v1/reports/aging", params=params).json()
+
+    assert after["items"][0]["customer_id"] == customer_id
+    assert float(after["totals"]["total"]) == pytest.approx(float(before["total"]) + 12.5)
+    assert float(after["totals"]["days_0_30"]) == pytest.approx(float(before["days_0_30"]) + 12.5)
+
+
+def test_aging_page_gives_up_after_max_rounds_with_a_cursor(client, monkeypatch):
+    owing, property_id = _customer_with_property(client)
+    _invoice(client, owing, property_id, "2026-01-05", "25.00")
+    for _ in range(2):
+        customer_id, property_id = _customer_with_property(client)
+        invoice_id = _invoice(client, customer_id, property_id, "2026-01-05", "10.00")
+        _pay(client, invoice_id, "10.00", "2026-01-06")
+    monkeypatch.setattr(reports_repo, "AGING_MAX_ROUNDS", 1)
+
+    r = client.get("/api/v1/reports/aging", params={"as_of": "2026-03-01", "limit": 1})
+    assert r.status_code == 200, r.text
+    assert r.json()["items"] == []
+
+    r = client.get(r.links["next"]["url"])
+    assert [i["customer_id"] for i in r.json()["items"]] == [owing]
+
+
+def test_aging_default_as_of_is_part_of_the_cache_key(client, monkeypatch):
+    class _Date(date):
+        today_value = date(2026, 3, 1)
+
+        @classmethod
+        def today(cls):
+            return cls.today_value
+
+    monkeypatch.setattr(reports_router, "date", _Date)
+    assert client.get("/api/v1/reports/aging").json()["as_of"] == "2026-03-01"
+
+    _Date.today_value = date(2026, 3, 2)
+    r = client.get("/api/v1/reports/aging")
+    assert r.headers["x-cache"] == "miss"
+    assert r.json()["as_of"] == "2026-03-02"
+
+
+def _receivables(db_session, from_date, to_date, source: bool = False) -> set:
+    if source:
+        stmt = revenue_repo.receivables_source_stmt(from_date, to_date)
+    else:
+        stmt = select(ReceivableDue.day, ReceivableDue.due_date, ReceivableDue.slot, ReceivableDue.amount).where(
+            ReceivableDue.day.between(from_date, to_date)
+        )
+    return {tuple(row) for row in db_session.execute(stmt).all() if row.amount != 0}
+
+
+def test_receivables_rollup_follows_writes_and_rebuilds(client, db_session):
+    customer_id, property_id = _customer_with_property(client)
+    due = _invoice(client, customer_id, property_id, "2034-05-02", "80.00", due_date="2034-05-20")
+    _pay(client, due, "30.00", "2034-05-10")
+    early = _invoice(client, customer_id, property_id, "2034-05-12", "40.00")
+    _pay(client, early, "40.00", "2034-05-01")
+    draft = _invoice(client, customer_id, property_id, "2034-05-15", "25.00", status="draft")
+    _pay(client, draft, "5.00", "2034-05-16")
+
+    span = (date(2034, 5, 1), date(2034, 5, 31))
+    expected = _receivables(db_session, *span, source=True)
+    assert _receivables(db_session, *span) == expected
+    assert sum(row[3] for row in expected) == 70
+    # paid before it was issued: the payment counts from the invoice's issued_date
+    assert date(2034, 5, 1) not in {row[0] for row in expected}
+
+    db_session.execute(text("UPDATE receivables_due SET amount = 1 WHERE day = '2034-05-02'"))
+    assert _receivables(db_session, *span) != expected
+    revenue_repo.rebuild_receivables(db_session, *span)
+    assert _receivables(db_session, *span) == expected
+
+    db_session.execute(text("DELETE FROM receivables_due"))
+    init_sql = Path(app.__file__).resolve().parent.parent / "sql" / "init" / "04_receivables_due.sql"
+    db_session.execute(text(init_sql.read_text()))
+    assert _receivables(db_session, *span) == expected
+
+
+def test_aging_rejects_foreign_cursor(client):
+    r = client.get("/api/v1/reports/aging", params={"cursor": "WyJ4IiwxXQ"})
+    assert r.status_code == 400
+    assert r.json()["code"] == "INVALID_CURSOR"
+
+
+def _rollup(db_session, from_date, to_date, source: bool = False) -> set:
+    if source:
+        stmt = revenue_repo.source_stmt(from_date, to_date)
+    else:
+        stmt = select(DailyRevenue).where(DailyRevenue.day.between(from_date, to_date))
+        stmt = stmt.with_only_columns(
+            *(getattr(DailyRevenue, c) for c in (*revenue_repo.KEY, *revenue_repo.MEASURES))
+        )
+    return {tuple(row) for row in db_session.execute(stmt).all()}
+
+
+def test_revenue_rollup_follows_writes(client, db_session, query_budget):
+    customer_id, property_id = _customer_with_property(client)
+    first = _invoice(client, customer_id, property_id, "2031-01-10", "100.00")
+    _invoice(client, customer_id, property_id, "2031-01-10", "50.00")
+    draft = _invoice(client, customer_id, property_id, "2031-01-20", "30.00", status="draft")
+    _invoice(client, customer_id, property_id, "2031-02-01", "999.00", status="void")
+    _pay(client, first, "100.00", "2031-02-03")
+    _pay(client, draft, "10.00", "2031-01-20")
+
+    client.get("/api/v1/auth/me")
+    with query_budget(1):
+        r = client.get(
+            "/api/v1/reports/revenue",
+            params={"from": "2031-01-01", "to": "2031-02-28", "customer_id": customer_id},
+        )
+    assert r.status_code == 200, r.text
+    body = r.json()
+    assert [(i["period"], i["invoiced_total"], i["invoice_count"], i["collected_total"]) for i in body["items"]] == [
+        ("2031-01-10", "150.00", 2, "0.00"),
+        ("2031-01-20", "30.00", 1, "10.00"),
+        ("2031-02-03", "0.00", 0, "100.00"),
+    ]
+    assert body["totals"] == {
+        "invoiced_total": "180.00",
+        "invoice_count": 3,
+        "collected_total": "110.00",
+        "payment_count": 2,
+    }
+
+    r = client.get(
+        "/api/v1/reports/revenue",
+        params={"from": "2031-01-01", "to": "2031-02-28", "property_id": property_id, "granularity": "month"},
+    )
+    assert [(i["period"], i["invoiced_total"], i["collected_total"]) for i in r.json()["items"]] == [
+        ("2031-01-01", "180.00", "10.00"),
+        ("2031-02-01", "0.00", "100.00"),
+    ]
+
+    span = (date(2031, 1, 1), date(2031, 2, 28))
+    assert _rollup(db_session, *span) == _rollup(db_session, *span, source=True)
+
+
+def test_revenue_rebuild_repairs_drift(client, db_session):
+    customer_id, property_id = _customer_with_property(client)
+    invoice_id = _invoice(client, customer_id, property_id, "2032-03-05", "75.00")
+    _pay(client, invoice_id, "25.00", "2032-03-09")
+
+    span = (date(2032, 3, 1), date(2032, 3, 31))
+    expected = _rollup(db_session, *span, source=True)
+    db_session.execute(text("UPDATE daily_revenue SET invoiced_total = 1 WHERE day = '2032-03-05'"))
+    db_session.execute(text("DELETE FROM daily_revenue WHERE day = '2032-03-09'"))
+    db_session.execute(
+        text(
+            "INSERT INTO daily_revenue (day, customer_id, property_id, invoiced_total, invoice_count,"
+            " collected_total, payment_count) VALUES ('2032-03-20', :c, :p, 5, 1, 0, 0)"
+        ),
+        {"c": customer_id, "p": property_id},
+    )
+    assert _rollup(db_session, *span) != expected
+
+    revenue_repo.rebuild(db_session, *span)
+    assert _rollup(db_session, *span) == expected
+
+
+def test_init_sql_rolls_up_existing_rows(client, db_session):
+    customer_id, property_id = _customer_with_property(client)
+    invoice_id = _invoice(client, customer_id, property_id, "2033-04-02", "60.00")
+    _pay(client, invoice_id, "20.00", "2033-04-08")
+    draft = _invoice(client, customer_id, property_id, "2033-04-03", "15.00", status="draft")
+    _pay(client, draft, "5.00", "2033-04-09")
+
+    span = (date(2033, 4, 1), date(2033, 4, 30))
+    expected = _rollup(db_session, *span, source=True)
+    db_session.execute(text("DELETE FROM daily_revenue"))
+
+    init_sql = Path(app.__file__).resolve().parent.parent / "sql" / "init" / "03_daily_revenue.sql"
+    db_session.execute(text(init_sql.read_text()))
+    assert _rollup(db_session, *span) == expected
+
+
+def test_revenue_validation(client):
+    r = client.get("/api/v1/reports/revenue", params={"from": "2031-02-01", "to": "2031-01-01"})
+    assert r.status_code == 400
+
+    r = client.get(
+        "/api/v1/reports/revenue",
+        params={"from": "2031-01-01", "to": "2031-01-31", "granularity": "week"},
+    )
+    assert r.status_code == 422
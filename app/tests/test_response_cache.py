@@ -0,0 +1,92 @@
+from sqlalchemy import text
+
+from app.core.response_cache import response_cache
+
+
+def _create_customer(client, last_name: str) -> int:
+    r = client.post("/api/v1/customers", json={"first_name": "Cache", "last_name": last_name})
+    assert r.status_code == 201, r.text
+    return r.json()["customer_id"]
+
+
+def test_repeat_list_served_from_cache_without_queries(client, query_budget):
+    _create_customer(client, "One")
+    hits = response_cache.stats()["hits"]
+
+    first = client.get("/api/v1/customers?limit=5")
+    assert first.status_code == 200, first.text
+    assert first.headers["x-cache"] == "miss"
+
+    with query_budget(0):
+        second = client.get("/api/v1/customers?limit=5")
+    assert second.headers["x-cache"] == "hit"
+    assert second.content == first.content
+    assert second.headers.get("link") == first.headers.get("link")
+
+    stats = response_cache.stats()
+    assert stats["hits"] == hits + 1
+    assert stats["hit_rate"] > 0
+
+
+def test_query_normalization_shares_entry(client):
+    client.get("/api/v1/invoices?status=sent&limit=5")
+    r = client.get("/api/v1/invoices?limit=5&status=sent")
+    assert r.headers["x-cache"] == "hit"
+
+
+def test_writes_invalidate_resource(client, db_session):
+    customer_id = _create_customer(client, "Before")
+    url = "/api/v1/customers?limit=5"
+    client.get(url)
+
+    # direct SQL does not bump the version, so the cached page is still served
+    db_session.execute(
+        text("UPDATE customers SET last_name = 'Sneaky' WHERE customer_id = :id"), {"id": customer_id}
+    )
+    assert client.get(url).headers["x-cache"] == "hit"
+
+    r = client.patch(f"/api/v1/customers/{customer_id}", json={"last_name": "After"})
+    assert r.status_code == 200, r.text
+
+    r = client.get(url)
+    assert r.headers["x-cache"] == "miss"
+    assert {c["customer_id"]: c["last_name"] for c in r.json()}[customer_id] == "After"
+
+
+def test_payment_bumps_invoices_when_status_changes(client):
+    customer_id = _create_customer(client, "Payer")
+    r = client.post(
+        "/api/v1/properties",
+        json={"customer_id": customer_id, "label": "Cache Home", "address1": "1 Cache St"},
+    )
+    property_id = r.json()["property_id"]
+    r = client.post(
+        "/api/v1/invoices",
+        json={
+            "customer_id": customer_id,
+            "property_id": property_id,
+            "period_start": "2026-01-01",
+            "period_end": "2026-01-31",
+            "issued_date": "2026-01-31",
+            "subtotal": 10.00,
+            "tax": 0.00,
+            "total": 10.00,
+        },
+    )
+    invoice_id = r.json()["invoice_id"]
+
+    url = f"/api/v1/invoices?customer_id={customer_id}"
+    assert client.get(url).json()[0]["status"] == "sent"
+
+    r = client.post("/api/v1/payments", json={"invoice_id": invoice_id, "amount": 10.00})
+    assert r.status_code == 201, r.text
+
+    r = client.get(url)
+    assert r.headers["x-cache"] == "miss"
+    assert r.json()[0]["status"] == "paid"
+
+
+def test_cache_metrics_exposed(client):
+    r = client.get("/api/v1/admin/metrics/cache")
+    assert r.status_code == 200, r.text
+    assert {"hits", "misses", "hit_rate", "bytes"} <= set(r.json()["response_cache"])
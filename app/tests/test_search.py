@@ -0,0 +1,99 @@
+import uuid
+
+from sqlalchemy import text
+
+from app.repositories import search as search_repo
+
+
+def _token() -> str:
+    return "zq" + uuid.uuid4().hex[:6]
+
+
+def _create_customer(client, first_name: str, last_name: str) -> int:
+    r = client.post("/api/v1/customers", json={"first_name": first_name, "last_name": last_name})
+    assert r.status_code == 201, r.text
+    return r.json()["customer_id"]
+
+
+def _create_property(client, customer_id: int, **overrides) -> int:
+    payload = {"customer_id": customer_id, "label": "Home", "address1": "1 Main St", **overrides}
+    r = client.post("/api/v1/properties", json=payload)
+    assert r.status_code == 201, r.text
+    return r.json()["property_id"]
+
+
+def test_customer_search_ranks_closest_match_first(client):
+    name = _token()
+    exact = _create_customer(client, "Search", name)
+    partial = _create_customer(client, "Search", name[:6] + "xx")
+    _create_customer(client, "Search", "Unrelated")
+
+    r = client.get(f"/api/v1/customers?q={name}")
+    assert r.status_code == 200, r.text
+    ids = [c["customer_id"] for c in r.json()]
+    assert ids == [exact, partial]
+    assert set(r.json()[0]) == {"customer_id", "first_name", "last_name"}
+
+
+def test_customer_search_follows_writes(client):
+    old, new = _token(), _token()
+    customer_id = _create_customer(client, "Search", old)
+
+    r = client.patch(f"/api/v1/customers/{customer_id}", json={"last_name": new})
+    assert r.status_code == 200, r.text
+    assert client.get(f"/api/v1/customers?q={old}").json() == []
+    assert [c["customer_id"] for c in client.get(f"/api/v1/customers?q={new}").json()] == [customer_id]
+
+    r = client.delete(f"/api/v1/customers/{customer_id}")
+    assert r.status_code == 204, r.text
+    assert client.get(f"/api/v1/customers?q={new}").json() == []
+
+
+def test_property_search_by_city_with_pagination_and_filters(client):
+    city = _token()
+    customer_id = _create_customer(client, "Search", "Owner")
+    other_id = _create_customer(client, "Search", "Other")
+    ids = [_create_property(client, customer_id, city=city) for _ in range(3)]
+    _create_property(client, other_id, city=city)
+
+    r = client.get(f"/api/v1/properties?q={city}&customer_id={customer_id}&limit=2&include_total=true")
+    assert r.status_code == 200, r.text
+    assert r.headers["x-total-count"] == "3"
+    first = [p["property_id"] for p in r.json()]
+
+    r2 = client.get(r.headers["link"].split(">")[0].lstrip("<"))
+    assert r2.status_code == 200, r2.text
+    assert "link" not in r2.headers
+    assert sorted(first + [p["property_id"] for p in r2.json()]) == sorted(ids)
+
+
+def test_search_single_query_and_validation(client, query_budget):
+    client.get("/api/v1/customers?limit=1")
+    with query_budget(1):
+        r = client.get("/api/v1/customers?q=smith&fields=last_name")
+    assert r.status_code == 200, r.text
+
+    assert client.get("/api/v1/customers?q=a").status_code == 422
+    r = client.get("/api/v1/properties?q=--")
+    assert r.status_code == 400, r.text
+    assert r.json()["code"] == "INVALID_SEARCH"
+
+
+def test_rows_loaded_outside_the_api_are_indexed_when_grams_are_missing(client, db_session):
+    name = _token()
+    db_session.execute(text("DELETE FROM search_grams WHERE entity = 'customers'"))
+    db_session.execute(
+        text(
+            "INSERT INTO customers (first_name, last_name, created_at, updated_at)"
+            " VALUES ('Seeded', :name, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+        ),
+        {"name": name},
+    )
+    assert "customers" in search_repo.unindexed_entities(db_session)
+
+    for entity in search_repo.unindexed_entities(db_session):
+        search_repo.rebuild(db_session, entity)
+
+    assert search_repo.unindexed_entities(db_session) == []
+    r = client.get(f"/api/v1/customers?q={name}")
+    assert [c["last_name"] for c in r.json()] == [name]
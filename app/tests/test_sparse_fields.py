@@ -0,0 +1,52 @@
+def test_list_returns_only_requested_fields_plus_key(client):
+    r = client.post("/api/v1/customers", json={"first_name": "Sparse", "last_name": "List"})
+    assert r.status_code == 201, r.text
+
+    r = client.get("/api/v1/customers?fields=last_name")
+    assert r.status_code == 200, r.text
+    assert r.json()
+    assert all(set(c) == {"customer_id", "last_name"} for c in r.json())
+
+
+def test_sparse_list_selects_only_requested_columns(client, query_budget):
+    client.get("/api/v1/invoices?limit=1")
+
+    with query_budget(1) as stats:
+        r = client.get("/api/v1/invoices?fields=status,total")
+    assert r.status_code == 200, r.text
+
+    sql = stats.statements[0].lower()
+    assert "invoices.status" in sql and "invoices.total" in sql
+    assert "invoices.period_start" not in sql
+
+
+def test_sparse_list_keeps_pagination_and_total_headers(client):
+    for i in range(3):
+        client.post("/api/v1/customers", json={"first_name": "Sparse", "last_name": f"P{i}"})
+
+    r = client.get("/api/v1/customers?fields=first_name&limit=2&include_total=true")
+    assert r.status_code == 200, r.text
+    assert len(r.json()) == 2
+    assert 'rel="next"' in r.headers["link"]
+    assert "fields=first_name" in r.headers["link"]
+    assert int(r.headers["x-total-count"]) >= 3
+
+
+def test_detail_with_fields(client):
+    r = client.post("/api/v1/customers", json={"first_name": "Sparse", "last_name": "Detail"})
+    customer_id = r.json()["customer_id"]
+
+    r = client.get(f"/api/v1/customers/{customer_id}?fields=first_name")
+    assert r.status_code == 200, r.text
+    assert r.json() == {"customer_id": customer_id, "first_name": "Sparse"}
+
+    r = client.get("/api/v1/customers/9999?fields=first_name")
+    assert r.status_code == 404
+
+
+def test_unknown_field_returns_400(client):
+    r = client.get("/api/v1/properties?fields=label,password")
+    assert r.status_code == 400, r.text
+    body = r.json()
+    assert body["code"] == "INVALID_FIELDS"
+    assert body["details"]["unknown"] == ["password"]
@@ -0,0 +1,45 @@
+from app.db.counts import count_cache
+
+
+def test_total_count_is_opt_in(client):
+    r = client.get("/api/v1/customers")
+    assert r.status_code == 200, r.text
+    assert "x-total-count" not in r.headers
+
+
+def test_total_count_matches_filtered_rows_and_is_cached(client, query_budget):
+    r = client.post("/api/v1/customers", json={"first_name": "Count", "last_name": "Owner"})
+    customer_id = r.json()["customer_id"]
+    for i in range(3):
+        r = client.post(
+            "/api/v1/properties",
+            json={"customer_id": customer_id, "label": f"Count P{i}", "address1": "1 Count St", "is_active": 1},
+        )
+        assert r.status_code == 201, r.text
+
+    r = client.get(f"/api/v1/properties?customer_id={customer_id}&limit=2&include_total=true")
+    assert r.status_code == 200, r.text
+    assert r.headers["x-total-count"] == "3"
+    assert r.headers["x-total-count-type"] == "exact"
+    assert len(r.json()) == 2
+
+    hits_before = count_cache.stats()["hits"]
+    with query_budget(1):
+        r2 = client.get(f"/api/v1/properties?customer_id={customer_id}&include_total=true")
+    assert r2.headers["x-total-count"] == "3"
+    assert count_cache.stats()["hits"] == hits_before + 1
+
+
+def test_total_count_for_invoice_filters(client):
+    r = client.get("/api/v1/invoices?status=void&customer_id=9999&include_total=true")
+    assert r.status_code == 200, r.text
+    assert r.headers["x-total-count"] == "0"
+    assert r.headers["x-total-count-type"] == "exact"
+
+
+def test_cache_metrics_for_admin(client):
+    client.get("/api/v1/payments?include_total=true")
+
+    r = client.get("/api/v1/admin/metrics/cache")
+    assert r.status_code == 200, r.text
+    assert r.json()["count_cache"]["exact_counts"] >= 1
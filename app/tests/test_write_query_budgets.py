@@ -0,0 +1,143 @@
+import uuid
+
+
+def _ref(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:12]}"
+
+
+def _property_payload(customer_id: int) -> dict:
+    return {
+        "customer_id": customer_id,
+        "label": "Budget Property",
+        "address1": "1 Budget St",
+        "city": "Rincon",
+        "state": "PR",
+        "postal_code": "00677",
+        "is_active": 1,
+    }
+
+
+def _invoice_payload(customer_id: int, property_id: int, total: float = 30.00) -> dict:
+    return {
+        "customer_id": customer_id,
+        "property_id": property_id,
+        "period_start": "2026-01-01",
+        "period_end": "2026-01-31",
+        "issued_date": "2026-01-31",
+        "due_date": "2026-02-10",
+        "subtotal": total - 3.00,
+        "tax": 3.00,
+        "total": total,
+        "status": "sent",
+    }
+
+
+def _create_customer(client) -> int:
+    r = client.post("/api/v1/customers", json={"first_name": "Budget", "last_name": _ref("C")})
+    assert r.status_code == 201, r.text
+    return r.json()["customer_id"]
+
+
+def _create_property(client, customer_id: int) -> int:
+    r = client.post("/api/v1/properties", json=_property_payload(customer_id))
+    assert r.status_code == 201, r.text
+    return r.json()["property_id"]
+
+
+def _create_invoice(client, total: float = 30.00) -> int:
+    customer_id = _create_customer(client)
+    property_id = _create_property(client, customer_id)
+    r = client.post("/api/v1/invoices", json=_invoice_payload(customer_id, property_id, total))
+    assert r.status_code == 201, r.text
+    return r.json()["invoice_id"]
+
+
+def test_customer_writes_query_budget(client, query_budget):
+    client.get("/api/v1/auth/me")
+
+    with query_budget(2):
+        r = client.post("/api/v1/customers", json={"first_name": "Budget", "last_name": "Create"})
+    assert r.status_code == 201, r.text
+    customer_id = r.json()["customer_id"]
+
+    with query_budget(3):
+        r = client.put(
+            f"/api/v1/customers/{customer_id}",
+            json={"first_name": "Budget", "last_name": "Replaced"},
+        )
+    assert r.status_code == 200, r.text
+    assert r.json()["last_name"] == "Replaced"
+
+    with query_budget(4):
+        r = client.patch(f"/api/v1/customers/{customer_id}", json={"first_name": "Patched"})
+    assert r.status_code == 200, r.text
+    assert r.json() == {"customer_id": customer_id, "first_name": "Patched", "last_name": "Replaced"}
+
+
+def test_replace_missing_customer_404(client):
+    r = client.put("/api/v1/customers/9999", json={"first_name": "No", "last_name": "One"})
+    assert r.status_code == 404, r.text
+
+
+def test_property_writes_query_budget(client, query_budget):
+    customer_id = _create_customer(client)
+
+    with query_budget(2):
+        r = client.post("/api/v1/properties", json=_property_payload(customer_id))
+    assert r.status_code == 201, r.text
+    property_id = r.json()["property_id"]
+
+    with query_budget(3):
+        r = client.put(
+            f"/api/v1/properties/{property_id}",
+            json={**_property_payload(customer_id), "label": "Replaced"},
+        )
+    assert r.status_code == 200, r.text
+    assert r.json()["label"] == "Replaced"
+
+    with query_budget(4):
+        r = client.patch(f"/api/v1/properties/{property_id}", json={"city": "Aguada"})
+    assert r.status_code == 200, r.text
+    assert r.json()["label"] == "Replaced"
+    assert r.json()["city"] == "Aguada"
+
+    with query_budget(2):
+        r = client.patch(f"/api/v1/properties/{property_id}", json={"is_active": 0})
+    assert r.status_code == 200, r.text
+
+
+def test_create_property_for_missing_customer_404(client):
+    r = client.post("/api/v1/properties", json=_property_payload(9999))
+    assert r.status_code == 404, r.text
+    assert r.json()["message"] == "Customer not found"
+
+
+def test_create_invoice_query_budget(client, query_budget):
+    customer_id = _create_customer(client)
+    property_id = _create_property(client, customer_id)
+
+    with query_budget(4):
+        r = client.post("/api/v1/invoices", json=_invoice_payload(customer_id, property_id))
+    assert r.status_code == 201, r.text
+
+    body = r.json()
+    assert body["total"] == "30.00"
+    assert client.get(f"/api/v1/invoices/{body['invoice_id']}").json() == body
+
+
+def test_create_payment_query_budget(client, query_budget):
+    invoice_id = _create_invoice(client, total=30.00)
+
+    with query_budget(4):
+        r = client.post(
+            "/api/v1/payments",
+            json={"invoice_id": invoice_id, "amount": 10.00, "reference": _ref("P")},
+        )
+    assert r.status_code == 201, r.text
+    assert r.json()["amount"] == "10.00"
+
+    with query_budget(5):
+        r = client.post("/api/v1/payments", json={"invoice_id": invoice_id, "amount": 20.00})
+    assert r.status_code == 201, r.text
+
+    assert client.get(f"/api/v1/invoices/{invoice_id}").json()["status"] == "paid"
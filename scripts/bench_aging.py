@@ -0,0 +1,123 @@
+"""Latency of the receivables aging report on a seeded invoice/payment set.
+
+Seeds --invoices invoices spread over --customers customers, with roughly half
+of them fully paid and a quarter partly paid, then times the first and a
+middle page of app.repositories.reports.aging_stmt and the totals row
+(aging_totals_stmt, read from the receivables_due rollup filled after seeding).
+
+On SQLite the tables are created and seeded in the target database. Against
+MySQL, point --url at a scratch database that already has the schema loaded;
+rows are inserted with a recursive CTE and left in place.
+
+    docker compose exec api python -m scripts.bench_aging --invoices 1000000
+    python -m scripts.bench_aging --url sqlite:////tmp/aging.db --invoices 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.models.models import Base, Invoice, Payment, ReceivableDue
+from app.repositories import revenue as revenue_repo
+from app.repositories.reports import aging_stmt, aging_totals_stmt
+
+SEED = """
+INSERT INTO invoices (customer_id, property_id, period_start, period_end, status, issued_date,
+                      due_date, subtotal, tax, total, created_at, updated_at)
+WITH RECURSIVE seq (n) AS (SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < :count - 1)
+SELECT n % :customers + 1, 1, '2024-01-01', '2024-01-31',
+       CASE WHEN n % 2 = 0 THEN 'paid' ELSE 'sent' END,
+       :start, :start, 100.00, 0.00, 100.00, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+FROM seq
+"""
+
+SEED_PAYMENTS = """
+INSERT INTO payments (invoice_id, paid_date, amount, created_at)
+SELECT invoice_id, issued_date, CASE WHEN status = 'paid' THEN total ELSE 40.00 END, CURRENT_TIMESTAMP
+FROM invoices
+WHERE status = 'paid' OR invoice_id % 4 = 1
+"""
+
+SPREAD_DATES = {
+    "sqlite": "UPDATE invoices SET issued_date = date(:start, '+' || (invoice_id % 900) || ' days'), "
+    "due_date = date(:start, '+' || (invoice_id % 900 + 15) || ' days')",
+    "mysql": "UPDATE invoices SET issued_date = :start + INTERVAL (invoice_id % 900) DAY, "
+    "due_date = :start + INTERVAL (invoice_id % 900 + 15) DAY",
+}
+
+# the aging indexes from sql/init/01_schema.sql; create_all only knows the models
+SQLITE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_invoices_customer_issued"
+    " ON invoices(customer_id, issued_date, status, total, due_date)",
+    "CREATE INDEX IF NOT EXISTS idx_payments_invoice ON payments(invoice_id, payment_id, amount, paid_date)",
+)
+
+
+def _seed(db: Session, invoices: int, customers: int) -> None:
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        db.execute(text("SET SESSION cte_max_recursion_depth = :n"), {"n": invoices + 1})
+    start = date(2024, 1, 1)
+    db.execute(text(SEED), {"count": invoices, "customers": customers, "start": start})
+    db.execute(text(SPREAD_DATES[dialect]), {"start": start})
+    db.execute(text(SEED_PAYMENTS))
+    revenue_repo.rebuild_receivables(db, *revenue_repo.source_span(db))
+    db.commit()
+
+
+def _time(db: Session, stmt, runs: int) -> tuple[float, int]:
+    timings = []
+    rows = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        rows = len(db.execute(stmt).all())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="defaults to DATABASE_URL")
+    parser.add_argument("--invoices", type=int, default=100_000)
+    parser.add_argument("--customers", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date(2026, 6, 30))
+    args = parser.parse_args()
+
+    if args.url is None:
+        from app.db.session import DATABASE_URL
+
+        args.url = DATABASE_URL
+
+    engine = create_engine(args.url)
+    with Session(engine) as db:
+        if args.url.startswith("sqlite"):
+            tables = [Invoice.__table__, Payment.__table__, ReceivableDue.__table__]
+            Base.metadata.create_all(engine, tables=tables)
+            for ddl in SQLITE_INDEXES:
+                db.execute(text(ddl))
+
+        start = time.perf_counter()
+        _seed(db, args.invoices, args.customers)
+        print(f"seeded {args.invoices:,} invoices in {time.perf_counter() - start:.1f}s")
+
+        shapes = {
+            "first page": aging_stmt(args.as_of, args.limit + 1),
+            "middle page": aging_stmt(args.as_of, args.limit + 1, after_customer_id=args.customers // 2),
+            "totals": aging_totals_stmt(args.as_of),
+        }
+        for name, stmt in shapes.items():
+            ms, rows = _time(db, stmt, args.runs)
+            print(f"{name:24s} {ms:10.1f} ms  ({rows} rows)")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
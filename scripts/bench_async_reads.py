@@ -0,0 +1,97 @@
+"""Sync Session-in-threadpool vs AsyncSession for the same read query.
+
+Each simulated request waits on the database for --db-wait-ms (SELECT SLEEP)
+and then reads one customers page, so the run is dominated by DB wait as
+in production. Sync requests are capped by the request threadpool size,
+async requests only by the connection pool.
+
+    docker compose exec api python -m scripts.bench_async_reads --requests 400 --concurrency 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from anyio import CapacityLimiter, to_thread
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+
+from app.db.session import ASYNC_DATABASE_URL, DATABASE_URL
+from app.models.models import Customer
+
+
+def _stmt():
+    return select(Customer).order_by(Customer.customer_id.desc()).limit(50)
+
+
+def _report(label: str, latencies: list[float], elapsed: float) -> None:
+    ordered = sorted(latencies)
+    p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+    print(
+        f"{label:6s} {len(ordered) / elapsed:8.1f} req/s  "
+        f"p50={statistics.median(ordered):7.1f}ms  p95={p95:7.1f}ms"
+    )
+
+
+async def run_sync(args) -> None:
+    engine = create_engine(DATABASE_URL, pool_size=args.pool_size, max_overflow=0, pool_pre_ping=True)
+    limiter = CapacityLimiter(args.threads)
+    latencies: list[float] = []
+    gate = asyncio.Semaphore(args.concurrency)
+    sleep_sql = text("SELECT SLEEP(:s)")
+
+    def handler() -> None:
+        with Session(engine) as db:
+            db.execute(sleep_sql, {"s": args.db_wait_ms / 1000})
+            db.execute(_stmt()).scalars().all()
+
+    async def one() -> None:
+        async with gate:
+            start = time.perf_counter()
+            await to_thread.run_sync(handler, limiter=limiter)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    _report("sync", latencies, time.perf_counter() - start)
+    engine.dispose()
+
+
+async def run_async(args) -> None:
+    engine = create_async_engine(ASYNC_DATABASE_URL, pool_size=args.pool_size, max_overflow=0, pool_pre_ping=True)
+    latencies: list[float] = []
+    gate = asyncio.Semaphore(args.concurrency)
+    sleep_sql = text("SELECT SLEEP(:s)")
+
+    async def one() -> None:
+        async with gate:
+            start = time.perf_counter()
+            async with engine.connect() as conn:
+                await conn.execute(sleep_sql, {"s": args.db_wait_ms / 1000})
+                (await conn.execute(_stmt())).all()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    _report("async", latencies, time.perf_counter() - start)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=40, help="request threadpool size (anyio default)")
+    parser.add_argument("--pool-size", type=int, default=100)
+    parser.add_argument("--db-wait-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    asyncio.run(run_sync(args))
+    asyncio.run(run_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""CPU cost versus bytes saved when compressing typical API responses.
+
+Encodes an invoice list page, a bulk invoice list and openapi.json with each
+available encoder and reports compressed size, per-response CPU, and CPU per
+KB saved. A response-cache hit or openapi.json request reuses the stored
+variant, so its per-request cost is the "reuse" row.
+
+    docker compose exec api python -m scripts.bench_compression
+    python -m scripts.bench_compression --iterations 200
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+
+from app.core import compression
+from app.core.fields import render_rows
+from app.schemas.schemas import InvoiceOut
+
+COLUMNS = tuple(InvoiceOut.model_fields)
+InvoiceRow = namedtuple("InvoiceRow", COLUMNS)
+
+
+def _invoice_rows(count: int) -> list:
+    created = datetime(2026, 1, 31, 12, 0, 0)
+    return [
+        InvoiceRow(
+            invoice_id=100000 - i,
+            customer_id=1 + i % 300,
+            property_id=1 + i % 600,
+            period_start=date(2026, 1, 1),
+            period_end=date(2026, 1, 31),
+            status=("sent", "paid", "draft", "void")[i % 4],
+            issued_date=date(2026, 1, 31) - timedelta(days=i % 28),
+            due_date=date(2026, 2, 10),
+            subtotal=Decimal("100.00") + i % 50,
+            tax=Decimal("11.50"),
+            total=Decimal("111.50") + i % 50,
+            notes=None if i % 3 else "Monthly pool service",
+            created_at=created,
+            updated_at=created,
+        )
+        for i in range(count)
+    ]
+
+
+def _encoders() -> list[tuple[str, object]]:
+    encoders = [(f"gzip-{level}", lambda b, level=level: gzip.compress(b, compresslevel=level, mtime=0)) for level in (1, 6, 9)]
+    if compression.brotli is not None:
+        encoders += [(f"br-{q}", lambda b, q=q: compression.brotli.compress(b, quality=q)) for q in (4, 5, 11)]
+    return encoders
+
+
+def _cpu_us(fn, body: bytes, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(body)
+    return (time.process_time() - start) / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--page-rows", type=int, default=50)
+    parser.add_argument("--bulk-rows", type=int, default=200)
+    args = parser.parse_args()
+
+    from app.api.app import app
+
+    payloads = {
+        f"invoices x{args.page_rows}": render_rows(InvoiceOut, COLUMNS, _invoice_rows(args.page_rows)),
+        f"invoices x{args.bulk_rows}": render_rows(InvoiceOut, COLUMNS, _invoice_rows(args.bulk_rows)),
+        "openapi.json": JSONResponse(app.openapi()).body,
+    }
+
+    print(f"{'payload':18s} {'encoder':8s} {'bytes':>9s} {'ratio':>6s} {'cpu us':>9s} {'us/KB saved':>12s}")
+    for name, body in payloads.items():
+        print(f"{name:18s} {'identity':8s} {len(body):9d}")
+        for label, fn in _encoders():
+            out = fn(body)
+            cpu = _cpu_us(fn, body, args.iterations)
+            saved_kb = (len(body) - len(out)) / 1024
+            print(
+                f"{'':18s} {label:8s} {len(out):9d} {len(body) / len(out):6.1f} "
+                f"{cpu:9.1f} {cpu / saved_kb if saved_kb > 0 else float('inf'):12.2f}"
+            )
+
+        payload = compression.Precompressed(body)
+        payload.encode("gzip")
+        reuse = _cpu_us(lambda _: payload.encode("gzip"), body, args.iterations)
+        print(f"{'':18s} {'reuse':8s} {'':>9s} {'':>6s} {reuse:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
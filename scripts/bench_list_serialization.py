@@ -0,0 +1,110 @@
+"""Rows/sec of the list read path: ORM + response model vs Core rows to bytes.
+
+`orm` is what list endpoints used to do: hydrate Invoice entities, validate each
+into InvoiceOut via from_attributes, dump to JSON-able dicts and json.dumps
+them. `core` is the current path: select the InvoiceOut columns and encode the
+rows with app.core.fields.render_rows. Both run the same query on the same
+connection, so the difference is hydration plus serialization.
+
+    docker compose exec api python -m scripts.bench_list_serialization
+    python -m scripts.bench_list_serialization --url sqlite:// --bulk-rows 5000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import date
+from decimal import Decimal
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.core.fields import columns_for, render_rows
+from app.models.models import Base, Invoice
+from app.schemas.schemas import InvoiceOut
+
+COLUMNS = tuple(InvoiceOut.model_fields)
+ORM_ADAPTER = TypeAdapter(list[InvoiceOut])
+
+
+def _orm_bytes(db: Session, limit: int) -> bytes:
+    rows = db.execute(select(Invoice).order_by(Invoice.invoice_id.desc()).limit(limit)).scalars().all()
+    items = ORM_ADAPTER.validate_python(rows, from_attributes=True)
+    body = json.dumps(ORM_ADAPTER.dump_python(items, mode="json"), separators=(",", ":")).encode()
+    db.expunge_all()
+    return body
+
+
+def _core_bytes(db: Session, limit: int) -> bytes:
+    stmt = select(*columns_for(Invoice, COLUMNS)).order_by(Invoice.invoice_id.desc()).limit(limit)
+    return render_rows(InvoiceOut, COLUMNS, db.execute(stmt).all())
+
+
+def _measure(label: str, fn, db: Session, limit: int, seconds: float) -> float:
+    fn(db, limit)
+
+    rows = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(db, limit)
+        rows += limit
+    rate = rows / (time.perf_counter() - start)
+
+    print(f"{label:24s} {rate:12,.0f} rows/s")
+    return rate
+
+
+def _seed(db: Session, count: int) -> None:
+    db.add_all(
+        Invoice(
+            customer_id=1,
+            property_id=1,
+            period_start=date(2026, 1, 1),
+            period_end=date(2026, 1, 31),
+            status="sent",
+            issued_date=date(2026, 1, 31),
+            due_date=date(2026, 2, 10),
+            subtotal=Decimal("100.00"),
+            tax=Decimal("11.50"),
+            total=Decimal("111.50"),
+            notes="bench",
+        )
+        for _ in range(count)
+    )
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="defaults to DATABASE_URL")
+    parser.add_argument("--page-rows", type=int, default=50)
+    parser.add_argument("--bulk-rows", type=int, default=5000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    if args.url is None:
+        from app.db.session import DATABASE_URL
+
+        args.url = DATABASE_URL
+
+    engine = create_engine(args.url)
+    with Session(engine) as db:
+        if args.url.startswith("sqlite"):
+            Base.metadata.create_all(engine, tables=[Invoice.__table__])
+            _seed(db, args.bulk_rows)
+
+        assert _orm_bytes(db, args.page_rows) == _core_bytes(db, args.page_rows)
+
+        for limit in (args.page_rows, args.bulk_rows):
+            print(f"-- {limit} rows per response")
+            orm = _measure("orm + response model", _orm_bytes, db, limit, args.seconds)
+            core = _measure("core rows -> bytes", _core_bytes, db, limit, args.seconds)
+            print(f"{'speedup':24s} {core / orm:12.2f}x")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Login latency for a legitimate user while another client floods /auth/token.
+
+Run against the compose database:
+    docker compose exec api python -m scripts.bench_login_throttle
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import threading
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.api.app import app
+
+TOKEN_URL = "/api/v1/auth/token"
+FORM = {"Content-Type": "application/x-www-form-urlencoded"}
+
+
+def _percentiles(samples: list[float]) -> str:
+    ordered = sorted(samples)
+    p50 = statistics.median(ordered)
+    p95 = ordered[min(int(len(ordered) * 0.95), len(ordered) - 1)]
+    return f"p50={p50:7.1f}ms p95={p95:7.1f}ms n={len(ordered)}"
+
+
+def _time_logins(client: TestClient, username: str, password: str, count: int) -> list[float]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        r = client.post(TOKEN_URL, data={"username": username, "password": password}, headers=FORM)
+        samples.append((time.perf_counter() - start) * 1000)
+        if r.status_code != 200:
+            raise SystemExit(f"legit login failed: {r.status_code} {r.text}")
+    return samples
+
+
+def _flood(client: TestClient, stop: threading.Event, counts: dict[int, int], lock: threading.Lock) -> None:
+    while not stop.is_set():
+        r = client.post(
+            TOKEN_URL,
+            data={"username": f"stuff-{uuid.uuid4().hex[:8]}", "password": "hunter22!"},
+            headers=FORM,
+        )
+        with lock:
+            counts[r.status_code] = counts.get(r.status_code, 0) + 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--flood-threads", type=int, default=16)
+    args = parser.parse_args()
+
+    username = f"bench-{uuid.uuid4().hex[:8]}"
+    password = "Password123!"
+
+    with TestClient(app, client=("10.0.0.1", 50000)) as legit, TestClient(app, client=("10.6.6.6", 50000)) as attacker:
+        r = legit.post(
+            "/api/v1/auth/register",
+            json={"username": username, "email": f"{username}@example.com", "password": password},
+        )
+        if r.status_code != 201:
+            raise SystemExit(f"register failed: {r.status_code} {r.text}")
+
+        baseline = _time_logins(legit, username, password, args.logins)
+
+        stop = threading.Event()
+        lock = threading.Lock()
+        counts: dict[int, int] = {}
+        threads = [
+            threading.Thread(target=_flood, args=(attacker, stop, counts, lock), daemon=True)
+            for _ in range(args.flood_threads)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(1.0)
+
+        try:
+            under_flood = _time_logins(legit, username, password, args.logins)
+        finally:
+            stop.set()
+            for t in threads:
+                t.join()
+
+    print(f"baseline     {_percentiles(baseline)}")
+    print(f"under flood  {_percentiles(under_flood)}")
+    print(f"flood responses by status: {dict(sorted(counts.items()))}")
+
+
+if __name__ == "__main__":
+    main()
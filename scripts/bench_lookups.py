@@ -0,0 +1,91 @@
+"""Per-call CPU of the hot primary-key / existence lookups.
+
+Compares the legacy `db.query(Model).filter(pk == id).first()` form with the
+pre-built statements in app.repositories. Both hit the same row on the same
+connection, so the difference is statement construction and cache-key work.
+
+    docker compose exec api python -m scripts.bench_lookups --iterations 20000
+    python -m scripts.bench_lookups --url sqlite://
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.models.models import Base, Customer
+from app.repositories import customers as customers_repo
+
+
+def _legacy_get(db: Session, customer_id: int):
+    return db.query(Customer).filter(Customer.customer_id == customer_id).first()
+
+
+def _legacy_exists(db: Session, customer_id: int):
+    return (
+        db.query(Customer.customer_id)
+        .filter(Customer.customer_id == customer_id)
+        .first()
+        is not None
+    )
+
+
+def _measure(label: str, fn, db: Session, customer_id: int, iterations: int) -> float:
+    for _ in range(min(iterations, 500)):
+        fn(db, customer_id)
+        db.expunge_all()
+
+    cpu_start = time.process_time()
+    for _ in range(iterations):
+        fn(db, customer_id)
+        db.expunge_all()
+    per_call = (time.process_time() - cpu_start) / iterations * 1_000_000
+
+    print(f"{label:28s} {per_call:8.1f} us/call cpu")
+    return per_call
+
+
+def _seed(db: Session) -> int:
+    customer = Customer(customer_id=1, first_name="Bench", last_name="Lookup")
+    db.add(customer)
+    db.commit()
+    return 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="defaults to DATABASE_URL")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--customer-id", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.url is None:
+        from app.db.session import DATABASE_URL
+
+        args.url = DATABASE_URL
+
+    engine = create_engine(args.url)
+    with Session(engine) as db:
+        customer_id = args.customer_id
+        if args.url.startswith("sqlite"):
+            Base.metadata.create_all(engine, tables=[Customer.__table__])
+            customer_id = _seed(db)
+        elif customer_id is None:
+            customer_id = db.query(Customer.customer_id).limit(1).scalar()
+        if customer_id is None:
+            raise SystemExit("no customer row to look up; pass --customer-id")
+
+        legacy = _measure("query().filter().first()", _legacy_get, db, customer_id, args.iterations)
+        repo = _measure("repositories.get_customer", customers_repo.get_customer, db, customer_id, args.iterations)
+        legacy_exists = _measure("query(pk).filter().first()", _legacy_exists, db, customer_id, args.iterations)
+        repo_exists = _measure("repositories.customer_exists", customers_repo.customer_exists, db, customer_id, args.iterations)
+
+    print(f"get:    {legacy / repo:5.2f}x less cpu per call")
+    print(f"exists: {legacy_exists / repo_exists:5.2f}x less cpu per call")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
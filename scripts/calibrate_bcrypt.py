@@ -0,0 +1,48 @@
+"""Pick BCRYPT_ROUNDS for this host from a per-hash latency budget.
+
+    docker compose exec api python -m scripts.calibrate_bcrypt --target-ms 250
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from passlib.hash import bcrypt
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 16
+
+
+def measure(rounds: int, samples: int) -> float:
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    measure(MIN_ROUNDS, 1)
+
+    chosen = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        median_ms = measure(rounds, args.samples)
+        print(f"rounds={rounds:2d}  median={median_ms:8.1f}ms")
+
+        if median_ms > args.target_ms:
+            break
+        chosen = rounds
+
+    print(f"\nBCRYPT_ROUNDS={chosen}  (target {args.target_ms:.0f}ms per hash)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Rebuild the daily_revenue and receivables_due rollups from invoices and payments.
+
+create_invoice and create_payment keep both rollups in sync and
+sql/init/03_daily_revenue.sql and 04_receivables_due.sql roll up the seed
+data; run this after bulk loads that bypass the API or to repair drift. Each window of days is deleted and re-aggregated in its
+own transaction, so reports keep answering while the rebuild runs.
+--check only reports the days whose rollup disagrees with the source tables.
+
+    docker compose exec api python -m scripts.rebuild_revenue_rollup
+    python -m scripts.rebuild_revenue_rollup --from 2026-01-01 --to 2026-03-31 --check
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.models.models import DailyRevenue, ReceivableDue
+from app.repositories import revenue as revenue_repo
+
+
+def _windows(from_date: date, to_date: date, days: int):
+    if from_date is None or to_date is None:
+        return
+    start = from_date
+    while start <= to_date:
+        end = min(start + timedelta(days=days - 1), to_date)
+        yield start, end
+        start = end + timedelta(days=1)
+
+
+def _rows(db: Session, stmt, width: int) -> dict[tuple, tuple]:
+    return {
+        tuple(row[:width]): tuple(row[width:])
+        for row in db.execute(stmt).all()
+        if any(row[width:])
+    }
+
+
+def _drifted(db: Session, width: int, source, rollup) -> set[date]:
+    expected = _rows(db, source, width)
+    actual = _rows(db, rollup, width)
+    return {k[0] for k in expected.keys() | actual.keys() if expected.get(k) != actual.get(k)}
+
+
+def drifted_days(db: Session, from_date: date, to_date: date) -> list[date]:
+    revenue = _drifted(
+        db,
+        len(revenue_repo.KEY),
+        revenue_repo.source_stmt(from_date, to_date),
+        select(
+            *(getattr(DailyRevenue, k) for k in revenue_repo.KEY),
+            *(getattr(DailyRevenue, m) for m in revenue_repo.MEASURES),
+        ).where(DailyRevenue.day.between(from_date, to_date)),
+    )
+    receivables = _drifted(
+        db,
+        len(revenue_repo.RECEIVABLE_KEY),
+        revenue_repo.receivables_source_stmt(from_date, to_date),
+        select(
+            *(getattr(ReceivableDue, k) for k in revenue_repo.RECEIVABLE_KEY),
+            ReceivableDue.amount,
+        ).where(ReceivableDue.day.between(from_date, to_date)),
+    )
+    return sorted(revenue | receivables)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="defaults to DATABASE_URL")
+    parser.add_argument("--from", dest="from_date", type=date.fromisoformat, default=None)
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, default=None)
+    parser.add_argument("--window-days", type=int, default=31)
+    parser.add_argument("--check", action="store_true", help="report drifted days, write nothing")
+    args = parser.parse_args()
+
+    if args.url is None:
+        from app.db.session import DATABASE_URL
+
+        args.url = DATABASE_URL
+
+    engine = create_engine(args.url)
+    with Session(engine) as db:
+        first, last = revenue_repo.source_span(db)
+        from_date = args.from_date or first
+        to_date = args.to_date or last
+        if from_date is None or to_date is None:
+            print("no invoices or payments")
+
+        for start, end in _windows(from_date, to_date, args.window_days):
+            began = time.perf_counter()
+            if args.check:
+                days = drifted_days(db, start, end)
+                db.rollback()
+                shown = " ".join(map(str, days[:10])) + (" ..." if len(days) > 10 else "")
+                print(f"{start} .. {end} {len(days):6d} drifted days {shown}")
+                continue
+
+            rows = revenue_repo.rebuild(db, start, end)
+            rows += revenue_repo.rebuild_receivables(db, start, end)
+            db.commit()
+            print(f"{start} .. {end} {rows:8d} rows {time.perf_counter() - began:7.2f}s")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
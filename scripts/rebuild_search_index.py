@@ -0,0 +1,46 @@
+"""Rebuild the search_grams trigram index from customers and properties.
+
+The write endpoints keep the index in sync and the API indexes an entity
+whose search_grams are empty on startup (e.g. the sql/init seeds); run this
+after bulk loads that bypass the API or after changing the tokenizer.
+Rows are replaced one id range at a time, so search keeps answering while
+the rebuild runs.
+
+    docker compose exec api python -m scripts.rebuild_search_index
+    python -m scripts.rebuild_search_index --batch-size 2000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.repositories.search import ENTITIES, rebuild
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="defaults to DATABASE_URL")
+    parser.add_argument("--entity", choices=sorted(ENTITIES), action="append")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.url is None:
+        from app.db.session import DATABASE_URL
+
+        args.url = DATABASE_URL
+
+    engine = create_engine(args.url)
+    with Session(engine) as db:
+        for entity in args.entity or sorted(ENTITIES):
+            start = time.perf_counter()
+            entities, grams = rebuild(db, entity, args.batch_size)
+            elapsed = time.perf_counter() - start
+            print(f"{entity:12s} {entities:8d} rows {grams:10d} grams {elapsed:7.2f}s")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
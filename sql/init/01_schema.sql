@@ -7,6 +7,7 @@ CREATE TABLE users (
   hashed_password VARCHAR(255) NOT NULL,
   role            VARCHAR(20)  NOT NULL DEFAULT 'admin',
   is_active       TINYINT(1) NOT NULL DEFAULT 1,
+  token_epoch     INT UNSIGNED NOT NULL DEFAULT 0,
   created_at      DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_at      DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   UNIQUE KEY uq_users_username (username),
@@ -182,11 +183,45 @@ CREATE TABLE payments (
   reference   VARCHAR(80),
   notes       VARCHAR(255),
   created_at  DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE KEY uq_payments_invoice_reference (invoice_id, reference),
   CONSTRAINT fk_payments_invoice
     FOREIGN KEY (invoice_id) REFERENCES invoices(invoice_id)
     ON DELETE RESTRICT ON UPDATE CASCADE
 ) ENGINE=InnoDB;
 
+CREATE TABLE search_grams (
+  entity      ENUM('customers','properties') NOT NULL,
+  gram        VARCHAR(3) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL,
+  entity_id   BIGINT UNSIGNED NOT NULL,
+  field       VARCHAR(32) NOT NULL,
+  PRIMARY KEY (entity, gram, entity_id, field),
+  KEY idx_search_grams_entity (entity, entity_id, field)
+) ENGINE=InnoDB;
+
+CREATE TABLE daily_revenue (
+  day              DATE NOT NULL,
+  customer_id      BIGINT UNSIGNED NOT NULL,
+  property_id      BIGINT UNSIGNED NOT NULL,
+  invoiced_total   DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+  invoice_count    INT UNSIGNED NOT NULL DEFAULT 0,
+  collected_total  DECIMAL(12,2) NOT NULL DEFAULT 0.00,
+  payment_count    INT UNSIGNED NOT NULL DEFAULT 0,
+  PRIMARY KEY (day, customer_id, property_id),
+  KEY idx_daily_revenue_customer (customer_id, day),
+  KEY idx_daily_revenue_property (property_id, day)
+) ENGINE=InnoDB;
+
+-- net receivable (invoice totals minus payments) per day it starts counting
+-- and the invoice's due date; slot = customer_id % 16 spreads concurrent
+-- writes for the same day over several rows
+CREATE TABLE receivables_due (
+  day       DATE NOT NULL,
+  due_date  DATE NOT NULL,
+  slot      TINYINT UNSIGNED NOT NULL,
+  amount    DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+  PRIMARY KEY (day, due_date, slot)
+) ENGINE=InnoDB;
+
 CREATE INDEX idx_properties_customer ON properties(customer_id);
 CREATE INDEX idx_pools_property ON pools(property_id);
 
@@ -200,3 +235,9 @@ CREATE INDEX idx_visits_date ON visits(visit_date);
 CREATE INDEX idx_invoices_customer ON invoices(customer_id);
 CREATE INDEX idx_invoices_property_period ON invoices(property_id, period_start, period_end);
 CREATE INDEX idx_invoices_status ON invoices(status);
+CREATE INDEX idx_invoices_property ON invoices(property_id);
+CREATE INDEX idx_invoices_customer_status ON invoices(customer_id, status);
+CREATE INDEX idx_invoices_property_status ON invoices(property_id, status);
+CREATE INDEX idx_invoices_customer_issued ON invoices(customer_id, issued_date, status, total, due_date);
+
+CREATE INDEX idx_payments_invoice ON payments(invoice_id, payment_id, amount, paid_date);
@@ -0,0 +1,24 @@
+-- Roll the seeded invoices and payments up into daily_revenue.
+-- Same aggregate as app.repositories.revenue.source_stmt over all history;
+-- scripts/rebuild_revenue_rollup re-runs it for rows loaded later.
+INSERT INTO daily_revenue
+  (day, customer_id, property_id, invoiced_total, invoice_count, collected_total, payment_count)
+SELECT entries.day, entries.customer_id, entries.property_id,
+       SUM(entries.invoiced_total), SUM(entries.invoice_count),
+       SUM(entries.collected_total), SUM(entries.payment_count)
+FROM (
+  SELECT i.issued_date AS day, i.customer_id, i.property_id,
+         SUM(i.total) AS invoiced_total, COUNT(*) AS invoice_count,
+         0 AS collected_total, 0 AS payment_count
+  FROM invoices i
+  WHERE i.status IN ('sent', 'paid')
+  GROUP BY i.issued_date, i.customer_id, i.property_id
+  UNION ALL
+  SELECT p.paid_date AS day, i.customer_id, i.property_id,
+         0 AS invoiced_total, 0 AS invoice_count,
+         SUM(p.amount) AS collected_total, COUNT(*) AS payment_count
+  FROM payments p
+  JOIN invoices i ON i.invoice_id = p.invoice_id
+  GROUP BY p.paid_date, i.customer_id, i.property_id
+) AS entries
+GROUP BY entries.day, entries.customer_id, entries.property_id;
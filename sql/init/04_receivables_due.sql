@@ -0,0 +1,19 @@
+-- Roll the seeded invoices and payments up into receivables_due.
+-- Same aggregate as app.repositories.revenue.receivables_source_stmt over all
+-- history; scripts/rebuild_revenue_rollup re-runs it for rows loaded later.
+INSERT INTO receivables_due (day, due_date, slot, amount)
+SELECT entries.day, entries.due_date, entries.slot, SUM(entries.amount)
+FROM (
+  SELECT i.issued_date AS day, COALESCE(i.due_date, i.issued_date) AS due_date,
+         i.customer_id % 16 AS slot, i.total AS amount
+  FROM invoices i
+  WHERE i.status IN ('sent', 'paid')
+  UNION ALL
+  SELECT CASE WHEN p.paid_date > i.issued_date THEN p.paid_date ELSE i.issued_date END AS day,
+         COALESCE(i.due_date, i.issued_date) AS due_date,
+         i.customer_id % 16 AS slot, -p.amount AS amount
+  FROM payments p
+  JOIN invoices i ON i.invoice_id = p.invoice_id
+  WHERE i.status IN ('sent', 'paid')
+) AS entries
+GROUP BY entries.day, entries.due_date, entries.slot;